@@ -0,0 +1,179 @@
+import numpy as np
+
+# Metric keys in the order FantasyLeagueAnalyzer.calculate_team_metrics() produces them
+METRIC_ORDER = [
+    'chosen_vs_optimal_actual',
+    'chosen_vs_optimal_projected',
+    'optimal_projected_vs_optimal_actual',
+    'lineup_efficiency',
+    'overperformance',
+    'percent_players_beat_projection',
+    'percent_players_did_not_beat_projection',
+    'average_percent_difference',
+    'average_overperf_percent_diff',
+    'average_underperf_percent_diff',
+    'percent_boomed',
+    'percent_overperformed',
+    'percent_underperformed',
+    'percent_busted',
+]
+
+# Same weights as FantasyLeagueAnalyzer.calculate_manager_lineup_score()
+LINEUP_SCORE_WEIGHTS = {
+    'lineup_efficiency': 0.4,
+    'overperformance': 0.2,
+    'average_percent_difference': 0.1,
+    'percent_players_beat_projection': 0.1,
+    'percent_boomed': 0.1,
+    'percent_busted': 0.1,
+}
+
+
+def pack_lineups(lineups):
+    """
+    Packs a list of lineups into padded (groups x slots) point arrays.
+
+    Args:
+        lineups (list): One list of player dicts per group (a team or a team-week).
+
+    Returns:
+        tuple: (fantasy_points, projected_fantasy_points, mask) arrays; padded slots are 0 with mask False.
+    """
+    slots = max((len(lineup) for lineup in lineups), default=0)
+    actual = np.zeros((len(lineups), slots))
+    projected = np.zeros((len(lineups), slots))
+    mask = np.zeros((len(lineups), slots), dtype=bool)
+    for row, lineup in enumerate(lineups):
+        count = len(lineup)
+        actual[row, :count] = [player['fantasy_points'] for player in lineup]
+        projected[row, :count] = [player['projected_fantasy_points'] for player in lineup]
+        mask[row, :count] = True
+    return actual, projected, mask
+
+
+def sequential_sum(values):
+    """
+    Sums each row left to right, exactly like the per-team running totals.
+
+    np.sum uses pairwise summation, which can differ in the last bit; a cumulative
+    sum over a leading zero column keeps the per-team code path's rounding.
+
+    Args:
+        values (np.ndarray): A (groups x slots) array.
+
+    Returns:
+        np.ndarray: The row sums.
+    """
+    padded = np.concatenate([np.zeros((values.shape[0], 1)), values], axis=1)
+    return np.cumsum(padded, axis=1)[:, -1]
+
+
+def _ratio(numerator, denominator, scale=1):
+    """Returns (numerator / denominator) * scale, or 0 where the denominator is zero."""
+    safe = np.where(denominator != 0, denominator, 1)
+    return np.where(denominator != 0, (numerator / safe) * scale, 0.0)
+
+
+def compute_team_metrics(chosen, optimal_projected, optimal_actual):
+    """
+    Computes the lineup metrics for every group in one batched pass.
+
+    Args:
+        chosen (tuple): Packed (actual, projected, mask) arrays for the chosen lineups.
+        optimal_projected (tuple): Packed arrays for the optimal projected lineups.
+        optimal_actual (tuple): Packed arrays for the optimal actual lineups.
+
+    Returns:
+        dict: Metric name -> array with one value per group.
+    """
+    actual, projected, mask = chosen
+    chosen_points = sequential_sum(actual)
+    optimal_projected_points = sequential_sum(optimal_projected[0])
+    optimal_actual_points = sequential_sum(optimal_actual[0])
+    total_players = mask.sum(axis=1)
+
+    metrics = {
+        'chosen_vs_optimal_actual': optimal_actual_points - chosen_points,
+        'chosen_vs_optimal_projected': optimal_projected_points - chosen_points,
+        'optimal_projected_vs_optimal_actual': optimal_actual_points - optimal_projected_points,
+        'lineup_efficiency': np.where(optimal_actual_points > 0,
+                                      (chosen_points / np.where(optimal_actual_points > 0, optimal_actual_points, 1)) * 100,
+                                      0.0),
+        'overperformance': chosen_points - sequential_sum(projected),
+    }
+
+    beat = (mask & (actual > projected)).sum(axis=1)
+    metrics['percent_players_beat_projection'] = _ratio(beat, total_players, 100)
+    metrics['percent_players_did_not_beat_projection'] = 100 - metrics['percent_players_beat_projection']
+
+    # Players with a zero projection are skipped, as in the per-team path
+    valid = mask & (projected != 0)
+    percent_diff = np.where(valid, ((actual - projected) / np.where(valid, projected, 1)) * 100, 0.0)
+    over = valid & (actual > projected)
+    under = valid & (actual < projected)
+    over_count = over.sum(axis=1)
+    under_count = under.sum(axis=1)
+
+    metrics['average_percent_difference'] = _ratio(sequential_sum(percent_diff), total_players)
+    metrics['average_overperf_percent_diff'] = _ratio(sequential_sum(np.where(over, percent_diff, 0.0)), over_count)
+    metrics['average_underperf_percent_diff'] = _ratio(sequential_sum(np.where(under, percent_diff, 0.0)), under_count)
+
+    categories = {
+        'boomed': valid & (percent_diff >= 20),
+        'overperformed': valid & (percent_diff >= 0) & (percent_diff < 20),
+        'underperformed': valid & (percent_diff > -20) & (percent_diff < 0),
+        'busted': valid & (percent_diff <= -20),
+    }
+    for key, selected in categories.items():
+        metrics[f'percent_{key}'] = _ratio(selected.sum(axis=1), total_players, 100)
+
+    return metrics
+
+
+def compute_manager_lineup_scores(metrics):
+    """
+    Computes the Manager Lineup Score for every group from batched metrics.
+
+    Args:
+        metrics (dict): Metric arrays as returned by compute_team_metrics().
+
+    Returns:
+        np.ndarray: The scores (0-100 scale).
+    """
+    weights = LINEUP_SCORE_WEIGHTS
+    overperformance = metrics['overperformance']
+    avg_percent_diff = metrics['average_percent_difference']
+    max_overperformance = overperformance.max() if len(overperformance) else 1
+    max_avg_percent_diff = avg_percent_diff.max() if len(avg_percent_diff) else 1
+
+    normalized_overperformance = overperformance / max_overperformance if max_overperformance else np.zeros_like(overperformance)
+    normalized_avg_percent_diff = avg_percent_diff / max_avg_percent_diff if max_avg_percent_diff else np.zeros_like(avg_percent_diff)
+
+    return (
+        (metrics['lineup_efficiency'] / 100) * weights['lineup_efficiency'] +
+        normalized_overperformance * weights['overperformance'] +
+        (normalized_avg_percent_diff / 100) * weights['average_percent_difference'] +
+        (metrics['percent_players_beat_projection'] / 100) * weights['percent_players_beat_projection'] +
+        (metrics['percent_boomed'] / 100) * weights['percent_boomed'] +
+        ((100 - metrics['percent_busted']) / 100) * weights['percent_busted']
+    ) * 100
+
+
+def to_metric_dicts(metrics, scores=None):
+    """
+    Converts batched metric arrays into one metrics dict per group.
+
+    The dicts have the same keys, in the same order, as FantasyLeagueAnalyzer.calculate_team_metrics().
+
+    Args:
+        metrics (dict): Metric arrays as returned by compute_team_metrics().
+        scores (np.ndarray): Optional Manager Lineup Scores to include.
+
+    Returns:
+        list: One metrics dict per group.
+    """
+    columns = [metrics[key].tolist() for key in METRIC_ORDER]
+    if scores is not None:
+        columns.append(scores.tolist())
+    keys = METRIC_ORDER + (['manager_lineup_score'] if scores is not None else [])
+    return [dict(zip(keys, values)) for values in zip(*columns)]
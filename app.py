@@ -1,10 +1,34 @@
-from flask import Flask, render_template, request, jsonify
-import os
+import hashlib
 import json
-from bestManager import FantasyLeagueAnalyzer  # Import the FantasyLeagueAnalyzer class
+
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from calcStandings import compute_standings
+from leagueCache import snapshot_cache, get_analysis, thaw
+from liveScoring import format_event, live_feed
+from scheduleLuck import compute_schedule_luck
+from segmentStore import DEFAULT_LEAGUE_ID, LEAGUE_DATA_FILE, SEGMENT_ROOT, load_weeks, manifest_path
 
 app = Flask(__name__)
 
+DATA_FILE = LEAGUE_DATA_FILE
+STANDINGS_FILE = 'standings.json'
+SCHEDULE_FILE = 'league_schedule_weeks_1_to_14.json'
+PLAYOFF_ODDS_FILE = 'playoff_odds.json'
+
+def league_snapshot():
+    """
+    Returns the current snapshot of the league data, or None if there is none.
+
+    The league is read from its week segments, re-read whenever a scrape updates the
+    manifest; DATA_FILE is read only for a league that has no segments.
+    """
+    snapshot = snapshot_cache.get(manifest_path(SEGMENT_ROOT, DEFAULT_LEAGUE_ID),
+                                  lambda: load_weeks(DEFAULT_LEAGUE_ID, root=SEGMENT_ROOT))
+    if snapshot is None:
+        snapshot = snapshot_cache.get(DATA_FILE)
+    return snapshot
+
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -14,49 +38,221 @@ def analyze():
     analysis_results = None
     week_num = 1  # Always show stats as of Week 1
 
-    # Load the data from the JSON file
-    data_file = 'league_data_by_week.json'
-    if not os.path.exists(data_file):
-        return "Data file not found. Please ensure the data file exists.", 404
+    # Live mode shows the analysis kept current by liveScoring.py, then follows /live/stream
+    if request.args.get('live'):
+        seq, state = live_feed.snapshot()
+        if state is None:
+            return "Live scoring is not running. Start it with liveScoring.py.", 404
+        analysis_results = {'rankings': state['rankings'], 'teams': state['teams'], 'week_num': state['week']}
+        return render_template('analysis.html', analysis=analysis_results, live=True)
 
-    with open(data_file, 'r') as json_file:
-        all_data = json.load(json_file)
+    # Load the data from the shared snapshot cache
+    snapshot = league_snapshot()
+    if snapshot is None:
+        return "Data file not found. Please ensure the data file exists.", 404
 
     # Extract data for Week 1
     week_str = str(week_num)
-    if week_str in all_data:
-        combined_data = {week_str: all_data[week_str]}
-    else:
+    if week_str not in snapshot.data:
         return f"No data available for week {week_num}.", 404
 
-    # Run the analysis using the Week 1 data
-    analyzer = FantasyLeagueAnalyzer(combined_data)
-    analyzer.run_full_analysis()
-
-    # Get the rankings and metrics
-    rankings = analyzer.rank_teams()
-    teams = analyzer.teams
+    # Run the analysis using the Week 1 data (computed once per data file version)
+    analysis = get_analysis(DATA_FILE, (week_str,), snapshot=snapshot)
 
     # Prepare data for rendering
     analysis_results = {
-        'rankings': rankings,
-        'teams': teams,
+        'rankings': analysis['rankings'],
+        'teams': analysis['teams'],
         'week_num': week_num
     }
 
     return render_template('analysis.html', analysis=analysis_results)
 
 
+@app.route('/live/stream')
+def live_stream():
+    """
+    Streams live scoring updates as Server-Sent Events.
+
+    A new client first gets a 'snapshot' event with the full rankings, then an
+    'update' event per poll that changed something. A reconnecting client
+    (Last-Event-ID) gets only the updates it missed, or a fresh snapshot if they
+    are no longer kept. Comment lines keep idle connections open.
+    """
+    if live_feed.snapshot()[1] is None:
+        return "Live scoring is not running.", 404
+    last_id = request.headers.get('Last-Event-ID', '')
+
+    def generate():
+        seq = int(last_id) if last_id.isdigit() else None
+        pending = live_feed.events_since(seq) if seq is not None else None
+        while True:
+            if pending is None:
+                seq, state = live_feed.snapshot()
+                yield format_event('snapshot', seq, state)
+            else:
+                for event in pending:
+                    seq = event['seq']
+                    yield format_event('update', seq, event)
+                if not pending:
+                    yield ': keepalive\n\n'
+            pending = live_feed.wait(seq)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @app.route('/matchup_insights')
 def matchup_insights():
-    standings_file = 'standings.json'
-    if not os.path.exists(standings_file):
+    snapshot = snapshot_cache.get(STANDINGS_FILE)
+    if snapshot is None:
         return "Standings file not found. Please ensure the standings file exists.", 404
 
-    with open(standings_file, 'r') as file:
-        standings = json.load(file)
+    # Playoff odds are optional; they are produced by playoffOdds.main()
+    odds_snapshot = snapshot_cache.get(PLAYOFF_ODDS_FILE)
+    playoff_odds = odds_snapshot.data['teams'] if odds_snapshot is not None else None
+
+    return render_template('matchup_insights.html', standings=snapshot.data, playoff_odds=playoff_odds)
+
+
+@app.route('/schedule_luck')
+def schedule_luck():
+    snapshot = league_snapshot()
+    schedule = snapshot_cache.get(SCHEDULE_FILE)
+    if snapshot is None or schedule is None:
+        return "Data or schedule file not found. Please ensure the data files exist.", 404
+
+    # Computed once per data and schedule version; every week's matrix is kept
+    luck = snapshot.derive(('schedule_luck', schedule.version),
+                           lambda data: compute_schedule_luck(data, schedule.data))
+    if not luck['weeks']:
+        return "No scored weeks available.", 404
+
+    week = request.args.get('week', luck['weeks'][-1])
+    if week not in luck['by_week']:
+        return f"No data available for week {week}.", 404
+
+    return render_template('schedule_luck.html', luck=luck, week=week, matrix=luck['by_week'][week])
+
+
+def parse_weeks(args, available_weeks):
+    """
+    Parses the week selection from the query string.
+
+    Accepts ?week=3 or ?weeks=1-6 (or a comma-separated list). With neither, every week is selected.
+    A range longer than the number of available weeks cannot be served, so it is rejected
+    before it is expanded.
+
+    Args:
+        args (MultiDict): The request query arguments.
+        available_weeks (Collection): The week keys present in the data.
+
+    Returns:
+        tuple: The selected week keys as strings, in week order.
+
+    Raises:
+        ValueError: If the selection is malformed or a range spans more weeks than are available.
+    """
+    if 'week' in args:
+        weeks = [int(args['week'])]
+    elif 'weeks' in args:
+        weeks = []
+        for part in args['weeks'].split(','):
+            if '-' in part:
+                start, end = (int(value) for value in part.split('-', 1))
+                if start > end:
+                    raise ValueError(f"Invalid week range '{part}'.")
+                if end - start + 1 > len(available_weeks):
+                    raise ValueError(f"Week range '{part}' is longer than the {len(available_weeks)} weeks available.")
+                weeks.extend(range(start, end + 1))
+            else:
+                weeks.append(int(part))
+    else:
+        weeks = [int(week) for week in available_weeks]
+    return tuple(str(week) for week in sorted(set(weeks)))
+
+
+def make_etag(*parts):
+    """Builds a strong ETag value from the data versions and the request parameters."""
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:20]
+
+
+def json_response(etag, build_body):
+    """
+    Returns a JSON response with a strong ETag, or 304 if the client already has it.
+
+    Args:
+        etag (str): The ETag value for the current data.
+        build_body (callable): Returns the serialized body; only called on a cache miss.
+
+    Returns:
+        Response: The Flask response.
+    """
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(build_body(), mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def serialize_analysis(weeks, analysis):
+    """Serializes analyzer results for the API, independent of whether they came from an artifact."""
+    payload = {
+        'weeks': list(weeks),
+        'rankings': thaw(analysis['rankings']),
+        'teams': {
+            team_id: {'team_name': team['team_name'], 'metrics': thaw(team['metrics'])}
+            for team_id, team in analysis['teams'].items()
+        },
+    }
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+@app.route('/api/analysis')
+def api_analysis():
+    snapshot = league_snapshot()
+    if snapshot is None:
+        return jsonify(error="Data file not found."), 404
+    try:
+        weeks = parse_weeks(request.args, snapshot.data)
+    except ValueError:
+        return jsonify(error="Invalid week selection."), 400
+    missing = [week for week in weeks if week not in snapshot.data]
+    if missing or not weeks:
+        return jsonify(error=f"No data available for weeks {', '.join(missing)}."), 404
+
+    etag = make_etag('analysis', snapshot.version, *weeks)
+    return json_response(etag, lambda: snapshot.derive(
+        ('api_analysis', weeks),
+        lambda data: serialize_analysis(weeks, get_analysis(DATA_FILE, weeks, snapshot=snapshot))))
+
+
+@app.route('/api/standings')
+def api_standings():
+    snapshot = league_snapshot()
+    schedule = snapshot_cache.get(SCHEDULE_FILE)
+    if snapshot is None or schedule is None:
+        return jsonify(error="Data or schedule file not found."), 404
+    try:
+        weeks = parse_weeks(request.args, snapshot.data)
+    except ValueError:
+        return jsonify(error="Invalid week selection."), 400
+    missing = [week for week in weeks if week not in snapshot.data]
+    if missing or not weeks:
+        return jsonify(error=f"No data available for weeks {', '.join(missing)}."), 404
+
+    etag = make_etag('standings', snapshot.version, schedule.version, *weeks)
+
+    def build(data):
+        standings = compute_standings({week: data[week] for week in weeks}, schedule.data)
+        payload = {'weeks': list(weeks), 'standings': standings}
+        return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
 
-    return render_template('matchup_insights.html', standings=standings)
+    return json_response(etag, lambda: snapshot.derive(('api_standings', weeks, schedule.version), build))
 
 
 if __name__ == '__main__':
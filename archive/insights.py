@@ -1,5 +1,8 @@
 import pandas as pd
 
+# Player fields the insights read; columnar stores only need to load these
+INSIGHTS_FIELDS = ['lineup_pos', 'name', 'position', 'fantasy_points', 'projected_fantasy_points', 'team_name']
+
 def safe_float_conversion(value):
     """
     Safely converts a value to a float. Returns 0.0 if the conversion is not possible.
@@ -15,6 +18,56 @@ def safe_float_conversion(value):
     except (ValueError, TypeError):
         return 0.0
 
+STARTER_COLUMNS = ['team_name', 'player_name', 'position', 'actual_fantasy_points', 'projected_fantasy_points',
+                   'points_diff']
+BENCH_COLUMNS = ['team_name', 'player_name', 'actual_fantasy_points', 'position']
+PLAYER_COLUMNS = ['team_name', 'player_name', 'position', 'lineup_pos', 'team_uid', 'actual_fantasy_points',
+                  'projected_fantasy_points']
+
+
+def build_player_frame(league_data):
+    """
+    Builds one DataFrame of every player in a week of league data.
+
+    Args:
+        league_data (dict): The league data with team IDs as keys and player data as values.
+
+    Returns:
+        pd.DataFrame: One row per player, with team_name, player_name, position and lineup_pos
+            columns, float actual_fantasy_points, projected_fantasy_points and points_diff
+            columns, and the identity index team_uid (None where the data has none).
+    """
+    records = [(player.get('team_name', 'Unknown Team'), player.get('name', 'Unknown Player'),
+                player.get('position', 'Unknown Position'), player.get('lineup_pos'), player.get('team_uid'),
+                safe_float_conversion(player.get('fantasy_points', 0.0)),
+                safe_float_conversion(player.get('projected_fantasy_points', 0.0)))
+               for team in league_data.values() for player in team]
+    players = pd.DataFrame.from_records(records, columns=PLAYER_COLUMNS)
+    players['points_diff'] = players['actual_fantasy_points'] - players['projected_fantasy_points']
+    return players
+
+
+def frame_records(frame):
+    """
+    Returns the rows of a DataFrame as dicts, as to_dict('records') does, built from whole columns.
+
+    to_dict('records') converts every value separately, which dominates generate_insights()
+    for large leagues; tolist() converts each column at once to the same Python values.
+    """
+    columns = list(frame.columns)
+    return [dict(zip(columns, row)) for row in zip(*(frame[column].tolist() for column in columns))]
+
+
+def starter_mask(players):
+    """Selects the starting players, excluding bench and IR spots."""
+    return ~players['lineup_pos'].isin(['BN', 'IR'])
+
+
+def bench_mask(players):
+    """Selects the bench spots."""
+    return players['lineup_pos'] == 'BN'
+
+
 def extract_starter_data(league_data):
     """
     Extracts the data for starting players from the league data.
@@ -25,27 +78,8 @@ def extract_starter_data(league_data):
     Returns:
         pd.DataFrame: A DataFrame containing the extracted starter data.
     """
-    starters = []
-    for team in league_data.values():
-        for player in team:
-            # Include only starters, excluding bench and IR spots
-            if player['lineup_pos'] not in ['BN', 'IR']:
-                actual_fantasy_points = safe_float_conversion(player.get('fantasy_points', 0.0))
-                projected_fantasy_points = safe_float_conversion(player.get('projected_fantasy_points', 0.0))
-                points_diff = actual_fantasy_points - projected_fantasy_points
-
-                # Ensure the position is captured, even if it's missing
-                position = player.get('position', 'Unknown Position')
-
-                starters.append({
-                    'team_name': player.get('team_name', 'Unknown Team'),
-                    'player_name': player.get('name', 'Unknown Player'),
-                    'position': position,  # Include position here
-                    'actual_fantasy_points': actual_fantasy_points,
-                    'projected_fantasy_points': projected_fantasy_points,
-                    'points_diff': points_diff,
-                })
-    return pd.DataFrame(starters)
+    players = build_player_frame(league_data)
+    return players.loc[starter_mask(players), STARTER_COLUMNS].reset_index(drop=True)
 
 
 def extract_bench_data(league_data):
@@ -58,55 +92,61 @@ def extract_bench_data(league_data):
     Returns:
         pd.DataFrame: A DataFrame containing the extracted bench data.
     """
-    bench = []
-    for team in league_data.values():
-        for player in team:
-            # Include only bench spots
-            if player['lineup_pos'] == 'BN':
-                actual_fantasy_points = safe_float_conversion(player.get('fantasy_points', 0.0))
-                # Ensure the position is captured, even if it's missing
-                position = player.get('position', 'Unknown Position')
-                bench.append({
-                    'team_name': player.get('team_name', 'Unknown Team'),
-                    'player_name': player.get('name', 'Unknown Player'),
-                    'actual_fantasy_points': actual_fantasy_points,
-                    'position': position,  # Include position here
-                })
-    return pd.DataFrame(bench)
+    players = build_player_frame(league_data)
+    return players.loc[bench_mask(players), BENCH_COLUMNS].reset_index(drop=True)
 
 
-def generate_insights(league_data):
-    starters_df = extract_starter_data(league_data)
-    bench_df = extract_bench_data(league_data)
+def team_keys(players):
+    """
+    Returns the columns players are grouped into teams by.
+
+    Data annotated by the identity index (see playerIndex) is joined on the integer
+    team_uid, with the name carried along for display; otherwise on the team name.
+    """
+    if len(players) and players['team_uid'].notna().all():
+        return ['team_uid', 'team_name']
+    return ['team_name']
+
+
+def by_team_name(totals):
+    """Orders per-team rows by team name and drops the team_uid key, as the name-keyed output has always been."""
+    if 'team_uid' not in totals.columns:
+        return totals
+    return totals.sort_values(by='team_name', kind='stable').drop(columns='team_uid').reset_index(drop=True)
 
-    # Team with most projected points (starters only)
-    team_proj_points = starters_df.groupby('team_name')['projected_fantasy_points'].sum().reset_index()
 
-    # Team with most actual points (starters only)
-    team_actual_points = starters_df.groupby('team_name')['actual_fantasy_points'].sum().reset_index()
+def generate_insights(league_data):
+    players = build_player_frame(league_data)
+    is_starter = starter_mask(players)
+    starters = players[is_starter]
+    keys = team_keys(players)
+
+    team_points = by_team_name(starters.groupby(keys)[
+        ['actual_fantasy_points', 'projected_fantasy_points']].sum().reset_index())
 
-    # Merge the dataframes to include projected points along with actual points and differences
-    combined_df = pd.merge(team_actual_points, team_proj_points, on='team_name')
-    combined_df['points_diff'] = combined_df['actual_fantasy_points'] - combined_df['projected_fantasy_points']
+    # Team with most projected and actual points (starters only)
+    team_proj_points = team_points[['team_name', 'projected_fantasy_points']]
+    team_actual_points = team_points[['team_name', 'actual_fantasy_points']]
 
     # Teams with the biggest difference from projected points, both positive and negative
-    biggest_pos_diff = combined_df.nlargest(5, 'points_diff').to_dict('records')
-    biggest_neg_diff = combined_df.nsmallest(5, 'points_diff').to_dict('records')
+    team_points['points_diff'] = team_points['actual_fantasy_points'] - team_points['projected_fantasy_points']
+    biggest_pos_diff = frame_records(team_points.nlargest(5, 'points_diff'))
+    biggest_neg_diff = frame_records(team_points.nsmallest(5, 'points_diff'))
 
     # Which bench did the best
-    bench_points = bench_df.groupby('team_name')['actual_fantasy_points'].sum().reset_index().sort_values(by='actual_fantasy_points', ascending=False).to_dict('records')
+    bench = players[bench_mask(players)]
+    bench_points = by_team_name(bench.groupby(keys)['actual_fantasy_points'].sum().reset_index())
+    bench_points = frame_records(bench_points.sort_values(by='actual_fantasy_points', ascending=False))
 
-    top_positive_contributors = starters_df.sort_values(by='points_diff', ascending=False).groupby('team_name').head(3)[
-        ['team_name', 'player_name', 'position', 'actual_fantasy_points', 'projected_fantasy_points',
-         'points_diff']].to_dict('records')
+    top_positive_contributors = frame_records(starters.sort_values(by='points_diff', ascending=False).groupby(
+        keys[0]).head(3)[STARTER_COLUMNS])
 
-    top_negative_contributors = starters_df.sort_values(by='points_diff', ascending=True).groupby('team_name').head(3)[
-        ['team_name', 'player_name', 'position', 'actual_fantasy_points', 'projected_fantasy_points',
-         'points_diff']].to_dict('records')
+    top_negative_contributors = frame_records(starters.sort_values(by='points_diff', ascending=True).groupby(
+        keys[0]).head(3)[STARTER_COLUMNS])
 
     insights = {
-        'team_proj_points': team_proj_points.to_dict('records'),
-        'team_actual_points': team_actual_points.to_dict('records'),
+        'team_proj_points': frame_records(team_proj_points),
+        'team_actual_points': frame_records(team_actual_points),
         'biggest_pos_diff': biggest_pos_diff,  # Now includes projected points
         'biggest_neg_diff': biggest_neg_diff,  # Now includes projected points
         'bench_points': bench_points,
@@ -117,6 +157,20 @@ def generate_insights(league_data):
     return insights
 
 
+def generate_insights_from_store(store, week):
+    """
+    Generates insights for one week of a columnar player-week store.
+
+    Args:
+        store (ColumnarStore): The opened columnar store.
+        week (str): The week key.
+
+    Returns:
+        dict: The insights, as returned by generate_insights().
+    """
+    league_data = store.to_dict([week], INSIGHTS_FIELDS)
+    return generate_insights(league_data[str(week)])
+
 
 # Example usage for testing the insights generation
 if __name__ == "__main__":
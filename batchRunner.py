@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from archive.insights import generate_insights
+from bestManager import FantasyLeagueAnalyzer
+from calcStandings import compute_season_standings, load_data, save_standings_to_json
+
+DATA_FILE = 'league_data_by_week.json'
+SCHEDULE_FILE = 'league_schedule_weeks_1_to_14.json'
+
+# Pool crashes a league may be caught in before it is run in a pool of its own
+POOL_RESTARTS = 2
+
+
+def discover_leagues(source):
+    """
+    Finds the leagues to process.
+
+    Args:
+        source (str): Either a directory with one sub-directory per league (each holding
+            league_data_by_week.json and league_schedule_weeks_1_to_14.json), or a JSON
+            manifest of the form {"leagues": [{"league_id", "data_file", "schedule_file"}]}
+            with paths relative to the manifest.
+
+    Returns:
+        list: One {'league_id', 'data_file', 'schedule_file'} dict per league; a manifest entry
+            missing a field becomes {'league_id', 'error'} instead.
+    """
+    if os.path.isdir(source):
+        leagues = []
+        for name in sorted(os.listdir(source)):
+            directory = os.path.join(source, name)
+            if os.path.isfile(os.path.join(directory, DATA_FILE)):
+                leagues.append({
+                    'league_id': name,
+                    'data_file': os.path.join(directory, DATA_FILE),
+                    'schedule_file': os.path.join(directory, SCHEDULE_FILE),
+                })
+        return leagues
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r') as file:
+        manifest = json.load(file)
+    leagues = []
+    for position, league in enumerate(manifest['leagues']):
+        # A bad entry is reported as a failed league rather than aborting the batch
+        league_id = f'entry-{position}'
+        if isinstance(league, dict) and 'league_id' in league:
+            league_id = str(league['league_id'])
+        missing = [key for key in ('league_id', 'data_file', 'schedule_file')
+                   if not isinstance(league, dict) or key not in league]
+        if missing:
+            leagues.append({'league_id': league_id, 'error': f"Manifest entry is missing {', '.join(missing)}."})
+            continue
+        leagues.append({
+            'league_id': league_id,
+            'data_file': os.path.join(base, league['data_file']),
+            'schedule_file': os.path.join(base, league['schedule_file']),
+        })
+    return leagues
+
+
+def save_json(data, output_file):
+    """Save data to a JSON file."""
+    with open(output_file, 'w') as file:
+        json.dump(data, file, indent=4)
+
+
+def run_league(league, output_dir):
+    """
+    Runs standings, analyzer metrics and weekly insights for one league.
+
+    Never raises: failures are reported in the returned result so one bad league
+    cannot abort the batch.
+
+    Args:
+        league (dict): The league's 'league_id', 'data_file' and 'schedule_file'.
+        output_dir (str): The batch output directory; results go to <output_dir>/<league_id>/.
+
+    Returns:
+        dict: The league ID, status, per-stage timings and any error.
+    """
+    result = {'league_id': league['league_id'], 'status': 'ok', 'timings': {}, 'error': None}
+    start = time.perf_counter()
+    stage = 'load'
+    try:
+        league_dir = os.path.join(output_dir, league['league_id'])
+        os.makedirs(league_dir, exist_ok=True)
+
+        stage_start = time.perf_counter()
+        fantasy_data = load_data(league['data_file'])
+        schedule_data = load_data(league['schedule_file'])
+        result['timings']['load'] = time.perf_counter() - stage_start
+
+        stage = 'standings'
+        stage_start = time.perf_counter()
+        season = compute_season_standings(fantasy_data, schedule_data)
+        save_standings_to_json(season.standings(), os.path.join(league_dir, 'standings.json'))
+        save_standings_to_json(season.weekly_standings, os.path.join(league_dir, 'standings_by_week.json'))
+        result['timings']['standings'] = time.perf_counter() - stage_start
+
+        stage = 'analysis'
+        stage_start = time.perf_counter()
+        analyzer = FantasyLeagueAnalyzer(fantasy_data, engine='numpy')
+        analyzer.analyze()
+        save_json({
+            'rankings': analyzer.rank_teams(),
+            'teams': {team_id: {'team_name': team['team_name'], 'metrics': team['metrics']}
+                      for team_id, team in analyzer.teams.items()},
+        }, os.path.join(league_dir, 'analysis.json'))
+        result['timings']['analysis'] = time.perf_counter() - stage_start
+
+        stage = 'insights'
+        stage_start = time.perf_counter()
+        save_json({week: generate_insights(teams) for week, teams in fantasy_data.items()},
+                  os.path.join(league_dir, 'insights.json'))
+        result['timings']['insights'] = time.perf_counter() - stage_start
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = {'stage': stage, 'message': f"{type(e).__name__}: {e}",
+                           'traceback': traceback.format_exc()}
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def failed_result(league, stage, message):
+    """Builds the result of a league that did not run to completion in a worker."""
+    return {'league_id': league['league_id'], 'status': 'failed', 'timings': {}, 'seconds': None,
+            'error': {'stage': stage, 'message': message, 'traceback': None}}
+
+
+def report(result):
+    print(f"{result['league_id']}: {result['status']}"
+          + (f" ({result['error']['message']})" if result['error'] else ""))
+
+
+def run_pool(leagues, output_dir, workers=None):
+    """
+    Runs leagues in one process pool.
+
+    If a worker process dies, the pool breaks and every league still in it is lost;
+    those are handed back so they can be run again in a new pool.
+
+    Returns:
+        tuple: (results, unfinished); the results of the leagues that completed and the
+            leagues lost to a broken pool.
+    """
+    results = []
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for league in leagues:
+            try:
+                futures[executor.submit(run_league, league, output_dir)] = league
+            except BrokenProcessPool:
+                unfinished.append(league)
+        for future in as_completed(futures):
+            league = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                unfinished.append(league)
+                continue
+            except Exception as e:
+                result = failed_result(league, 'worker', f"{type(e).__name__}: {e}")
+            report(result)
+            results.append(result)
+    return results, unfinished
+
+
+def run_batch(leagues, output_dir, workers=None):
+    """
+    Runs every league in parallel across a process pool and writes a summary.
+
+    A worker that dies (e.g. out of memory) breaks the pool; the leagues that had not
+    finished are run again in a new pool. A league caught in POOL_RESTARTS crashes is
+    then run in a pool of its own, so a league that keeps crashing its worker is
+    recorded as failed without taking the others with it.
+
+    Args:
+        leagues (list): The leagues, as returned by discover_leagues().
+        output_dir (str): The batch output directory.
+        workers (int): Process pool size; defaults to the number of CPUs.
+
+    Returns:
+        dict: The batch summary (also written to <output_dir>/summary.json).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    results = []
+    for league in leagues:
+        if 'error' in league:
+            results.append(failed_result(league, 'manifest', league['error']))
+            report(results[-1])
+    pending = [league for league in leagues if 'error' not in league]
+
+    crashes = {}
+    while pending:
+        isolated = [league for league in pending if crashes.get(league['league_id'], 0) >= POOL_RESTARTS]
+        shared = [league for league in pending if crashes.get(league['league_id'], 0) < POOL_RESTARTS]
+        pending = []
+        if shared:
+            finished, unfinished = run_pool(shared, output_dir, workers)
+            results.extend(finished)
+            if unfinished:
+                print(f"A worker process died; running {len(unfinished)} unfinished leagues again.")
+            for league in unfinished:
+                crashes[league['league_id']] = crashes.get(league['league_id'], 0) + 1
+                pending.append(league)
+        for league in isolated:
+            finished, unfinished = run_pool([league], output_dir, 1)
+            results.extend(finished)
+            if unfinished:
+                results.append(failed_result(league, 'worker', 'The worker process died while running this league.'))
+                report(results[-1])
+
+    results.sort(key=lambda result: result['league_id'])
+    summary = {
+        'leagues': len(results),
+        'succeeded': sum(result['status'] == 'ok' for result in results),
+        'failed': sum(result['status'] != 'ok' for result in results),
+        'seconds': time.perf_counter() - start,
+        'results': results,
+    }
+    save_json(summary, os.path.join(output_dir, 'summary.json'))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run standings, analysis and insights for many leagues.")
+    parser.add_argument('source', help="Directory of league sub-directories, or a JSON league manifest")
+    parser.add_argument('--output', default='batch_output', help="Output directory (default: batch_output)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    summary = run_batch(discover_leagues(args.source), args.output, args.workers)
+    print(f"{summary['succeeded']} of {summary['leagues']} leagues succeeded in {summary['seconds']:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from syntheticLeague import (generate_league, render_draft_page, render_matchups_page, render_roster_page,
+                             synthetic_player_id)
+
+FIXTURE_LEAGUE_ID = '22030'
+FIXTURE_PORT = 8765
+
+# Live week: kickoff windows the players' games are spread over, and how many steps the week is played in
+GAME_WINDOWS = 3
+LIVE_STEPS = 12
+LIVE_STEP_SECONDS = 5.0
+
+
+def build_site(league_id=FIXTURE_LEAGUE_ID, num_teams=12, num_weeks=14, roster_size=16, seed=0):
+    """
+    Renders every page a season backfill fetches for a synthetic league.
+
+    Returns:
+        tuple: (pages, league_data, schedule); pages maps (kind, team_id, week) to HTML, where
+            kind is 'roster', 'matchups' or 'draft'.
+    """
+    rng = random.Random(seed)
+    league_data, schedule = generate_league(num_teams, num_weeks, roster_size, seed)
+    pages = {('draft', None, None): render_draft_page(league_data, num_teams)}
+    for week, teams in league_data.items():
+        for team_id, players in teams.items():
+            pages[('roster', int(team_id), int(week))] = render_roster_page(rng, players[0]['team_name'], players)
+    for week, matchups in schedule.items():
+        pages[('matchups', None, int(week))] = render_matchups_page(league_id, matchups)
+    return pages, league_data, schedule
+
+
+def live_points(player, step, steps=LIVE_STEPS):
+    """
+    Returns the points a player has scored by a step of the live week.
+
+    Each player's game falls in one of GAME_WINDOWS kickoff windows (by player ID) and
+    lasts one window; the points accrue evenly over the game and reach the final score.
+    """
+    window_steps = steps / GAME_WINDOWS
+    kickoff = (int(synthetic_player_id(player)) % GAME_WINDOWS) * window_steps
+    played = min(max((step - kickoff) / window_steps, 0.0), 1.0)
+    return round(player['fantasy_points'] * played, 2)
+
+
+def render_live_roster_page(league_data, week, team_id, step, steps=LIVE_STEPS):
+    """
+    Renders a roster page of the live week as it stands at a step.
+
+    The markup is seeded by week and team so successive steps differ only in the points.
+
+    Returns:
+        str: The page HTML.
+    """
+    players = [dict(player, fantasy_points=live_points(player, step, steps))
+               for player in league_data[str(week)][str(team_id)]]
+    return render_roster_page(random.Random(f"{week}-{team_id}"), players[0]['team_name'], players)
+
+
+def enable_live_week(server, league_data, week, steps=LIVE_STEPS, step_seconds=LIVE_STEP_SECONDS):
+    """
+    Makes a running server play a week live: its roster pages advance one step every step_seconds
+    from now, from no points scored to the final scores after `steps` steps.
+
+    Args:
+        server (ThreadingHTTPServer): A server from start_server().
+        league_data (dict): The league data from build_site().
+        week (int): The week to play live.
+        steps (int): Steps until every game is final.
+        step_seconds (float): Seconds per step.
+    """
+    with server.lock:
+        server.live = {'league_data': league_data, 'week': int(week), 'steps': steps,
+                       'step_seconds': step_seconds, 'started': time.monotonic(), 'pages': {}}
+
+
+def live_page(server, team_id):
+    """Returns the live week's roster page for a team at the current step, rendering each step once."""
+    live = server.live
+    step = min(int((time.monotonic() - live['started']) / live['step_seconds']), live['steps'])
+    key = (team_id, step)
+    with server.lock:
+        page = live['pages'].get(key)
+    if page is None and str(team_id) in live['league_data'][str(live['week'])]:
+        page = render_live_roster_page(live['league_data'], live['week'], team_id, step, live['steps'])
+        with server.lock:
+            live['pages'][key] = page
+    return page
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the Yahoo URLs the scrapers request from a pre-rendered site, or a live week as it is played."""
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+        key = None
+        if not parts:
+            body = '<html><body>Fixture league</body></html>'
+        else:
+            if len(parts) == 4 and parts[3] == 'team':
+                key = ('roster', int(parts[2]), int(query.get('week', ['0'])[0]))
+            elif len(parts) == 2 and 'matchup_week' in query:
+                key = ('matchups', None, int(query['matchup_week'][0]))
+            elif len(parts) == 3 and parts[2] == 'draftresults':
+                key = ('draft', None, None)
+            if server.live is not None and key[0] == 'roster' and key[2] == server.live['week']:
+                body = live_page(server, key[1])
+            else:
+                body = server.pages.get(key)
+            if body is None:
+                self.send_error(404)
+                return
+
+        if server.latency:
+            time.sleep(server.latency)
+        with server.lock:
+            server.requests += 1
+            fail = key is not None and server.rng.random() < server.fail_rate
+        if fail:
+            self.send_error(503)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(pages, port=0, fail_rate=0.0, latency=0.0, seed=0):
+    """
+    Serves a site on localhost in a background thread.
+
+    Args:
+        pages (dict): The pages from build_site().
+        port (int): The port, or 0 for any free port.
+        fail_rate (float): Share of page requests answered with 503, to exercise retries.
+        latency (float): Seconds to wait before answering each request.
+        seed (int): The seed of the failure draws.
+
+    Returns:
+        ThreadingHTTPServer: The running server; its base URL is http://127.0.0.1:<server.server_port>.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    server.daemon_threads = True
+    server.pages = pages
+    server.fail_rate = fail_rate
+    server.latency = latency
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.live = None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic Yahoo league for offline scraper runs.')
+    parser.add_argument('--port', type=int, default=FIXTURE_PORT)
+    parser.add_argument('--league-id', default=FIXTURE_LEAGUE_ID)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=14)
+    parser.add_argument('--roster-size', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of page requests answered with 503.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before each response.')
+    parser.add_argument('--live-week', type=int, help='Week whose roster pages are played live, for liveScoring.py.')
+    parser.add_argument('--live-steps', type=int, default=LIVE_STEPS, help='Steps until the live week is final.')
+    parser.add_argument('--live-step-seconds', type=float, default=LIVE_STEP_SECONDS, help='Seconds per live step.')
+    args = parser.parse_args()
+
+    pages, league_data, _ = build_site(args.league_id, args.teams, args.weeks, args.roster_size, args.seed)
+    server = start_server(pages, args.port, args.fail_rate, args.latency, args.seed)
+    if args.live_week:
+        enable_live_week(server, league_data, args.live_week, args.live_steps, args.live_step_seconds)
+        print(f"Playing week {args.live_week} live over {args.live_steps * args.live_step_seconds:.0f} seconds")
+    print(f"Serving league {args.league_id} at http://127.0.0.1:{server.server_port} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import numpy as np
+
+import app as flask_app
+import calcStandings
+from archive.insights import generate_insights
+from bestManager import FantasyLeagueAnalyzer
+from leagueCache import snapshot_cache
+from rosterParser import parse_roster_page
+from syntheticLeague import generate_league, render_roster_page
+from yahoo_data import YahooFantasyAPI
+
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+# Teams in the single large week the insights are also timed on, where per-player costs dominate
+INSIGHTS_TEAMS = 2000
+
+
+def measure(name, func, repeat=5):
+    """
+    Times a function and records its peak traced memory.
+
+    The function runs once under tracemalloc for the memory figure, then `repeat`
+    more times without tracing for the timings.
+
+    Args:
+        name (str): The benchmark name.
+        func (callable): The function to benchmark; called with no arguments.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        dict: The benchmark result.
+    """
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    result = {
+        'name': name,
+        'repeat': repeat,
+        'best_s': min(timings),
+        'mean_s': sum(timings) / len(timings),
+        'peak_kb': peak / 1024,
+    }
+    print(f"{name:<40} best {result['best_s'] * 1000:10.3f} ms   mean {result['mean_s'] * 1000:10.3f} ms   "
+          f"peak {result['peak_kb']:10.1f} KiB")
+    return result
+
+
+def analyzed(league_data, engine='python'):
+    """Returns an analyzer that has already run analyze()."""
+    analyzer = FantasyLeagueAnalyzer(league_data, engine)
+    analyzer.analyze()
+    return analyzer
+
+
+def run_parser_benchmarks(league_data, seed, repeat, pages_dir=None):
+    """
+    Benchmarks roster page parsing in pages per second, single-pass parser against BeautifulSoup.
+
+    Both parsers must return identical players for every page before anything is timed.
+
+    Args:
+        league_data (dict): Synthetic league data to render one page per team and week from.
+        seed (int): The random seed for the page markup.
+        repeat (int): Timed runs per benchmark.
+        pages_dir (str): A directory of saved roster pages (*.html) to parse instead.
+
+    Returns:
+        list: The benchmark results, each with a 'pages_per_s' figure.
+    """
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+            with open(path, 'r', encoding='utf-8') as file:
+                pages.append(file.read())
+    else:
+        rng = random.Random(seed)
+        pages = [render_roster_page(rng, players[0]['team_name'], players)
+                 for teams in league_data.values() for players in teams.values()]
+    if not pages:
+        raise RuntimeError("No roster pages to benchmark.")
+
+    def parse_all(parse):
+        # Missing-table notices would swamp the benchmark output
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [parse(page, team_id) for team_id, page in enumerate(pages)]
+
+    if parse_all(parse_roster_page) != parse_all(YahooFantasyAPI.parse_roster_page_soup):
+        raise RuntimeError("The single-pass parser disagrees with BeautifulSoup on the benchmark pages.")
+
+    results = []
+    for name, parse in [('parse_roster_pages_single_pass', parse_roster_page),
+                        ('parse_roster_pages_beautifulsoup', YahooFantasyAPI.parse_roster_page_soup)]:
+        result = measure(name, lambda: parse_all(parse), repeat)
+        result['pages'] = len(pages)
+        result['pages_per_s'] = len(pages) / result['best_s']
+        print(f"{name:<40} {result['pages_per_s']:10.1f} pages/s over {len(pages)} pages")
+        results.append(result)
+    return results
+
+
+def run_benchmarks(num_teams, num_weeks, roster_size, num_leagues, seed, repeat, pages_dir=None,
+                   insights_teams=INSIGHTS_TEAMS):
+    """
+    Runs every benchmark against synthetic leagues.
+
+    Args:
+        num_teams (int): Teams per league.
+        num_weeks (int): Weeks of scores per league.
+        roster_size (int): Players per roster.
+        num_leagues (int): Leagues pooled into the analyzer benchmarks.
+        seed (int): The random seed for the synthetic data.
+        repeat (int): Timed runs per benchmark.
+        pages_dir (str): Saved roster pages for the parser benchmarks, or None for synthetic pages.
+        insights_teams (int): Teams in the large week generate_insights() is timed on; 0 to skip it.
+
+    Returns:
+        list: The benchmark results.
+    """
+    league_data, schedule_data = generate_league(num_teams, num_weeks, roster_size, seed)
+
+    # Pool several leagues into one analyzer run by prefixing team IDs
+    pooled_data = {week: dict(teams) for week, teams in league_data.items()}
+    for league in range(1, num_leagues):
+        extra_data, _ = generate_league(num_teams, num_weeks, roster_size, seed + league)
+        for week, teams in extra_data.items():
+            pooled_data[week].update({f"{league}-{team_id}": players for team_id, players in teams.items()})
+
+    results = [
+        measure('analyzer_construction', lambda: FantasyLeagueAnalyzer(pooled_data), repeat),
+        measure('analyze_python', lambda: analyzed(pooled_data, 'python'), repeat),
+        measure('analyze_numpy', lambda: analyzed(pooled_data, 'numpy'), repeat),
+    ]
+    analyzer = analyzed(pooled_data)
+    results.append(measure('rank_teams', analyzer.rank_teams, repeat))
+    results.append(measure('standings', lambda: calcStandings.compute_standings(league_data, schedule_data), repeat))
+    results.append(measure('generate_insights_per_week',
+                           lambda: [generate_insights(teams) for teams in league_data.values()], repeat))
+    if insights_teams:
+        large_week, _ = generate_league(insights_teams, 1, roster_size, seed)
+        teams = next(iter(large_week.values()))
+        result = measure('generate_insights_large_week', lambda: generate_insights(teams), repeat)
+        result['teams'] = insights_teams
+        results.append(result)
+    results.extend(run_route_benchmarks(league_data, schedule_data, repeat))
+    results.extend(run_parser_benchmarks(league_data, seed, repeat, pages_dir))
+    return results
+
+
+def run_route_benchmarks(league_data, schedule_data, repeat):
+    """
+    Benchmarks the Flask routes through the test client against synthetic data files.
+
+    Cold runs clear the snapshot cache first; warm runs reuse it.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, 'league_data_by_week.json')
+        schedule_file = os.path.join(directory, 'league_schedule_weeks_1_to_14.json')
+        standings_file = os.path.join(directory, 'standings.json')
+        with open(data_file, 'w') as file:
+            json.dump(league_data, file, indent=4)
+        with open(schedule_file, 'w') as file:
+            json.dump(schedule_data, file, indent=4)
+        calcStandings.save_standings_to_json(calcStandings.compute_standings(league_data, schedule_data), standings_file)
+
+        originals = (flask_app.DATA_FILE, flask_app.SCHEDULE_FILE, flask_app.STANDINGS_FILE)
+        flask_app.DATA_FILE, flask_app.SCHEDULE_FILE, flask_app.STANDINGS_FILE = data_file, schedule_file, standings_file
+        client = flask_app.app.test_client()
+
+        def cold(path):
+            snapshot_cache.clear()
+            return client.get(path)
+
+        try:
+            for path in ['/analyze', '/matchup_insights', '/api/analysis', '/api/standings']:
+                if client.get(path).status_code != 200:
+                    raise RuntimeError(f"Route {path} failed during benchmarking.")
+                results.append(measure(f"route_cold {path}", lambda: cold(path), repeat))
+                results.append(measure(f"route_warm {path}", lambda: client.get(path), repeat))
+        finally:
+            flask_app.DATA_FILE, flask_app.SCHEDULE_FILE, flask_app.STANDINGS_FILE = originals
+            snapshot_cache.clear()
+    return results
+
+
+def git_commit():
+    """Returns the current git commit, or None outside a git checkout."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results, config, output_file=None):
+    """
+    Saves benchmark results with their configuration and environment.
+
+    Returns:
+        str: The path of the written file.
+    """
+    if output_file is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output_file = os.path.join(RESULTS_DIR, f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'config': config,
+        'results': results,
+    }
+    with open(output_file, 'w') as file:
+        json.dump(report, file, indent=4)
+    return output_file
+
+
+def compare(baseline_file, current_file):
+    """Prints the speed and memory ratio of each benchmark between two result files."""
+    with open(baseline_file, 'r') as file:
+        baseline = {result['name']: result for result in json.load(file)['results']}
+    with open(current_file, 'r') as file:
+        current = {result['name']: result for result in json.load(file)['results']}
+
+    print(f"{'benchmark':<40} {'baseline ms':>12} {'current ms':>12} {'speedup':>8} {'memory':>8}")
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]
+        speedup = before['best_s'] / result['best_s'] if result['best_s'] else float('inf')
+        memory = result['peak_kb'] / before['peak_kb'] if before['peak_kb'] else float('inf')
+        print(f"{name:<40} {before['best_s'] * 1000:12.3f} {result['best_s'] * 1000:12.3f} "
+              f"{speedup:7.2f}x {memory:7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analyzer, standings, insights, Flask routes and roster page parsing.")
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=14)
+    parser.add_argument('--roster-size', type=int, default=16)
+    parser.add_argument('--leagues', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--insights-teams', type=int, default=INSIGHTS_TEAMS,
+                        help="Teams in the large week the insights are timed on (0 to skip)")
+    parser.add_argument('--pages', help="Directory of saved roster pages for the parser benchmarks "
+                                         "(default: synthetic pages)")
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="Compare two result files instead of running benchmarks")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    config = {
+        'teams': args.teams,
+        'weeks': args.weeks,
+        'roster_size': args.roster_size,
+        'leagues': args.leagues,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'pages': args.pages,
+        'insights_teams': args.insights_teams,
+    }
+    results = run_benchmarks(args.teams, args.weeks, args.roster_size, args.leagues, args.seed, args.repeat,
+                             args.pages, args.insights_teams)
+    print(f"Results saved to {save_results(results, config, args.output)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+import json
+import os
+import random
+
+# Starting slots in the order Yahoo lists them on a roster page
+STARTING_SLOTS = ['QB', 'WR', 'WR', 'RB', 'RB', 'TE', 'W/R/T', 'K', 'DEF']
+
+# Rough share of each position on a fantasy roster
+POSITION_WEIGHTS = {'QB': 2, 'RB': 5, 'WR': 5, 'TE': 2, 'K': 1, 'DEF': 1}
+
+# Typical projected points per position (mean, spread)
+POSITION_POINTS = {
+    'QB': (18.0, 6.0), 'RB': (11.0, 5.0), 'WR': (11.0, 5.0),
+    'TE': (7.0, 4.0), 'K': (8.0, 3.0), 'DEF': (7.0, 4.0),
+}
+
+NFL_TEAMS = ['Ari', 'Atl', 'Bal', 'Buf', 'Car', 'Chi', 'Cin', 'Cle', 'Dal', 'Den', 'Det', 'GB',
+             'Hou', 'Ind', 'Jax', 'KC', 'LV', 'LAC', 'LAR', 'Mia', 'Min', 'NE', 'NO', 'NYG',
+             'NYJ', 'Phi', 'Pit', 'SF', 'Sea', 'TB', 'Ten', 'Was']
+
+
+def generate_roster(rng, roster_size):
+    """
+    Generates the positions of one roster, guaranteeing every starting slot can be filled.
+
+    Args:
+        rng (random.Random): The seeded random generator.
+        roster_size (int): The number of players on the roster.
+
+    Returns:
+        list: The player positions.
+    """
+    positions = ['QB', 'WR', 'WR', 'RB', 'RB', 'TE', rng.choice(['RB', 'WR', 'TE']), 'K', 'DEF']
+    names, weights = zip(*POSITION_WEIGHTS.items())
+    while len(positions) < roster_size:
+        positions.append(rng.choices(names, weights)[0])
+    return positions[:roster_size]
+
+
+def generate_week(rng, team_rosters, team_names):
+    """
+    Generates one week of league data for every team.
+
+    Args:
+        rng (random.Random): The seeded random generator.
+        team_rosters (dict): Team ID -> list of (player name, NFL team, position, bye week).
+        team_names (dict): Team ID -> fantasy team name.
+
+    Returns:
+        dict: Team ID -> players, in the league_data_by_week.json player shape.
+    """
+    week = {}
+    for team_id, roster in team_rosters.items():
+        open_slots = list(STARTING_SLOTS)
+        players = []
+        for name, nfl_team, position, bye_week in roster:
+            mean, spread = POSITION_POINTS[position]
+            projected = round(max(0.0, rng.gauss(mean, spread / 2)), 2)
+            actual = round(max(-4.0, rng.gauss(projected, spread)), 2)
+
+            if rng.random() < 0.02:
+                lineup_pos = 'IR'
+            elif position in open_slots:
+                lineup_pos = position
+                open_slots.remove(position)
+            elif position in ('RB', 'WR', 'TE') and 'W/R/T' in open_slots:
+                lineup_pos = 'W/R/T'
+                open_slots.remove('W/R/T')
+            else:
+                lineup_pos = 'BN'
+
+            players.append({
+                'lineup_pos': lineup_pos,
+                'name': name,
+                'team': nfl_team,
+                'position': position,
+                'bye_week': bye_week,
+                'fantasy_points': actual,
+                'projected_fantasy_points': projected,
+                'points_diff': actual - projected,
+                'team_name': team_names[team_id],
+            })
+        week[team_id] = players
+    return week
+
+
+def generate_schedule(num_teams, num_weeks):
+    """
+    Generates a round-robin schedule in the league_schedule_weeks_1_to_14.json shape.
+
+    Args:
+        num_teams (int): The number of teams (an odd count leaves one team idle each week).
+        num_weeks (int): The number of weeks.
+
+    Returns:
+        dict: Week -> list of {'team1_id', 'team2_id'} matchups.
+    """
+    teams = [str(team_id) for team_id in range(1, num_teams + 1)]
+    if len(teams) % 2:
+        teams.append(None)
+    schedule = {}
+    for week in range(1, num_weeks + 1):
+        rotation = (week - 1) % (len(teams) - 1)
+        order = [teams[0]] + teams[1:][rotation:] + teams[1:][:rotation]
+        half = len(order) // 2
+        matchups = []
+        for team1_id, team2_id in zip(order[:half], reversed(order[half:])):
+            if team1_id is not None and team2_id is not None:
+                matchups.append({'team1_id': team1_id, 'team2_id': team2_id})
+        schedule[str(week)] = matchups
+    return schedule
+
+
+def generate_league(num_teams=12, num_weeks=14, roster_size=16, seed=0):
+    """
+    Generates a synthetic league with the same shape as the scraped data files.
+
+    Args:
+        num_teams (int): The number of teams.
+        num_weeks (int): The number of weeks of scores.
+        roster_size (int): The number of players per roster.
+        seed (int): The random seed; the same seed always produces the same league.
+
+    Returns:
+        tuple: (league_data_by_week, schedule) dicts.
+    """
+    rng = random.Random(seed)
+    team_names = {str(team_id): f"Synthetic Team {team_id}" for team_id in range(1, num_teams + 1)}
+    team_rosters = {}
+    player_number = 0
+    for team_id in team_names:
+        roster = []
+        for position in generate_roster(rng, roster_size):
+            player_number += 1
+            roster.append((f"Player {player_number}", rng.choice(NFL_TEAMS), position, str(rng.randint(5, 14))))
+        team_rosters[team_id] = roster
+
+    league_data = {str(week): generate_week(rng, team_rosters, team_names) for week in range(1, num_weeks + 1)}
+    return league_data, generate_schedule(num_teams, max(num_weeks, 14))
+
+
+def write_league(output_dir, num_teams=12, num_weeks=14, roster_size=16, seed=0):
+    """
+    Writes a synthetic league_data_by_week.json and league_schedule_weeks_1_to_14.json to a directory.
+
+    Returns:
+        tuple: The paths of the league data and schedule files.
+    """
+    league_data, schedule = generate_league(num_teams, num_weeks, roster_size, seed)
+    os.makedirs(output_dir, exist_ok=True)
+    data_file = os.path.join(output_dir, 'league_data_by_week.json')
+    schedule_file = os.path.join(output_dir, 'league_schedule_weeks_1_to_14.json')
+    with open(data_file, 'w') as file:
+        json.dump(league_data, file, indent=4)
+    with open(schedule_file, 'w') as file:
+        json.dump(schedule, file, indent=4)
+    return data_file, schedule_file
+
+
+def write_leagues(output_dir, num_leagues=1, num_teams=12, num_weeks=14, roster_size=16, seed=0):
+    """
+    Writes several synthetic leagues, one sub-directory per league.
+
+    Returns:
+        list: The league directories.
+    """
+    directories = []
+    for league in range(num_leagues):
+        directory = os.path.join(output_dir, f"league_{league + 1}")
+        write_league(directory, num_teams, num_weeks, roster_size, seed + league)
+        directories.append(directory)
+    return directories
+
+
+def synthetic_player_id(player):
+    """Returns a stable Yahoo-style player ID for a synthetic player ('Player <n>')."""
+    return str(10000 + int(player['name'].split()[-1]))
+
+
+def render_player_row(rng, player):
+    """
+    Renders one player as a Yahoo roster table row, varying the markup the way real pages do.
+
+    Args:
+        rng (random.Random): The seeded random generator.
+        player (dict): A player in the league_data_by_week.json shape, or None for an empty slot.
+
+    Returns:
+        str: The <tr> markup.
+    """
+    if player is None:
+        return ('<tr><td class="pos Alt Ta-c Bdrend"><span class="pos-label">BN</span></td>'
+                '<td class="player Alt Ph-sm"><div class="ysf-player-name emptyplayer">(Empty)</div></td>'
+                '<td class="Alt Ta-end Bdrstart">&nbsp;</td><td class="Ta-end Nowrap pts Bdrstart">-</td></tr>')
+    status = ''
+    if rng.random() < 0.1:
+        status = f'<span class="ysf-game-status Fz-xxs F-injury">{rng.choice(["Q", "O", "IR", "D"])}</span>'
+    projected = player['projected_fantasy_points']
+    projected_cell = rng.choice([
+        f'<td class="Alt Ta-end Nowrap"><div class="F-shade Fw-b">{projected:.2f}</div></td>',
+        f'<td class="Alt Ta-end Nowrap"><div class="F-shade">{projected:.2f}</div></td>',
+        f'<td class="Alt Ta-end Nowrap">{projected:.2f}</td>',
+    ])
+    stat_cells = ''.join(f'<td class="Ta-end">{rng.randint(0, 120)}</td>' for _ in range(12))
+    name = player['name'].replace("'", '&#39;')
+    return (
+        f'<tr class="{rng.choice(["", "Selected", "Alt"])}">'
+        f'<td class="pos Alt Ta-c Bdrend"><span class="pos-label" data-pos="{player["lineup_pos"]}">{player["lineup_pos"]}</span></td>'
+        f'<td class="player Alt Ph-sm"><div class="ysf-player-name Nowrap Grid-u Relative Lh-xs Ta-start">'
+        f'<a class="Nowrap name F-link" href="https://sports.yahoo.com/nfl/players/{synthetic_player_id(player)}" '
+        f'target="_blank">{name}</a> <!-- player link -->'
+        f'<span class="Fz-xxs">{player["team"]} - {player["position"]}</span></div>'
+        f'<div class="ysf-player-video-link"><a class="F-reset" href="#"><span class="Icon Fz-xs">&#xe002;</span></a></div></td>'
+        f'<td class="player-status Alt Ta-c">{status}</td>'
+        f'<td class="Alt Ta-c"><div class="ysf-game-status"><a href="#">W 27-20 vs {rng.choice(NFL_TEAMS)}</a></div></td>'
+        f'<td class="Alt Ta-end Bdrstart">{player["bye_week"]}</td>'
+        f'<td class="Ta-end Nowrap pts Bdrstart"><span class="Fw-b">{player["fantasy_points"]:.2f}</span></td>'
+        f'{projected_cell}{stat_cells}</tr>'
+    )
+
+
+def render_roster_page(rng, team_name, players):
+    """
+    Renders a synthetic Yahoo roster page with the three statTable tables.
+
+    The page carries page chrome (scripts, styles, navigation) around the tables so
+    parser benchmarks see a realistic amount of markup that is not roster data.
+
+    Args:
+        rng (random.Random): The seeded random generator.
+        team_name (str): The fantasy team name.
+        players (list): The roster, in the league_data_by_week.json player shape.
+
+    Returns:
+        str: The page HTML.
+    """
+    tables = {'statTable0': [], 'statTable1': [], 'statTable2': []}
+    for player in players:
+        table_id = {'K': 'statTable1', 'DEF': 'statTable2'}.get(player['position'], 'statTable0')
+        tables[table_id].append(player)
+    tables['statTable0'].append(None)
+
+    chrome = ''.join(
+        f'<li class="Nav-item"><a class="Navtarget" href="/f1/{rng.randint(1, 99999)}/{item}">Link &amp; {item}</a></li>'
+        for item in range(200)
+    )
+    script = 'var roster = {' + ','.join(f'"k{item}": "<td>{item}</td>"' for item in range(400)) + '};'
+    sections = []
+    for table_id, table_players in tables.items():
+        rows = ''.join(render_player_row(rng, player) for player in table_players)
+        sections.append(
+            f'<section><table id="{table_id}" class="Table Table-px-xs Table-mid Table-interactive">'
+            f'<thead><tr><th>Pos</th><th>Player</th><th>Status</th><th>Opp</th><th>Bye</th><th>Fan Pts</th>'
+            f'<th>Proj</th></tr></thead><tbody>{rows}</tbody></table></section>'
+        )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Roster</title>'
+        f'<style>.Nav-item {{ display: inline; }}</style><script>{script}</script></head><body>'
+        f'<nav><ul>{chrome}</ul></nav><div id="team-card-info">'
+        f'<span class="Navtarget F-reset No-case Fz-35 Fw-b team-name">{team_name} &#x1F3C8;</span></div>'
+        f'<main>{"".join(sections)}</main><footer><br><img src="logo.png"><p>Data &copy; Yahoo</footer>'
+        f'<script>window.__ready = true;</script></body></html>'
+    )
+
+
+def write_roster_pages(output_dir, num_teams=12, num_weeks=1, roster_size=16, seed=0):
+    """
+    Writes one synthetic roster page per team and week, named week_<week>_team_<team_id>.html.
+
+    Returns:
+        list: The page paths.
+    """
+    rng = random.Random(seed)
+    league_data, _ = generate_league(num_teams, num_weeks, roster_size, seed)
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for week, teams in league_data.items():
+        for team_id, players in teams.items():
+            path = os.path.join(output_dir, f"week_{week}_team_{team_id}.html")
+            with open(path, 'w') as file:
+                file.write(render_roster_page(rng, players[0]['team_name'], players))
+            paths.append(path)
+    return paths
+
+
+def render_matchups_page(league_id, matchups):
+    """
+    Renders a synthetic Yahoo league page with one week's matchups.
+
+    Args:
+        league_id (str): The league ID, used in the team links.
+        matchups (list): The week's {'team1_id', 'team2_id'} matchups.
+
+    Returns:
+        str: The page HTML.
+    """
+    items = ''.join(
+        f'<li class="Linkable Listitem"><div class="Grid-u-1-2"><a class="F-link" href="/f1/{league_id}/{matchup["team1_id"]}">'
+        f'Team {matchup["team1_id"]}</a></div><div class="Grid-u-1-2"><a class="F-link" '
+        f'href="/f1/{league_id}/{matchup["team2_id"]}">Team {matchup["team2_id"]}</a></div></li>'
+        for matchup in matchups
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Matchups</title></head><body>'
+        f'<section id="matchupweek"><div class="matchups-body"><ul class="List Mtop-lg">{items}</ul></div></section>'
+        '</body></html>'
+    )
+
+
+def render_draft_page(league_data, team_count=12):
+    """
+    Renders a synthetic Yahoo draft results page from the week 1 rosters, as a snake draft.
+
+    Args:
+        league_data (dict): The league_data_by_week.json data.
+        team_count (int): Picks per round; the draft parser assumes 12.
+
+    Returns:
+        str: The page HTML.
+    """
+    first_week = league_data[min(league_data, key=int)]
+    rosters = [first_week[team_id] for team_id in sorted(first_week, key=int)][:team_count]
+    rows = []
+    for round_number in range(1, max(len(players) for players in rosters) + 1):
+        rows.append(f'<tr><th colspan="3">Round {round_number}</th></tr>')
+        order = range(len(rosters)) if round_number % 2 else reversed(range(len(rosters)))
+        for pick, team_index in enumerate(order, start=1):
+            players = rosters[team_index]
+            if round_number > len(players):
+                continue
+            player = players[round_number - 1]
+            rows.append(
+                f'<tr><td class="first">{pick}.</td><td><a class="name" '
+                f'href="https://sports.yahoo.com/nfl/players/{synthetic_player_id(player)}">{player["name"]}</a> '
+                f'<span class="Block">({player["team"]} - {player["position"]})</span></td>'
+                f'<td class="last" title="{player["team_name"]}">{player["team_name"]}</td></tr>'
+            )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Draft Results</title></head><body>'
+        f'<div id="drafttables"><table><tbody>{"".join(rows)}</tbody></table></div></body></html>'
+    )
@@ -1,15 +1,29 @@
 import json
+import os
+
+import analysisEngine
+import lineupSolver
+from segmentStore import iter_league_weeks
+
+# Player fields the analyzer reads; columnar stores only need to load these
+ANALYZER_FIELDS = ['lineup_pos', 'position', 'fantasy_points', 'projected_fantasy_points', 'team_name']
 
 class FantasyLeagueAnalyzer:
-    def __init__(self, data):
+    def __init__(self, data, engine='python'):
         """
         Initializes the FantasyLeagueAnalyzer with the league data.
 
         Args:
             data (dict): The league data containing teams and player information.
+            engine (str): 'python' computes metrics team by team; 'numpy' computes them
+                for all teams in one batched pass (see analysisEngine). Results are identical.
         """
-        self.data = data  # Raw data input
+        if engine not in ('python', 'numpy'):
+            raise ValueError(f"Unknown analysis engine '{engine}'.")
+        self.data = dict(data)  # Raw data input, copied so add_week() can extend it in place
         self.teams = {}   # Processed team data
+        self.engine = engine
+        self.analyzed = False  # Whether lineups and metrics are up to date with self.data
 
         # Lineup requirements (number of players required in each position)
         self.lineup_requirements = {
@@ -28,177 +42,270 @@ class FantasyLeagueAnalyzer:
         # Process the raw data to structure it per team
         self.process_data()
 
+    @classmethod
+    def from_columnar(cls, store, weeks=None, engine='python'):
+        """
+        Creates an analyzer from a columnar player-week store, loading only the columns it needs.
+
+        Args:
+            store (ColumnarStore): The opened columnar store.
+            weeks (list): The week keys to analyze, or None for every week.
+            engine (str): The metrics engine, see __init__.
+
+        Returns:
+            FantasyLeagueAnalyzer: The analyzer.
+        """
+        return cls(store.to_dict(weeks, ANALYZER_FIELDS), engine)
+
+    @classmethod
+    def from_stream(cls, weeks, engine='python'):
+        """
+        Creates an analyzer from a stream of weeks, analyzing each one as it arrives.
+
+        Only one week is read from the stream at a time, but the analyzer keeps every
+        week's rosters (see add_week()), so its memory still grows with the history.
+
+        Args:
+            weeks (iterable): (week, {team_id: players}) pairs, e.g. from segmentStore.iter_league_weeks().
+            engine (str): The metrics engine, see __init__.
+
+        Returns:
+            FantasyLeagueAnalyzer: The analyzed analyzer, ready for add_week().
+        """
+        analyzer = cls({}, engine)
+        for week, teams in weeks:
+            analyzer.add_week(week, teams)
+        return analyzer
+
     def process_data(self):
         """
         Processes the raw data to structure it per team for easier analysis.
         """
         for week, teams in self.data.items():
-            for team_id, players in teams.items():
-                if not players:
-                    raise ValueError(f"No player data found for team ID {team_id} in week {week}.")
-                team_name = players[0]['team_name']
-                if team_id not in self.teams:
-                    self.teams[team_id] = {
-                        'team_name': team_name,
-                        'players': [],
-                        'lineups': {
-                            'chosen': [],
-                            'optimal_projected': [],
-                            'optimal_actual': []
-                        },
-                        'metrics': {}
-                    }
-                # Aggregate players across all weeks
-                self.teams[team_id]['players'].extend(players)
+            self.process_week(week, teams)
+
+    def process_week(self, week, teams):
+        """
+        Adds one week of raw data to the per-team structure.
+
+        Args:
+            week (str): The week key.
+            teams (dict): The team ID -> players data for the week.
+        """
+        for team_id, players in teams.items():
+            if not players:
+                raise ValueError(f"No player data found for team ID {team_id} in week {week}.")
+            team_name = players[0]['team_name']
+            if team_id not in self.teams:
+                self.teams[team_id] = {
+                    'team_name': team_name,
+                    'players': [],
+                    'weekly_players': {},
+                    'lineups': {
+                        'chosen': [],
+                        'optimal_projected': [],
+                        'optimal_actual': []
+                    },
+                    'metrics': {}
+                }
+            # Aggregate players across all weeks, but keep each week's roster for lineup decisions
+            self.teams[team_id]['players'].extend(players)
+            self.teams[team_id]['weekly_players'][week] = players
+
+    def solve_optimal_lineups(self, rosters, use_projection=True):
+        """
+        Calculates optimal lineups for many rosters at once (see lineupSolver).
+
+        Args:
+            rosters (list): One list of players per roster (a team-week).
+            use_projection (bool): If True, use projected points; else, use actual points.
+
+        Returns:
+            list: One optimal lineup per roster.
+        """
+        key = 'projected_fantasy_points' if use_projection else 'fantasy_points'
+        return lineupSolver.solve_optimal_lineups(rosters, key, self.lineup_requirements,
+                                                  'W/R/T', self.flex_positions)
 
     def calculate_optimal_lineup(self, team_id, use_projection=True):
         """
         Calculates the optimal lineup for a team based on projections or actual points.
 
+        A lineup is chosen separately for each week, so a multi-week analysis never
+        combines players from different weeks; the weekly lineups are concatenated.
+
         Args:
             team_id (int): The ID of the team.
             use_projection (bool): If True, use projected points; else, use actual points.
         """
         team = self.teams[team_id]
-        players = team['players']
-
-        # Sort players based on projected or actual points
-        key = 'projected_fantasy_points' if use_projection else 'fantasy_points'
-        sorted_players = sorted(players, key=lambda x: x[key], reverse=True)
-
-        lineup = []
-        positions_filled = {pos: 0 for pos in self.lineup_requirements.keys()}
-        flex_filled = 0
-
-        for player in sorted_players:
-            player_pos = player['position']
-            lineup_pos = player['lineup_pos']
-
-            # Skip injured reserve players
-            if lineup_pos == 'IR':
-                continue
-
-            # Check if position is needed in lineup
-            if positions_filled.get(player_pos, 0) < self.lineup_requirements.get(player_pos, 0):
-                lineup.append(player)
-                positions_filled[player_pos] += 1
-            # Fill flex position if eligible
-            elif flex_filled < self.lineup_requirements['W/R/T'] and player_pos in self.flex_positions:
-                lineup.append(player)
-                flex_filled += 1
-            # Check if special positions (K, DEF) are needed
-            elif player_pos in ['K', 'DEF'] and positions_filled[player_pos] < self.lineup_requirements[player_pos]:
-                lineup.append(player)
-                positions_filled[player_pos] += 1
-
-            # Check if lineup is complete
-            if len(lineup) == sum(self.lineup_requirements.values()):
-                break
+        weekly_lineups = self.solve_optimal_lineups(list(team['weekly_players'].values()), use_projection)
 
         # Store the lineup
         lineup_type = 'optimal_projected' if use_projection else 'optimal_actual'
-        team['lineups'][lineup_type] = lineup
+        team['lineups'][lineup_type] = [player for lineup in weekly_lineups for player in lineup]
 
-    def calculate_actual_lineup(self, team_id):
+    def chosen_lineup(self, players):
         """
-        Extracts the actual lineup chosen by the manager for a team.
+        Returns the lineup the manager started from one week's roster.
 
         Args:
-            team_id (int): The ID of the team.
-        """
-        team = self.teams[team_id]
-        players = team['players']
+            players (list): The team's players for the week.
 
+        Returns:
+            list: The started players.
+        """
         lineup = [player for player in players if player['lineup_pos'] not in ['BN', 'IR']]
 
         # Ensure the lineup meets the requirements
         if len(lineup) != sum(self.lineup_requirements.values()):
             # Adjust lineup if necessary (could be due to incomplete data)
             lineup = lineup[:sum(self.lineup_requirements.values())]
+        return lineup
 
-        team['lineups']['chosen'] = lineup
-
-    def calculate_team_metrics(self, team_id):
+    def calculate_actual_lineup(self, team_id):
         """
-        Calculates basic metrics for a team to assess managerial performance.
+        Extracts the actual lineup chosen by the manager for a team.
 
         Args:
             team_id (int): The ID of the team.
         """
         team = self.teams[team_id]
-        metrics = {}
+        team['lineups']['chosen'] = [player for players in team['weekly_players'].values()
+                                     for player in self.chosen_lineup(players)]
 
-        # Total points for each lineup
-        chosen_lineup = team['lineups']['chosen']
-        chosen_points = sum(player['fantasy_points'] for player in chosen_lineup)
-        optimal_projected_lineup = team['lineups']['optimal_projected']
-        optimal_projected_points = sum(player['fantasy_points'] for player in optimal_projected_lineup)
-        optimal_actual_lineup = team['lineups']['optimal_actual']
-        optimal_actual_points = sum(player['fantasy_points'] for player in optimal_actual_lineup)
+    @staticmethod
+    def new_lineup_totals():
+        """
+        Returns empty running totals for a team's lineups.
 
-        # Calculate differences
-        metrics['chosen_vs_optimal_actual'] = optimal_actual_points - chosen_points
-        metrics['chosen_vs_optimal_projected'] = optimal_projected_points - chosen_points
-        metrics['optimal_projected_vs_optimal_actual'] = optimal_actual_points - optimal_projected_points
-        metrics['lineup_efficiency'] = (chosen_points / optimal_actual_points) * 100 if optimal_actual_points > 0 else 0
-        metrics['overperformance'] = chosen_points - sum(player['projected_fantasy_points'] for player in chosen_lineup)
+        Team metrics are derived from these totals, so adding a week only needs
+        to add that week's players to them.
+        """
+        return {
+            'chosen_points': 0,
+            'chosen_projected_points': 0,
+            'optimal_projected_points': 0,
+            'optimal_actual_points': 0,
+            'total_players': 0,
+            'beat_projection': 0,
+            'total_percent_diff': 0,
+            'total_overperf_percent_diff': 0,
+            'total_underperf_percent_diff': 0,
+            'overperf_count': 0,
+            'underperf_count': 0,
+            'boomed': 0,
+            'overperformed': 0,
+            'underperformed': 0,
+            'busted': 0,
+        }
 
-        # Calculate percentage of players that beat projections in the chosen lineup
-        beat_projection = [player for player in chosen_lineup if player['fantasy_points'] > player['projected_fantasy_points']]
-        metrics['percent_players_beat_projection'] = (len(beat_projection) / len(chosen_lineup)) * 100 if chosen_lineup else 0
-        metrics['percent_players_did_not_beat_projection'] = 100 - metrics['percent_players_beat_projection']
+    @staticmethod
+    def accumulate_lineup_totals(totals, chosen_lineup, optimal_projected_lineup, optimal_actual_lineup):
+        """
+        Adds lineups to a team's running totals.
 
-        # Enhanced calculations: Magnitude of overperformance/underperformance
-        total_percent_diff = 0
-        total_overperf_percent_diff = 0
-        total_underperf_percent_diff = 0
-        overperf_count = 0
-        underperf_count = 0
+        Points are added one player at a time, so totals built week by week are
+        bit-for-bit equal to totals built over the whole season at once.
+
+        Args:
+            totals (dict): The running totals (see new_lineup_totals).
+            chosen_lineup (list): The chosen lineup players to add.
+            optimal_projected_lineup (list): The optimal projected lineup players to add.
+            optimal_actual_lineup (list): The optimal actual lineup players to add.
+        """
+        for player in optimal_projected_lineup:
+            totals['optimal_projected_points'] += player['fantasy_points']
+        for player in optimal_actual_lineup:
+            totals['optimal_actual_points'] += player['fantasy_points']
 
         for player in chosen_lineup:
             proj = player['projected_fantasy_points']
             actual = player['fantasy_points']
+            totals['chosen_points'] += actual
+            totals['chosen_projected_points'] += proj
+            totals['total_players'] += 1
+            if actual > proj:
+                totals['beat_projection'] += 1
+
+            # Enhanced calculations: Magnitude of overperformance/underperformance
             if proj == 0:
                 continue  # Avoid division by zero
             percent_diff = ((actual - proj) / proj) * 100
-            total_percent_diff += percent_diff
+            totals['total_percent_diff'] += percent_diff
 
             if actual > proj:
-                total_overperf_percent_diff += percent_diff
-                overperf_count += 1
+                totals['total_overperf_percent_diff'] += percent_diff
+                totals['overperf_count'] += 1
             elif actual < proj:
-                total_underperf_percent_diff += percent_diff
-                underperf_count += 1
-
-        total_players = len(chosen_lineup)
-        metrics['average_percent_difference'] = total_percent_diff / total_players if total_players else 0
-        metrics['average_overperf_percent_diff'] = total_overperf_percent_diff / overperf_count if overperf_count else 0
-        metrics['average_underperf_percent_diff'] = total_underperf_percent_diff / underperf_count if underperf_count else 0
-
-        # Classify player performances
-        performance_categories = {'boomed': 0, 'overperformed': 0, 'underperformed': 0, 'busted': 0}
-
-        for player in chosen_lineup:
-            proj = player['projected_fantasy_points']
-            actual = player['fantasy_points']
-            if proj == 0:
-                continue  # Avoid division by zero
-            percent_diff = ((actual - proj) / proj) * 100
+                totals['total_underperf_percent_diff'] += percent_diff
+                totals['underperf_count'] += 1
 
+            # Classify player performances
             if percent_diff >= 20:
-                performance_categories['boomed'] += 1
+                totals['boomed'] += 1
             elif 0 <= percent_diff < 20:
-                performance_categories['overperformed'] += 1
+                totals['overperformed'] += 1
             elif -20 < percent_diff < 0:
-                performance_categories['underperformed'] += 1
+                totals['underperformed'] += 1
             elif percent_diff <= -20:
-                performance_categories['busted'] += 1
+                totals['busted'] += 1
+
+    @staticmethod
+    def metrics_from_totals(totals):
+        """
+        Derives a team's metrics from its running lineup totals.
+
+        Args:
+            totals (dict): The running totals (see new_lineup_totals).
+
+        Returns:
+            dict: The team metrics.
+        """
+        metrics = {}
+        chosen_points = totals['chosen_points']
+        optimal_projected_points = totals['optimal_projected_points']
+        optimal_actual_points = totals['optimal_actual_points']
+        total_players = totals['total_players']
 
-        for key in performance_categories:
-            metrics[f'percent_{key}'] = (performance_categories[key] / total_players) * 100 if total_players else 0
+        # Calculate differences
+        metrics['chosen_vs_optimal_actual'] = optimal_actual_points - chosen_points
+        metrics['chosen_vs_optimal_projected'] = optimal_projected_points - chosen_points
+        metrics['optimal_projected_vs_optimal_actual'] = optimal_actual_points - optimal_projected_points
+        metrics['lineup_efficiency'] = (chosen_points / optimal_actual_points) * 100 if optimal_actual_points > 0 else 0
+        metrics['overperformance'] = chosen_points - totals['chosen_projected_points']
+
+        # Calculate percentage of players that beat projections in the chosen lineup
+        metrics['percent_players_beat_projection'] = (totals['beat_projection'] / total_players) * 100 if total_players else 0
+        metrics['percent_players_did_not_beat_projection'] = 100 - metrics['percent_players_beat_projection']
+
+        overperf_count = totals['overperf_count']
+        underperf_count = totals['underperf_count']
+        metrics['average_percent_difference'] = totals['total_percent_diff'] / total_players if total_players else 0
+        metrics['average_overperf_percent_diff'] = totals['total_overperf_percent_diff'] / overperf_count if overperf_count else 0
+        metrics['average_underperf_percent_diff'] = totals['total_underperf_percent_diff'] / underperf_count if underperf_count else 0
+
+        for key in ['boomed', 'overperformed', 'underperformed', 'busted']:
+            metrics[f'percent_{key}'] = (totals[key] / total_players) * 100 if total_players else 0
+
+        return metrics
+
+    def calculate_team_metrics(self, team_id):
+        """
+        Calculates basic metrics for a team to assess managerial performance.
+
+        Args:
+            team_id (int): The ID of the team.
+        """
+        team = self.teams[team_id]
+        lineups = team['lineups']
+
+        totals = self.new_lineup_totals()
+        self.accumulate_lineup_totals(totals, lineups['chosen'], lineups['optimal_projected'], lineups['optimal_actual'])
 
         # Store metrics
-        team['metrics'] = metrics
+        team['totals'] = totals
+        team['metrics'] = self.metrics_from_totals(totals)
 
     def calculate_manager_lineup_score(self):
         """
@@ -248,19 +355,221 @@ class FantasyLeagueAnalyzer:
 
             metrics['manager_lineup_score'] = lineup_score
 
+    def calculate_all_metrics_batched(self):
+        """
+        Calculates team metrics and Manager Lineup Scores for all teams in one batched NumPy pass.
+
+        Produces exactly the same metrics as calculate_team_metrics() followed by
+        calculate_manager_lineup_score().
+        """
+        team_ids = list(self.teams)
+        lineups = [self.teams[team_id]['lineups'] for team_id in team_ids]
+        metrics = analysisEngine.compute_team_metrics(
+            analysisEngine.pack_lineups([lineup['chosen'] for lineup in lineups]),
+            analysisEngine.pack_lineups([lineup['optimal_projected'] for lineup in lineups]),
+            analysisEngine.pack_lineups([lineup['optimal_actual'] for lineup in lineups]),
+        )
+        scores = analysisEngine.compute_manager_lineup_scores(metrics)
+        for team_id, team_metrics in zip(team_ids, analysisEngine.to_metric_dicts(metrics, scores)):
+            self.teams[team_id]['metrics'] = team_metrics
+
     def analyze(self):
         """
         Runs the analysis for all teams.
         """
+        # Solve the optimal lineups of every team-week in one batch per lineup type
+        team_weeks = [(team_id, week) for team_id, team in self.teams.items() for week in team['weekly_players']]
+        rosters = [self.teams[team_id]['weekly_players'][week] for team_id, week in team_weeks]
+        for use_projection in (True, False):
+            lineup_type = 'optimal_projected' if use_projection else 'optimal_actual'
+            for team in self.teams.values():
+                team['lineups'][lineup_type] = []
+            for (team_id, _), lineup in zip(team_weeks, self.solve_optimal_lineups(rosters, use_projection)):
+                self.teams[team_id]['lineups'][lineup_type].extend(lineup)
+
         # First, calculate team metrics to get values needed for normalization
         for team_id in self.teams:
-            self.calculate_optimal_lineup(team_id, use_projection=True)
-            self.calculate_optimal_lineup(team_id, use_projection=False)
             self.calculate_actual_lineup(team_id)
-            self.calculate_team_metrics(team_id)
+            if self.engine == 'python':
+                self.calculate_team_metrics(team_id)
+
+        if self.engine == 'numpy':
+            self.calculate_all_metrics_batched()
+        else:
+            # Now that we have all metrics, calculate the Manager Lineup Score
+            self.calculate_manager_lineup_score()
+        self.analyzed = True
+
+    def add_week(self, week, teams):
+        """
+        Adds a new week to an analyzed league, computing lineups only for that week.
+
+        Each team's running lineup totals are extended with the week's lineups and its
+        metrics re-derived from them; the league-wide normalization maxima and Manager
+        Lineup Scores are then refreshed from the per-team metrics. The result matches
+        running analyze() over all weeks from scratch.
+
+        The week's rosters are kept, in self.data and each team's weekly players, for
+        update_teams() and save_state(); memory grows with the number of weeks added.
+
+        Args:
+            week (str): The week key; must not already be in the data.
+            teams (dict): The team ID -> players data for the week.
+        """
+        if week in self.data:
+            raise ValueError(f"Week {week} has already been analyzed.")
+        if self.data and not self.analyzed:
+            self.analyze()
+
+        self.data[week] = teams
+        self.process_week(week, teams)
+
+        team_ids = list(teams)
+        rosters = [teams[team_id] for team_id in team_ids]
+        optimal_projected = self.solve_optimal_lineups(rosters, use_projection=True)
+        optimal_actual = self.solve_optimal_lineups(rosters, use_projection=False)
+
+        for team_id, players, projected_lineup, actual_lineup in zip(team_ids, rosters, optimal_projected, optimal_actual):
+            team = self.teams[team_id]
+            lineups = team['lineups']
+            if 'totals' not in team:
+                # Metrics from the batched engine do not keep running totals; rebuild them once
+                team['totals'] = self.new_lineup_totals()
+                self.accumulate_lineup_totals(team['totals'], lineups['chosen'],
+                                              lineups['optimal_projected'], lineups['optimal_actual'])
+
+            chosen = self.chosen_lineup(players)
+            lineups['chosen'].extend(chosen)
+            lineups['optimal_projected'].extend(projected_lineup)
+            lineups['optimal_actual'].extend(actual_lineup)
+            self.accumulate_lineup_totals(team['totals'], chosen, projected_lineup, actual_lineup)
+            team['metrics'] = self.metrics_from_totals(team['totals'])
+
+        self.calculate_manager_lineup_score()
+        self.analyzed = True
+
+    def update_teams(self, week, teams):
+        """
+        Replaces some teams' rosters in an analyzed week, e.g. as live scores come in.
+
+        Lineups are solved again only for the given team-weeks; each team's other
+        weeks keep their lineups, its running totals are rebuilt from its lineups in
+        week order, and the Manager Lineup Scores are refreshed for every team. The
+        result matches running analyze() over the updated data from scratch.
+
+        Args:
+            week (str): The week key; must already be in the data.
+            teams (dict): Team ID -> the team's new players for the week, for the changed teams only.
+        """
+        if week not in self.data:
+            raise ValueError(f"Week {week} has not been analyzed yet.")
+        unknown = [team_id for team_id in teams if team_id not in self.data[week]]
+        if unknown:
+            raise ValueError(f"Teams {', '.join(map(str, unknown))} are not in week {week}.")
+        for team_id, players in teams.items():
+            if not players:
+                raise ValueError(f"No player data found for team ID {team_id} in week {week}.")
+        if not self.analyzed:
+            self.analyze()
+
+        self.data[week] = {**self.data[week], **teams}
+        team_ids = list(teams)
+        rosters = [teams[team_id] for team_id in team_ids]
+        optimal_projected = self.solve_optimal_lineups(rosters, use_projection=True)
+        optimal_actual = self.solve_optimal_lineups(rosters, use_projection=False)
+
+        for team_id, players, projected_lineup, actual_lineup in zip(team_ids, rosters, optimal_projected, optimal_actual):
+            team = self.teams[team_id]
+            weekly_players = team['weekly_players']
+            week_of = {id(player): player_week for player_week, week_players in weekly_players.items()
+                       for player in week_players}
+            new_lineups = {'chosen': self.chosen_lineup(players),
+                           'optimal_projected': projected_lineup,
+                           'optimal_actual': actual_lineup}
+            for lineup_type, lineup in team['lineups'].items():
+                by_week = {player_week: [] for player_week in weekly_players}
+                for player in lineup:
+                    by_week[week_of[id(player)]].append(player)
+                by_week[week] = new_lineups[lineup_type]
+                team['lineups'][lineup_type] = [player for week_lineup in by_week.values() for player in week_lineup]
+
+            weekly_players[week] = players
+            team['players'] = [player for week_players in weekly_players.values() for player in week_players]
+            team['totals'] = self.new_lineup_totals()
+            self.accumulate_lineup_totals(team['totals'], team['lineups']['chosen'],
+                                          team['lineups']['optimal_projected'], team['lineups']['optimal_actual'])
+            team['metrics'] = self.metrics_from_totals(team['totals'])
 
-        # Now that we have all metrics, calculate the Manager Lineup Score
         self.calculate_manager_lineup_score()
+        self.analyzed = True
+
+    def save_state(self, path):
+        """
+        Persists the analysis so a new process can keep adding weeks without recomputing.
+
+        Lineups are saved as [week, row] references into the saved data.
+
+        Args:
+            path (str): The JSON file to write.
+        """
+        if not self.analyzed:
+            self.analyze()
+
+        teams = {}
+        for team_id, team in self.teams.items():
+            refs = {id(player): [week, row] for week, players in team['weekly_players'].items()
+                    for row, player in enumerate(players)}
+            if 'totals' not in team:
+                team['totals'] = self.new_lineup_totals()
+                self.accumulate_lineup_totals(team['totals'], team['lineups']['chosen'],
+                                              team['lineups']['optimal_projected'], team['lineups']['optimal_actual'])
+            teams[team_id] = {
+                'totals': team['totals'],
+                'metrics': team['metrics'],
+                'lineups': {lineup_type: [refs[id(player)] for player in lineup]
+                            for lineup_type, lineup in team['lineups'].items()},
+            }
+
+        state = {
+            'version': 1,
+            'engine': self.engine,
+            'lineup_requirements': self.lineup_requirements,
+            'flex_positions': self.flex_positions,
+            'data': self.data,
+            'teams': teams,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as json_file:
+            json.dump(state, json_file, separators=(',', ':'), default=dict)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_state(cls, path):
+        """
+        Restores an analyzer saved with save_state() without recomputing any week.
+
+        Args:
+            path (str): The JSON file to read.
+
+        Returns:
+            FantasyLeagueAnalyzer: The analyzer, ready for add_week().
+        """
+        with open(path, 'r') as json_file:
+            state = json.load(json_file)
+        if state.get('version') != 1:
+            raise ValueError(f"Unsupported analyzer state version {state.get('version')} in {path}.")
+
+        analyzer = cls(state['data'], state['engine'])
+        analyzer.lineup_requirements = state['lineup_requirements']
+        analyzer.flex_positions = state['flex_positions']
+        for team_id, saved in state['teams'].items():
+            team = analyzer.teams[team_id]
+            team['totals'] = saved['totals']
+            team['metrics'] = saved['metrics']
+            team['lineups'] = {lineup_type: [team['weekly_players'][week][row] for week, row in refs]
+                               for lineup_type, refs in saved['lineups'].items()}
+        analyzer.analyzed = True
+        return analyzer
 
     def rank_teams(self):
         """
@@ -381,18 +690,15 @@ class FantasyLeagueAnalyzer:
         """
         Runs the full analysis and prints the rankings.
         """
-        self.analyze()
+        if not self.analyzed:
+            self.analyze()
         rankings = self.rank_teams()
         self.print_rankings(rankings)
 
 # Example usage
 if __name__ == "__main__":
-    # Load the data from the JSON file
-    with open('league_data_week_1.json', 'r') as json_file:
-        data = json.load(json_file)
-
-    # Create an instance of the analyzer
-    analyzer = FantasyLeagueAnalyzer(data)
+    # Read the league's week segments (or the combined JSON file without any), analyzing one week at a time
+    analyzer = FantasyLeagueAnalyzer.from_stream(iter_league_weeks())
 
     # Run the full analysis and print rankings
     analyzer.run_full_analysis()
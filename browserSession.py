@@ -0,0 +1,185 @@
+import atexit
+import os
+import pickle
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from httpFetch import HttpDriver, start_driver
+from scrapeMetrics import default_metrics
+
+YAHOO_BASE_URL = "https://football.fantasysports.yahoo.com"
+COOKIE_FILE = "archive/yahoo_cookies.pkl"
+
+MAX_IDLE_SESSIONS = 4
+IDLE_TIMEOUT = 15 * 60
+SETTLE_SECONDS = 2
+
+
+class SessionManager:
+    """
+    Starts, logs in and keeps warm the browser sessions every scraper uses.
+
+    The ChromeDriver binary is installed once per manager, and the saved cookies
+    are checked once per (backend, site, cookie file). A session released by a
+    scraper stays open and logged in, and the next scraper that asks for the
+    same kind of session gets it back, so a full refresh pays browser startup
+    once instead of once per week per script.
+    """
+
+    def __init__(self, headless=True, max_idle=MAX_IDLE_SESSIONS, idle_timeout=IDLE_TIMEOUT):
+        """
+        Args:
+            headless (bool): Run Chrome without a window.
+            max_idle (int): Released sessions kept open per kind; extra ones are closed.
+            idle_timeout (float): Seconds an idle session is kept before it is closed.
+        """
+        self.headless = headless
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        self.driver_path = None
+        self.idle = {}          # session kind -> [(driver, released_at)]
+        self.kinds = {}         # id(driver) -> session kind, for every session handed out
+        self.validated = set()  # session kinds whose login has been checked
+
+    def start_browser(self):
+        """Launches Chrome, installing the matching ChromeDriver on first use."""
+        with self.lock:
+            if self.driver_path is None:
+                self.driver_path = ChromeDriverManager().install()
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--log-level=3")  # Suppress logging
+        chrome_options.add_argument("--disable-logging")
+        return webdriver.Chrome(service=Service(self.driver_path), options=chrome_options)
+
+    def acquire(self, backend='selenium', base_url=YAHOO_BASE_URL, cookie_file=COOKIE_FILE):
+        """
+        Hands out a logged-in session, reusing a warm one when there is one.
+
+        Args:
+            backend (str): 'selenium' or 'http' (see httpFetch).
+            base_url (str): The site the session is logged in to.
+            cookie_file (str): Pickled Yahoo cookies; None or a missing file skips authentication.
+
+        Returns:
+            The driver; give it back with release().
+        """
+        kind = (backend, base_url.rstrip('/'), cookie_file)
+        self._close_expired()
+        while True:
+            with self.lock:
+                idle = self.idle.get(kind)
+                if not idle:
+                    break
+                driver, _ = idle.pop()
+            # A warm session whose browser has crashed is dropped rather than handed out
+            if self.alive(driver):
+                with self.lock:
+                    self.kinds[id(driver)] = kind
+                return driver
+            self._quit(driver)
+
+        driver = start_driver(backend, self.start_browser)
+        driver.get(f"{kind[1]}/")
+        if cookie_file and os.path.exists(cookie_file):
+            self.load_cookies(driver, cookie_file)
+            if backend == 'selenium':
+                with default_metrics().phase('sleep'):
+                    time.sleep(SETTLE_SECONDS)  # Wait for the session to be established
+            with self.lock:
+                validate = kind not in self.validated
+                self.validated.add(kind)
+            if validate and not self.logged_in(driver):
+                driver.quit()
+                with self.lock:
+                    self.validated.discard(kind)
+                raise RuntimeError(f"Yahoo login failed: the saved cookies in {cookie_file} are no longer valid.")
+        with self.lock:
+            self.kinds[id(driver)] = kind
+        return driver
+
+    def release(self, driver):
+        """Returns a session so the next scraper can reuse it, closing it if enough are already idle."""
+        with self.lock:
+            # A driver this manager did not hand out is closed, never pooled
+            kind = self.kinds.pop(id(driver), None)
+            if kind is not None:
+                idle = self.idle.setdefault(kind, [])
+                if len(idle) < self.max_idle:
+                    idle.append((driver, time.monotonic()))
+                    return
+        driver.quit()
+
+    def load_cookies(self, driver, cookie_file):
+        """Loads the pickled Yahoo cookies into a session and reloads the page with them."""
+        with open(cookie_file, "rb") as file:
+            cookies = pickle.load(file)
+            for cookie in cookies:
+                cookie['domain'] = ".yahoo.com"  # Ensure cookies are set for the correct domain
+                try:
+                    driver.add_cookie(cookie)
+                except Exception as e:
+                    print(f"Failed to add cookie {cookie}: {e}")
+        driver.refresh()
+
+    def alive(self, driver):
+        """Checks that a session still answers, e.g. that its Chrome has not crashed (see HttpDriver.alive())."""
+        if isinstance(driver, HttpDriver):
+            return driver.alive()
+        try:
+            driver.current_url
+        except Exception:
+            return False
+        return True
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Failed to close a dead session: {e}")
+
+    def logged_in(self, driver):
+        """Yahoo sends signed-out visitors to its login page."""
+        return 'login.yahoo.com' not in (driver.current_url or '')
+
+    def _close_expired(self):
+        now = time.monotonic()
+        expired = []
+        with self.lock:
+            for kind, idle in self.idle.items():
+                expired.extend(driver for driver, released_at in idle if now - released_at > self.idle_timeout)
+                idle[:] = [(driver, released_at) for driver, released_at in idle if now - released_at <= self.idle_timeout]
+        for driver in expired:
+            driver.quit()
+
+    def shutdown(self):
+        """Closes every idle session."""
+        with self.lock:
+            drivers = [driver for idle in self.idle.values() for driver, _ in idle]
+            self.idle.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Failed to close browser session: {e}")
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+
+def default_session_manager():
+    """Returns the process-wide session manager the scrapers share; its sessions close at exit."""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = SessionManager()
+            atexit.register(_default_manager.shutdown)
+        return _default_manager
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+
+from bestManager import FantasyLeagueAnalyzer
+from segmentStore import load_league
+
+ARTIFACT_DIR = 'artifacts'
+
+# Bump whenever the analyzer output changes so old artifacts are treated as stale
+ARTIFACT_VERSION = 2
+
+
+def data_digest(data):
+    """
+    Returns a stable SHA-1 digest of JSON-compatible data.
+
+    Read-only mappings from the snapshot cache are accepted as well as plain dicts.
+
+    Args:
+        data: The data to digest.
+
+    Returns:
+        str: The hex digest.
+    """
+    encoded = json.dumps(data, sort_keys=True, separators=(',', ':'), default=dict)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def artifact_name(weeks, all_weeks):
+    """
+    Returns the artifact file name for a set of weeks.
+
+    Args:
+        weeks (tuple): The week keys being analyzed.
+        all_weeks (tuple): Every week key in the data file.
+
+    Returns:
+        str: 'week_<n>.json', 'season.json', or None if no artifact covers the weeks.
+    """
+    if len(weeks) == 1:
+        return f"week_{weeks[0]}.json"
+    if sorted(weeks, key=int) == sorted(all_weeks, key=int):
+        return 'season.json'
+    return None
+
+
+def build_artifact(league_data, weeks):
+    """
+    Runs the analyzer for a set of weeks and returns a compact artifact.
+
+    Lineups are stored as [week, row] references into the source data instead
+    of repeating full player records.
+
+    Args:
+        league_data (dict): The league data keyed by week.
+        weeks (list): The week keys to analyze.
+
+    Returns:
+        dict: The artifact.
+    """
+    week_data = {week: league_data[week] for week in weeks}
+    analyzer = FantasyLeagueAnalyzer(week_data)
+    analyzer.analyze()
+
+    # Map every player record back to its position in the source data
+    refs = {}
+    for week, teams in week_data.items():
+        for players in teams.values():
+            for row, player in enumerate(players):
+                refs[id(player)] = [week, row]
+
+    teams = {}
+    for team_id, team in analyzer.teams.items():
+        teams[team_id] = {
+            'team_name': team['team_name'],
+            'metrics': team['metrics'],
+            'lineups': {
+                lineup_type: [refs[id(player)] for player in lineup]
+                for lineup_type, lineup in team['lineups'].items()
+            },
+        }
+
+    return {
+        'version': ARTIFACT_VERSION,
+        'weeks': list(weeks),
+        'source_digest': data_digest(week_data),
+        'rankings': analyzer.rank_teams(),
+        'teams': teams,
+    }
+
+
+def is_fresh(artifact, source_digest):
+    """
+    Checks whether an artifact was built from the given data with the current analyzer.
+
+    Args:
+        artifact (Mapping): The loaded artifact.
+        source_digest (str): The data_digest() of the league data for the artifact's weeks.
+
+    Returns:
+        bool: True if the artifact can be served as-is.
+    """
+    return artifact.get('version') == ARTIFACT_VERSION and artifact.get('source_digest') == source_digest
+
+
+def save_artifact(artifact, output_file):
+    """Save an artifact as compact JSON, replacing any previous version atomically."""
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'w') as file:
+        json.dump(artifact, file, separators=(',', ':'))
+    os.replace(tmp_file, output_file)
+
+
+def build_all(league_data, output_dir=ARTIFACT_DIR):
+    """
+    Builds the per-week artifacts and the season artifact for a league.
+
+    Args:
+        league_data (dict): The league data keyed by week, as the app reads it (see segmentStore.load_league()).
+        output_dir (str): Directory to write the artifacts to.
+
+    Returns:
+        list: The paths of the written artifacts.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    all_weeks = sorted(league_data, key=int)
+    written = []
+
+    for week in all_weeks:
+        path = os.path.join(output_dir, artifact_name((week,), all_weeks))
+        save_artifact(build_artifact(league_data, [week]), path)
+        written.append(path)
+
+    if len(all_weeks) > 1:
+        path = os.path.join(output_dir, artifact_name(tuple(all_weeks), all_weeks))
+        save_artifact(build_artifact(league_data, all_weeks), path)
+        written.append(path)
+
+    return written
+
+
+def main():
+    written = build_all(load_league(), ARTIFACT_DIR)
+    for path in written:
+        print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
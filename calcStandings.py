@@ -1,5 +1,9 @@
 import json
 
+import numpy as np
+
+from segmentStore import DEFAULT_LEAGUE_ID, LEAGUE_DATA_FILE, SEGMENT_ROOT, iter_league_weeks
+
 def load_data(file_path):
     """Load JSON data from a file."""
     with open(file_path, 'r') as file:
@@ -19,6 +23,53 @@ def calculate_team_totals(fantasy_data):
 
     return team_totals, team_names
 
+def calculate_weekly_team_totals(fantasy_data):
+    """Calculate each team's total fantasy points for every week, excluding bench players."""
+    weekly_totals = {}
+    team_names = {}
+
+    for week, teams in fantasy_data.items():
+        weekly_totals[week] = {}
+        for team_id, players in teams.items():
+            weekly_totals[week][team_id] = sum(player["fantasy_points"] for player in players if player["lineup_pos"] != "BN")
+            team_names[team_id] = players[0]["team_name"]
+
+    return weekly_totals, team_names
+
+def calculate_team_totals_from_store(store):
+    """
+    Calculate team totals from a columnar player-week store.
+
+    Only the week, team_id, lineup_pos, fantasy_points and team_name columns are read.
+    Returns the same values as calculate_team_totals() on the equivalent JSON data.
+    """
+    team_totals = {}
+    team_names = {}
+    if not store.rows:
+        return team_totals, team_names
+
+    team_ids = store.dictionary('team_id')
+    weeks = store.column('week')
+    teams = store.column('team_id')
+    group = weeks.astype(np.int64) * len(team_ids) + teams
+    lineup_pos_dict = store.dictionary('lineup_pos')
+    bench_code = lineup_pos_dict.index('BN') if 'BN' in lineup_pos_dict else None
+    counted = store.column('lineup_pos') != bench_code if bench_code is not None else np.ones(store.rows, dtype=bool)
+    totals = np.bincount(group, weights=np.where(counted, store.column('fantasy_points'), 0.0),
+                         minlength=len(store.dictionary('week')) * len(team_ids))
+
+    # The first row of each team in each week carries its team_name
+    _, first_rows = np.unique(group, return_index=True)
+    first_rows.sort()
+    team_name_dict = store.dictionary('team_name')
+    team_name_codes = store.column('team_name')
+    for row in first_rows.tolist():
+        team_id = team_ids[int(teams[row])]
+        team_totals[team_id] = float(totals[group[row]])
+        team_names[team_id] = team_name_dict[int(team_name_codes[row])]
+
+    return team_totals, team_names
+
 def calculate_win_loss_records(schedule_data, team_totals, team_names):
     """Calculate win-loss records and update team stats."""
     team_records = {team_names[team_id]: {"wins": 0, "losses": 0, "ties": 0, "PF": 0, "PA": 0, "streak": "", "expected_wins": 0, "expected_losses": 0} for team_id in team_names}
@@ -61,53 +112,274 @@ def calculate_win_loss_records(schedule_data, team_totals, team_names):
 
     return team_records
 
+def calculate_all_play_records(scores):
+    """
+    Calculate all-play wins, losses and ties by ranking each week's scores.
+
+    Every team is compared against every other team of the same week: wins are
+    the teams it outscored, losses the teams that outscored it and ties the other
+    teams with the same score. Instead of comparing all pairs, each row is sorted
+    once and a team's record is read off the first and last position of its score
+    in the sorted row, so ties are handled exactly.
+
+    Args:
+        scores (np.ndarray): Scores with teams on the last axis, e.g. (weeks x teams)
+            or (leagues x weeks x teams). NaN marks a team without a score that week.
+
+    Returns:
+        tuple: (wins, losses, ties) integer arrays with the same shape as scores; 0 where scores is NaN.
+    """
+    scores = np.asarray(scores, dtype=float)
+    teams = scores.shape[-1]
+    flat = scores.reshape(-1, teams)
+    valid_count = (~np.isnan(flat)).sum(axis=1, keepdims=True)
+
+    # NaN sorts last, so the valid scores of each row come first
+    order = np.argsort(flat, axis=1, kind='stable')
+    ordered = np.take_along_axis(flat, order, axis=1)
+    positions = np.broadcast_to(np.arange(teams), flat.shape)
+
+    new_run = np.ones(flat.shape, dtype=bool)
+    new_run[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    run_first = np.maximum.accumulate(np.where(new_run, positions, 0), axis=1)
+
+    run_ends = np.ones(flat.shape, dtype=bool)
+    run_ends[:, :-1] = new_run[:, 1:]
+    run_last = np.flip(np.minimum.accumulate(np.flip(np.where(run_ends, positions, teams - 1), axis=1), axis=1), axis=1)
+
+    wins = np.zeros(flat.shape, dtype=int)
+    losses = np.zeros(flat.shape, dtype=int)
+    ties = np.zeros(flat.shape, dtype=int)
+    is_valid = ~np.isnan(ordered)
+    np.put_along_axis(wins, order, np.where(is_valid, run_first, 0), axis=1)
+    np.put_along_axis(losses, order, np.where(is_valid, valid_count - 1 - run_last, 0), axis=1)
+    np.put_along_axis(ties, order, np.where(is_valid, run_last - run_first, 0), axis=1)
+    return wins.reshape(scores.shape), losses.reshape(scores.shape), ties.reshape(scores.shape)
+
+def pad_score_matrices(score_matrices):
+    """
+    Stack (weeks x teams) score matrices of several leagues into one NaN-padded array.
+
+    The result can be passed to calculate_all_play_records() to process many leagues in one batch.
+    """
+    weeks = max((matrix.shape[0] for matrix in score_matrices), default=0)
+    teams = max((matrix.shape[1] for matrix in score_matrices), default=0)
+    padded = np.full((len(score_matrices), weeks, teams), np.nan)
+    for league, matrix in enumerate(score_matrices):
+        padded[league, :matrix.shape[0], :matrix.shape[1]] = matrix
+    return padded
+
+def calculate_expected_records_by_week(weekly_totals, team_ids):
+    """
+    Calculate every week's all-play expected record in one vectorized pass.
+
+    Args:
+        weekly_totals (dict): Week -> team ID -> points.
+        team_ids (list): The team IDs, defining the column order.
+
+    Returns:
+        tuple: (weeks, expected_wins, expected_losses) where the arrays are (weeks x teams)
+        fractions of the other teams beaten / lost to each week; NaN where a team did not play.
+        Cumulative records are their cumulative sums over the week axis.
+    """
+    weeks = sorted(weekly_totals, key=int)
+    scores = np.array([[weekly_totals[week].get(team_id, np.nan) for team_id in team_ids] for week in weeks],
+                      dtype=float).reshape(len(weeks), len(team_ids))
+    wins, losses, _ = calculate_all_play_records(scores)
+    opponents = (~np.isnan(scores)).sum(axis=1, keepdims=True) - 1
+    played = ~np.isnan(scores) & (opponents > 0)
+    safe_opponents = np.where(opponents > 0, opponents, 1)
+    expected_wins = np.where(played, wins / safe_opponents, np.nan)
+    expected_losses = np.where(played, losses / safe_opponents, np.nan)
+    return weeks, expected_wins, expected_losses
+
 def calculate_expected_record(team_totals, team_names, team_records):
     """Calculate expected wins and losses for each team."""
+    team_ids = list(team_totals)
+    wins, losses, _ = calculate_all_play_records(np.array([team_totals[team_id] for team_id in team_ids], dtype=float))
+    column = {team_id: index for index, team_id in enumerate(team_ids)}
+
+    total_teams = len(team_totals) - 1  # Exclude the current team itself
+    if total_teams <= 0:
+        return
+
     for team_id, team_name in team_names.items():
-        wins_against_others = 0
-        losses_against_others = 0
-        team_score = team_totals[team_id]
-
-        for other_team_id, other_team_score in team_totals.items():
-            if team_id == other_team_id:
-                continue  # Skip comparison with itself
-            if team_score > other_team_score:
-                wins_against_others += 1
-            elif team_score < other_team_score:
-                losses_against_others += 1
-
-        total_teams = len(team_totals) - 1  # Exclude the current team itself
-
-        if total_teams > 0:
-            win_percentage = wins_against_others / total_teams
-            loss_percentage = losses_against_others / total_teams
-            team_records[team_name]["expected_wins"] = win_percentage
-            team_records[team_name]["expected_losses"] = loss_percentage
+        team_records[team_name]["expected_wins"] = int(wins[column[team_id]]) / total_teams
+        team_records[team_name]["expected_losses"] = int(losses[column[team_id]]) / total_teams
 
 def save_standings_to_json(standings, output_file):
     """Save the standings data to a JSON file."""
     with open(output_file, 'w') as file:
         json.dump(standings, file, indent=4)
 
-def main():
-    # Load data
-    fantasy_data = load_data('league_data_by_week.json')
-    schedule_data = load_data('league_schedule_weeks_1_to_14.json')
+def new_team_record():
+    """Return an empty standings record for a team."""
+    return {"wins": 0, "losses": 0, "ties": 0, "PF": 0, "PA": 0, "streak": "", "expected_wins": 0, "expected_losses": 0}
+
+def sort_standings(team_records):
+    """Sort standings by the number of wins, then by points for (PF)."""
+    return sorted(team_records.items(), key=lambda x: (x[1]["wins"], x[1]["PF"]), reverse=True)
+
+class SeasonStandings:
+    """
+    Season standings built up one week at a time.
+
+    Each call to add_week() updates records, points and streaks with a constant
+    amount of work per matchup, adds that week's all-play expected record, and
+    keeps a standings snapshot for the week.
+    """
+
+    def __init__(self, team_names):
+        """
+        Args:
+            team_names (dict): Team ID -> team name for every team in the league.
+        """
+        self.team_names = dict(team_names)
+        self.team_records = {team_name: new_team_record() for team_name in self.team_names.values()}
+        self.streaks = {team_name: (None, 0) for team_name in self.team_names.values()}
+        self.weeks = []
+        self.weekly_standings = {}
+        self.weekly_expected = {}
+
+    def _record_result(self, team_name, result):
+        """Update a team's streak with a 'W', 'L' or 'T' result."""
+        streak_type, streak_length = self.streaks[team_name]
+        streak_length = streak_length + 1 if streak_type == result else 1
+        self.streaks[team_name] = (result, streak_length)
+        self.team_records[team_name]["streak"] = f"{result}-{streak_length}"
+
+    def add_week(self, week, week_totals, matchups, team_names=None, expected=None):
+        """
+        Add one completed week to the standings.
+
+        Args:
+            week (str): The week key.
+            week_totals (dict): Team ID -> points scored this week.
+            matchups (list): The week's {'team1_id', 'team2_id'} matchups.
+            team_names (dict): Optional updated team ID -> team name mapping.
+            expected (dict): Optional precomputed team ID -> (expected wins, expected losses)
+                for the week, e.g. from calculate_expected_records_by_week().
+
+        Returns:
+            list: The standings after this week, sorted as in standings.json.
+        """
+        if week in self.weekly_standings:
+            raise ValueError(f"Week {week} has already been added to the standings.")
+        for team_id, team_name in (team_names or {}).items():
+            if team_id not in self.team_names:
+                self.team_names[team_id] = team_name
+                self.team_records[team_name] = new_team_record()
+                self.streaks[team_name] = (None, 0)
+
+        for matchup in matchups:
+            team1_id = matchup["team1_id"]
+            team2_id = matchup["team2_id"]
+
+            team1_score = week_totals.get(team1_id, 0)
+            team2_score = week_totals.get(team2_id, 0)
+
+            team1_name = self.team_names[team1_id]
+            team2_name = self.team_names[team2_id]
+
+            # Update Points For (PF) and Points Against (PA)
+            self.team_records[team1_name]["PF"] += team1_score
+            self.team_records[team1_name]["PA"] += team2_score
+            self.team_records[team2_name]["PF"] += team2_score
+            self.team_records[team2_name]["PA"] += team1_score
+
+            # Update wins, losses, and streaks
+            if team1_score > team2_score:
+                self.team_records[team1_name]["wins"] += 1
+                self.team_records[team2_name]["losses"] += 1
+                self._record_result(team1_name, "W")
+                self._record_result(team2_name, "L")
+            elif team2_score > team1_score:
+                self.team_records[team2_name]["wins"] += 1
+                self.team_records[team1_name]["losses"] += 1
+                self._record_result(team2_name, "W")
+                self._record_result(team1_name, "L")
+            else:
+                self.team_records[team1_name]["ties"] += 1
+                self.team_records[team2_name]["ties"] += 1
+                self._record_result(team1_name, "T")
+                self._record_result(team2_name, "T")
+
+        # Add this week's all-play record to the cumulative expected record
+        if expected is None:
+            week_records = {team_name: {"expected_wins": 0, "expected_losses": 0} for team_name in self.team_records}
+            week_team_names = {team_id: self.team_names[team_id] for team_id in week_totals}
+            calculate_expected_record(week_totals, week_team_names, week_records)
+            expected = {team_id: (week_records[team_name]["expected_wins"], week_records[team_name]["expected_losses"])
+                        for team_id, team_name in week_team_names.items()}
+        self.weekly_expected[week] = {}
+        for team_id, (expected_wins, expected_losses) in expected.items():
+            team_name = self.team_names[team_id]
+            self.weekly_expected[week][team_name] = {"expected_wins": expected_wins, "expected_losses": expected_losses}
+            self.team_records[team_name]["expected_wins"] += expected_wins
+            self.team_records[team_name]["expected_losses"] += expected_losses
+
+        self.weeks.append(week)
+        standings = sort_standings(self.team_records)
+        self.weekly_standings[week] = [(team_name, dict(record)) for team_name, record in standings]
+        return self.weekly_standings[week]
+
+    def standings(self):
+        """Return the current standings, sorted as in standings.json."""
+        return sort_standings(self.team_records)
+
+def compute_season_standings(fantasy_data, schedule_data):
+    """
+    Compute season standings from every week of scores and the full schedule.
+
+    Args:
+        fantasy_data (dict): The league data keyed by week.
+        schedule_data (dict): The schedule keyed by week.
+
+    Returns:
+        SeasonStandings: The standings engine after all scored weeks, with per-week snapshots.
+    """
+    weekly_totals, team_names = calculate_weekly_team_totals(fantasy_data)
+    team_ids = list(team_names)
+    weeks, expected_wins, expected_losses = calculate_expected_records_by_week(weekly_totals, team_ids)
+
+    season = SeasonStandings(team_names)
+    for row, week in enumerate(weeks):
+        expected = {team_id: (expected_wins[row, column].item(), expected_losses[row, column].item())
+                    for column, team_id in enumerate(team_ids) if not np.isnan(expected_wins[row, column])}
+        season.add_week(week, weekly_totals[week], schedule_data.get(week, []), expected=expected)
+    return season
+
+def compute_season_standings_from_stream(weeks, schedule_data):
+    """
+    Compute season standings from a stream of weeks without loading the whole league file.
 
-    # Calculate team totals and names
-    team_totals, team_names = calculate_team_totals(fantasy_data)
+    Args:
+        weeks (iterable): (week, {team_id: players}) pairs in week order, e.g. from segmentStore.iter_league_weeks().
+        schedule_data (dict): The schedule keyed by week.
 
-    # Calculate win-loss records
-    team_records = calculate_win_loss_records(schedule_data, team_totals, team_names)
+    Returns:
+        SeasonStandings: The standings engine after all streamed weeks, with per-week snapshots.
+    """
+    season = SeasonStandings({})
+    for week, teams in weeks:
+        week_totals, team_names = calculate_weekly_team_totals({week: teams})
+        season.add_week(week, week_totals[week], schedule_data.get(week, []), team_names=team_names)
+    return season
 
-    # Calculate expected wins and losses
-    calculate_expected_record(team_totals, team_names, team_records)
+def compute_standings(fantasy_data, schedule_data):
+    """Compute the season standings sorted by the number of wins, then by points for (PF)."""
+    return compute_season_standings(fantasy_data, schedule_data).standings()
 
-    # Prepare the standings sorted by the number of wins, then by points for (PF)
-    sorted_standings = sorted(team_records.items(), key=lambda x: (x[1]["wins"], x[1]["PF"]), reverse=True)
+def main(data_file=LEAGUE_DATA_FILE, schedule_file='league_schedule_weeks_1_to_14.json',
+         output_file='standings.json', weekly_output_file='standings_by_week.json', league_id=DEFAULT_LEAGUE_ID,
+         root=SEGMENT_ROOT):
+    # Load the schedule and read the league one week at a time, from its segments (or data_file without any)
+    schedule_data = load_data(schedule_file)
+    season = compute_season_standings_from_stream(iter_league_weeks(league_id, root, data_file), schedule_data)
 
-    # Save the standings to a JSON file
-    save_standings_to_json(sorted_standings, 'standings.json')
+    # Save the standings to a JSON file, plus a snapshot after every week
+    save_standings_to_json(season.standings(), output_file)
+    save_standings_to_json(season.weekly_standings, weekly_output_file)
 
 if __name__ == "__main__":
     main()
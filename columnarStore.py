@@ -0,0 +1,238 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+STORE_VERSION = 1
+
+# Player fields in the order parse_player_data() creates them
+FIELD_ORDER = [
+    'lineup_pos', 'name', 'player_id', 'team', 'position', 'status', 'bye_week',
+    'fantasy_points', 'projected_fantasy_points', 'points_diff', 'team_name',
+]
+
+# Stored as float64 so values round-trip exactly
+NUMERIC_COLUMNS = ['fantasy_points', 'projected_fantasy_points', 'points_diff']
+
+# Stored as int32 codes into a per-column dictionary; -1 means the field is missing
+CODED_COLUMNS = ['lineup_pos', 'name', 'player_id', 'team', 'position', 'status', 'bye_week', 'team_name']
+
+MISSING = -1
+
+
+class _Encoder:
+    """Assigns dictionary codes to values in order of first appearance."""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+def write_store(league_data, output_dir):
+    """
+    Writes league data (week -> team -> players) as a columnar store.
+
+    Each column is saved as its own .npy file so readers can memory-map just the
+    columns they need. String fields are dictionary-encoded.
+
+    Args:
+        league_data (dict): The league data keyed by week.
+        output_dir (str): The directory to write the store to.
+    """
+    encoders = {name: _Encoder() for name in CODED_COLUMNS + ['week', 'team_id']}
+    columns = {name: [] for name in CODED_COLUMNS + ['week', 'team_id']}
+    numeric = {name: [] for name in NUMERIC_COLUMNS}
+    groups = []
+
+    for week, teams in league_data.items():
+        week_code = encoders['week'].encode(str(week))
+        for team_id, players in teams.items():
+            team_code = encoders['team_id'].encode(str(team_id))
+            groups.append([week_code, team_code])
+            for player in players:
+                columns['week'].append(week_code)
+                columns['team_id'].append(team_code)
+                for name in CODED_COLUMNS:
+                    value = player.get(name)
+                    columns[name].append(encoders[name].encode(value) if value is not None else MISSING)
+                for name in NUMERIC_COLUMNS:
+                    numeric[name].append(float(player.get(name, 0.0)))
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(output_dir, f"{name}.npy"), np.asarray(values, dtype=np.int32))
+    for name, values in numeric.items():
+        np.save(os.path.join(output_dir, f"{name}.npy"), np.asarray(values, dtype=np.float64))
+
+    meta = {
+        'version': STORE_VERSION,
+        'rows': len(columns['week']),
+        'groups': groups,
+        'dictionaries': {name: encoder.values for name, encoder in encoders.items()},
+    }
+    tmp_file = os.path.join(output_dir, 'meta.json.tmp')
+    with open(tmp_file, 'w') as file:
+        json.dump(meta, file, separators=(',', ':'))
+    os.replace(tmp_file, os.path.join(output_dir, 'meta.json'))
+
+
+def convert_json(json_file, output_dir):
+    """
+    Converts an existing league_data_by_week.json style file into a columnar store.
+
+    Args:
+        json_file (str): The JSON file to convert.
+        output_dir (str): The directory to write the store to.
+    """
+    with open(json_file, 'r') as file:
+        league_data = json.load(file)
+    write_store(league_data, output_dir)
+
+
+class ColumnarStore:
+    """
+    Read-only, memory-mapped view of a columnar player-week store.
+
+    Columns are opened lazily on first access, so a reader that only needs
+    points and lineup positions never touches the name or team columns.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r') as file:
+            meta = json.load(file)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported columnar store version {meta.get('version')} in {path}.")
+        self.rows = meta['rows']
+        self.groups = meta['groups']
+        self.dictionaries = meta['dictionaries']
+        self._columns = {}
+
+    @property
+    def weeks(self):
+        """The week keys in the store, in their original order."""
+        return list(self.dictionaries['week'])
+
+    def column(self, name):
+        """
+        Returns a column as a memory-mapped array.
+
+        Coded columns are returned as int32 codes; use dictionary() to decode them.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            np.ndarray: The read-only column.
+        """
+        if name not in self._columns:
+            column_file = os.path.join(self.path, f"{name}.npy")
+            if not os.path.exists(column_file):
+                raise KeyError(f"Column '{name}' not found in {self.path}.")
+            # Empty arrays cannot be memory-mapped
+            self._columns[name] = np.load(column_file, mmap_mode='r' if self.rows else None)
+        return self._columns[name]
+
+    def dictionary(self, name):
+        """Returns the list of values that a coded column's codes index into."""
+        return self.dictionaries[name]
+
+    def week_mask(self, weeks):
+        """
+        Returns a boolean row mask selecting the given weeks.
+
+        Args:
+            weeks (list): The week keys to select, or None for every week.
+
+        Returns:
+            np.ndarray: The row mask.
+        """
+        if weeks is None:
+            return np.ones(self.rows, dtype=bool)
+        selected = {str(week) for week in weeks}
+        week_codes = [code for code, week in enumerate(self.dictionaries['week']) if week in selected]
+        return np.isin(self.column('week'), week_codes)
+
+    def to_dict(self, weeks=None, fields=None):
+        """
+        Rebuilds the week -> team -> players dict shape used by the rest of the project.
+
+        Args:
+            weeks (list): The week keys to load, or None for every week.
+            fields (list): The player fields to include, or None for all of them.
+
+        Returns:
+            dict: The league data keyed by week.
+        """
+        # Stores written before a column existed have no dictionary for it
+        fields = [name for name in FIELD_ORDER if (fields is None or name in fields)
+                  and (name in NUMERIC_COLUMNS or name in self.dictionaries)]
+        week_names = self.dictionaries['week']
+        team_names = self.dictionaries['team_id']
+        selected = None if weeks is None else {str(week) for week in weeks}
+
+        league_data = {}
+        for week_code, team_code in self.groups:
+            week = week_names[week_code]
+            if selected is None or week in selected:
+                league_data.setdefault(week, {})[team_names[team_code]] = []
+
+        mask = self.week_mask(weeks)
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return league_data
+
+        week_codes = self.column('week')[rows].tolist()
+        team_codes = self.column('team_id')[rows].tolist()
+        values = {}
+        for name in fields:
+            if name in NUMERIC_COLUMNS:
+                values[name] = self.column(name)[rows].tolist()
+            else:
+                dictionary = self.dictionaries[name]
+                values[name] = [dictionary[code] if code != MISSING else None
+                                for code in self.column(name)[rows].tolist()]
+
+        for i in range(len(rows)):
+            player = {}
+            for name in fields:
+                value = values[name][i]
+                if value is not None:
+                    player[name] = value
+            league_data[week_names[week_codes[i]]][team_names[team_codes[i]]].append(player)
+
+        return league_data
+
+
+def load_league_data(path, weeks=None, fields=None):
+    """
+    Loads league data from a columnar store in the legacy dict shape.
+
+    Args:
+        path (str): The store directory.
+        weeks (list): The week keys to load, or None for every week.
+        fields (list): The player fields to include, or None for all of them.
+
+    Returns:
+        dict: The league data keyed by week.
+    """
+    return ColumnarStore(path).to_dict(weeks, fields)
+
+
+def main():
+    json_file = sys.argv[1] if len(sys.argv) > 1 else 'league_data_by_week.json'
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else 'league_data_columnar'
+    convert_json(json_file, output_dir)
+    print(f"Converted {json_file} to columnar store {output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import NamedTuple
+from urllib.parse import urlparse
+
+from atomicFiles import atomic_write
+from browserSession import COOKIE_FILE, YAHOO_BASE_URL, default_session_manager
+from httpFetch import BACKENDS
+from pageCache import PAGE_CACHE_ROOT, PageCache
+from playerIndex import INDEX_FILE, IdentityIndex
+from scrapeMetrics import default_metrics
+from segmentStore import SEGMENT_ROOT
+from yahoo_data import REQUEST_BURST, REQUEST_RATE, TokenBucket, YahooFantasyAPI, save_league_data_segment
+from yahoo_getDraft import YahooFantasyDraftResults
+from yahoo_getMatchups import YahooFantasyAPI as YahooMatchupsAPI
+
+CRAWL_ROOT = 'crawl'
+PROGRESS_FILE = 'progress.jsonl'
+
+CONCURRENCY = 4
+HOST_CONCURRENCY = 4
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 2.0
+
+JOB_KINDS = ('roster', 'schedule', 'draft')
+
+
+class CrawlJob(NamedTuple):
+    """One page to scrape: a team's roster for a week, a week's matchups, or the draft results."""
+    kind: str
+    week: int = None
+    team: int = None
+
+    @property
+    def key(self):
+        return ':'.join(str(part) for part in self if part is not None)
+
+
+def plan_jobs(start_week=1, end_week=14, team_count=12, schedule_weeks=(1, 14), draft=True):
+    """
+    Plans a season backfill.
+
+    Args:
+        start_week (int): First week of rosters.
+        end_week (int): Last week of rosters.
+        team_count (int): Teams in the league.
+        schedule_weeks (tuple): (first, last) week of matchups, or None for no schedule.
+        draft (bool): Whether to scrape the draft results.
+
+    Returns:
+        list: The jobs, rosters week by week first.
+    """
+    jobs = [CrawlJob('roster', week, team)
+            for week in range(start_week, end_week + 1) for team in range(1, team_count + 1)]
+    if schedule_weeks:
+        jobs.extend(CrawlJob('schedule', week) for week in range(schedule_weeks[0], schedule_weeks[1] + 1))
+    if draft:
+        jobs.append(CrawlJob('draft'))
+    return jobs
+
+
+class Checkpoint:
+    """
+    Append-only record of finished jobs and their results.
+
+    Each finished job is one JSON line, flushed to disk before the next is
+    recorded, so a run that dies loses at most the job in flight. A torn last
+    line from a crash is ignored on load.
+    """
+
+    def __init__(self, league_id, root=CRAWL_ROOT):
+        self.path = os.path.join(root, str(league_id), PROGRESS_FILE)
+
+    def load(self):
+        """Returns job key -> result for every job recorded so far."""
+        results = {}
+        try:
+            with open(self.path, 'r') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    results[record['job']] = record['result']
+        except FileNotFoundError:
+            pass
+        return results
+
+    def record(self, job, result):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a') as file:
+            file.write(json.dumps({'job': job.key, 'result': result}, separators=(',', ':')) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class CrawlOrchestrator:
+    """
+    Runs a season backfill as concurrent jobs, resuming from its checkpoint.
+
+    Jobs run on asyncio under a global concurrency limit and a per-host limit;
+    the blocking scrapers run in worker threads, each job on a scraper borrowed
+    from a per-kind pool whose sessions come from the shared session manager.
+    Page loads are paced by one TokenBucket, and a failed job is retried with
+    exponential backoff. Jobs already in the checkpoint are not run again.
+    """
+
+    def __init__(self, league_id, base_url=YAHOO_BASE_URL, cookie_file=COOKIE_FILE, backend='selenium',
+                 concurrency=CONCURRENCY, host_concurrency=HOST_CONCURRENCY, rate=REQUEST_RATE, burst=REQUEST_BURST,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS, root=CRAWL_ROOT, page_cache=None,
+                 session_manager=None):
+        """
+        Args:
+            league_id (str): The Yahoo league ID.
+            base_url (str): The site to scrape, e.g. a local fixture server.
+            cookie_file (str): Pickled Yahoo cookies, or None to skip authentication.
+            backend (str): 'selenium' or 'http' (see httpFetch).
+            concurrency (int): Jobs in flight at once.
+            host_concurrency (int): Jobs in flight at once against any one host.
+            rate (float): Page loads per second across all jobs.
+            burst (int): Page loads allowed back to back before the rate applies.
+            max_retries (int): Retries per job after the first failure.
+            backoff (float): Seconds to wait before the first retry; doubled for each further retry.
+            root (str): Directory holding the per-league checkpoints.
+            page_cache (PageCache): Raw page cache shared by the scrapers, or None to always fetch.
+            session_manager (SessionManager): Supplies warm sessions; defaults to the shared one.
+        """
+        if concurrency < 1 or host_concurrency < 1:
+            raise ValueError("Concurrency limits must be at least 1.")
+        self.league_id = str(league_id)
+        self.base_url = base_url.rstrip('/')
+        self.cookie_file = cookie_file
+        self.backend = backend
+        self.concurrency = concurrency
+        self.host_concurrency = host_concurrency
+        self.rate_limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.checkpoint = Checkpoint(league_id, root)
+        self.page_cache = page_cache
+        self.session_manager = session_manager or default_session_manager()
+        self.scrapers = {kind: [] for kind in JOB_KINDS}
+        self.idle = None
+        self.created = None
+        self.host_limits = {}
+
+    def _new_scraper(self, kind):
+        if kind == 'roster':
+            return YahooFantasyAPI(self.base_url, self.cookie_file, self.rate_limiter, backend=self.backend,
+                                   page_cache=self.page_cache, session_manager=self.session_manager)
+        if kind == 'schedule':
+            return YahooMatchupsAPI(self.backend, self.base_url, self.cookie_file, self.page_cache, self.session_manager)
+        return YahooFantasyDraftResults(self.backend, self.base_url, self.cookie_file, self.page_cache,
+                                        self.session_manager)
+
+    def _fetch(self, scraper, job):
+        if job.kind == 'roster':
+            return scraper.get_team_roster_by_week(self.league_id, job.team, job.week)
+        with default_metrics().phase('sleep'):
+            self.rate_limiter.acquire()
+        if job.kind == 'schedule':
+            return scraper.get_schedule_by_week(self.league_id, job.week)
+        return scraper.get_draft_results(self.league_id)
+
+    async def _borrow(self, kind):
+        if self.idle[kind].empty() and self.created[kind] < self.concurrency:
+            self.created[kind] += 1
+            try:
+                scraper = await asyncio.to_thread(self._new_scraper, kind)
+            except BaseException:
+                self.created[kind] -= 1
+                raise
+            self.scrapers[kind].append(scraper)
+            return scraper
+        return await self.idle[kind].get()
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(self.host_concurrency)
+        return self.host_limits[host]
+
+    async def _run_job(self, job, limit):
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with limit, self._host_limit(self.base_url):
+                    scraper = await self._borrow(job.kind)
+                    try:
+                        result = await asyncio.to_thread(self._fetch, scraper, job)
+                    finally:
+                        self.idle[job.kind].put_nowait(scraper)
+                # A roster, schedule or draft page with no tables (a sign-in or interstitial page
+                # served with 200) parses to nothing; retry it rather than checkpoint it as done
+                if not result:
+                    raise RuntimeError(f"No data on the {job.kind} page.")
+                return result
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                print(f"Job {job.key} failed ({e}); retrying in {delay:.1f}s.")
+                await asyncio.sleep(delay)
+
+    async def run(self, jobs):
+        """
+        Runs every job not yet in the checkpoint, recording each as it finishes.
+
+        Returns:
+            tuple: (results, failed); results maps job key -> result for every finished job,
+                including earlier runs, and failed lists the jobs that ran out of retries.
+        """
+        results = self.checkpoint.load()
+        pending = [job for job in jobs if job.key not in results]
+        if len(pending) < len(jobs):
+            print(f"Resuming: {len(jobs) - len(pending)} of {len(jobs)} jobs already done.")
+        self.idle = {kind: asyncio.Queue() for kind in JOB_KINDS}
+        self.created = {kind: 0 for kind in JOB_KINDS}
+        limit = asyncio.Semaphore(self.concurrency)
+        failed = []
+
+        async def run_one(job):
+            try:
+                result = await self._run_job(job, limit)
+            except Exception as e:
+                print(f"Job {job.key} gave up: {e}")
+                failed.append(job)
+                return
+            await asyncio.to_thread(self.checkpoint.record, job, result)
+            results[job.key] = result
+
+        await asyncio.gather(*(run_one(job) for job in pending))
+        return results, failed
+
+    def close(self):
+        """Hands every scraper's session back to the session manager."""
+        for scrapers in self.scrapers.values():
+            for scraper in scrapers:
+                scraper.close()
+            scrapers.clear()
+
+
+def write_outputs(jobs, results, league_id, segment_root=SEGMENT_ROOT, output_dir='.', identity_index=None):
+    """
+    Saves the finished parts of a backfill in the scrapers' usual formats.
+
+    Each week whose rosters are all done becomes a segment (see segmentStore); the
+    schedule and draft files are written once every schedule week, or the draft, is done.
+    When `identity_index` is given, the players and draft picks are annotated with their
+    player_uid and team_uid before they are written, so the stored data joins on them.
+
+    Returns:
+        list: The paths written.
+    """
+    paths = []
+    weeks = {}
+    for job in jobs:
+        if job.kind == 'roster':
+            weeks.setdefault(job.week, []).append(job)
+    for week, week_jobs in sorted(weeks.items()):
+        if all(job.key in results for job in week_jobs):
+            league_data = {job.team: results[job.key] for job in week_jobs}
+            if identity_index is not None:
+                identity_index.annotate_league_data(league_data, league_id)
+            paths.append(save_league_data_segment(league_data, week, league_id, segment_root))
+
+    schedule_jobs = [job for job in jobs if job.kind == 'schedule']
+    if schedule_jobs and all(job.key in results for job in schedule_jobs):
+        first, last = schedule_jobs[0].week, schedule_jobs[-1].week
+        schedule = {job.week: results[job.key] for job in schedule_jobs}
+        path = os.path.join(output_dir, f'league_schedule_weeks_{first}_to_{last}.json')
+        atomic_write(path, json.dumps(schedule, indent=4))
+        paths.append(path)
+
+    draft_key = CrawlJob('draft').key
+    if any(job.kind == 'draft' for job in jobs) and draft_key in results:
+        if identity_index is not None:
+            identity_index.annotate_draft(results[draft_key], league_id)
+        path = os.path.join(output_dir, 'draft_results.json')
+        atomic_write(path, json.dumps(results[draft_key], indent=4))
+        paths.append(path)
+    if identity_index is not None:
+        identity_index.save()
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill a season of rosters, matchups and draft results, '
+                                                 'resuming an interrupted run.')
+    parser.add_argument('league_id', help='The Yahoo league ID.')
+    parser.add_argument('--start-week', type=int, default=1)
+    parser.add_argument('--end-week', type=int, default=14)
+    parser.add_argument('--teams', type=int, default=12, help='Number of teams in the league.')
+    parser.add_argument('--schedule-weeks', type=int, nargs=2, default=(1, 14), metavar=('FIRST', 'LAST'))
+    parser.add_argument('--no-schedule', action='store_true', help='Skip the matchup pages.')
+    parser.add_argument('--no-draft', action='store_true', help='Skip the draft results.')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help='Jobs in flight at once.')
+    parser.add_argument('--host-concurrency', type=int, default=HOST_CONCURRENCY,
+                        help='Jobs in flight at once against one host.')
+    parser.add_argument('--rate', type=float, default=REQUEST_RATE, help='Page loads per second across all jobs.')
+    parser.add_argument('--burst', type=int, default=REQUEST_BURST, help='Page loads allowed back to back.')
+    parser.add_argument('--retries', type=int, default=MAX_RETRIES, help='Retries per job after a failure.')
+    parser.add_argument('--backoff', type=float, default=BACKOFF_SECONDS, help='Seconds before the first retry.')
+    parser.add_argument('--base-url', default=YAHOO_BASE_URL, help='Site to scrape, e.g. a local fixture server.')
+    parser.add_argument('--cookie-file', default=COOKIE_FILE, help='Pickled Yahoo cookies.')
+    parser.add_argument('--backend', choices=BACKENDS, default='selenium',
+                        help='Fetch pages with Chrome, or over HTTP with Chrome only as a fallback.')
+    parser.add_argument('--page-cache', nargs='?', const=PAGE_CACHE_ROOT,
+                        help=f'Cache raw pages in this directory (default {PAGE_CACHE_ROOT} when given without one).')
+    parser.add_argument('--checkpoint-root', default=CRAWL_ROOT, help='Directory holding crawl checkpoints.')
+    parser.add_argument('--root', default=SEGMENT_ROOT, help='Segment store root directory.')
+    parser.add_argument('--output-dir', default='.', help='Where the schedule and draft files are written.')
+    parser.add_argument('--identity-index', default=INDEX_FILE, help='Player and team identity index to update.')
+    parser.add_argument('--restart', action='store_true', help='Discard the checkpoint and start over.')
+    args = parser.parse_args()
+
+    jobs = plan_jobs(args.start_week, args.end_week, args.teams,
+                     None if args.no_schedule else tuple(args.schedule_weeks), not args.no_draft)
+    page_cache = PageCache(args.page_cache) if args.page_cache else None
+    orchestrator = CrawlOrchestrator(args.league_id, args.base_url, args.cookie_file, args.backend, args.concurrency,
+                                     args.host_concurrency, args.rate, args.burst, args.retries, args.backoff,
+                                     args.checkpoint_root, page_cache)
+    if args.restart:
+        orchestrator.checkpoint.clear()
+    try:
+        results, failed = asyncio.run(orchestrator.run(jobs))
+    finally:
+        orchestrator.close()
+        print(f"Scrape timings saved to {default_metrics().write_report()}")
+
+    identity_index = IdentityIndex(args.identity_index)
+    for path in write_outputs(jobs, results, args.league_id, args.root, args.output_dir, identity_index):
+        print(f"Saved {path}")
+    if failed:
+        print(f"{len(failed)} jobs failed; run again to resume: {', '.join(job.key for job in failed)}")
+        sys.exit(1)
+    print(f"All {len(jobs)} jobs done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+
+from scrapeMetrics import default_metrics
+
+BACKENDS = ('selenium', 'http')
+
+POOL_SIZE = 10
+TIMEOUT = 30
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36')
+
+
+class HttpDriver:
+    """
+    Fetches server-rendered pages over a pooled keep-alive HTTP session.
+
+    Implements the part of the Selenium WebDriver interface the scrapers use
+    (get, page_source, add_cookie, refresh, implicitly_wait, quit), so they can
+    load the saved Yahoo cookies and parse pages exactly as they do with Chrome,
+    plus alive() for session pools.
+    Pages that need JavaScript can be re-rendered in a browser, which is only
+    started the first time it is needed.
+    """
+
+    def __init__(self, browser_factory=None, pool_size=POOL_SIZE, timeout=TIMEOUT, session=None):
+        """
+        Args:
+            browser_factory (callable): Starts a Selenium WebDriver for pages that need JavaScript,
+                or None to never fall back to a browser.
+            pool_size (int): Keep-alive connections kept per host.
+            timeout (float): Seconds to wait for each response.
+            session (requests.Session): An existing session to use instead of a new one.
+        """
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+        self.session = session
+        self.timeout = timeout
+        self.browser_factory = browser_factory
+        self.browser = None
+        self.cookies = []
+        self.current_url = None
+        self.page_source = ''
+        self.failed = False
+        self.closed = False
+
+    def get(self, url):
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException:
+            # The request never got a response, as opposed to an error page
+            self.failed = True
+            raise
+        self.failed = False
+        response.raise_for_status()
+        self.current_url = response.url
+        self.page_source = response.text
+
+    def refresh(self):
+        if self.current_url:
+            self.get(self.current_url)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+        self.session.cookies.set_cookie(create_cookie(
+            cookie['name'], cookie['value'],
+            domain=cookie.get('domain', ''),
+            path=cookie.get('path', '/'),
+            secure=cookie.get('secure', False),
+            expires=cookie.get('expiry'),
+        ))
+
+    def implicitly_wait(self, seconds):
+        pass  # Responses are complete when get() returns
+
+    def alive(self):
+        """
+        Checks that the session can still be used: it is not closed, its last request
+        got a response, and its browser, if one was started, still answers.
+        """
+        if self.closed or self.failed:
+            return False
+        if self.browser is not None:
+            try:
+                self.browser.current_url
+            except Exception:
+                return False
+        return True
+
+    @property
+    def can_render(self):
+        return self.browser_factory is not None
+
+    def render_with_browser(self):
+        """
+        Loads the current page in a real browser, carrying over the session cookies.
+
+        Returns:
+            str: The rendered page source, which also replaces page_source.
+        """
+        if self.browser is None:
+            self.browser = self.browser_factory()
+            if self.cookies:
+                self.browser.get(self.current_url)
+                for cookie in self.cookies:
+                    try:
+                        self.browser.add_cookie(cookie)
+                    except Exception as e:
+                        print(f"Failed to add cookie {cookie}: {e}")
+        self.browser.get(self.current_url)
+        self.browser.implicitly_wait(5)
+        self.page_source = self.browser.page_source
+        return self.page_source
+
+    def quit(self):
+        self.closed = True
+        self.session.close()
+        if self.browser is not None:
+            self.browser.quit()
+            self.browser = None
+
+
+def start_driver(backend, browser_factory):
+    """
+    Starts the driver for a scraper's fetch backend.
+
+    Args:
+        backend (str): 'selenium' to drive Chrome for every page, or 'http' to fetch pages
+            directly and only use Chrome for pages that need JavaScript.
+        browser_factory (callable): Starts the scraper's Selenium WebDriver.
+
+    Returns:
+        The driver.
+    """
+    if backend == 'http':
+        return HttpDriver(browser_factory)
+    if backend == 'selenium':
+        return browser_factory()
+    raise ValueError(f"Unknown fetch backend '{backend}'.")
+
+
+def fetch_page(driver, url, marker=None, metrics=None):
+    """
+    Loads a page and returns its source.
+
+    With the HTTP backend, a page missing `marker` (e.g. the id of the table the scraper
+    parses) is taken to be rendered by JavaScript and is re-loaded in the browser.
+
+    Args:
+        driver: The scraper's driver (a WebDriver or an HttpDriver).
+        url (str): The page URL.
+        marker (str): Text that a fully rendered page contains.
+        metrics (ScrapeMetrics): Records the navigate, wait, fetch_source and render timings
+            and the page size; defaults to the shared collector.
+
+    Returns:
+        str: The page source.
+    """
+    metrics = metrics or default_metrics()
+    with metrics.phase('navigate'):
+        driver.get(url)
+    with metrics.phase('wait'):
+        driver.implicitly_wait(5)
+    with metrics.phase('fetch_source'):
+        page_source = driver.page_source
+    if marker and marker not in page_source and isinstance(driver, HttpDriver) and driver.can_render:
+        with metrics.phase('render'):
+            page_source = driver.render_with_browser()
+    metrics.add_bytes(len(page_source.encode('utf-8')))
+    return page_source
@@ -0,0 +1,257 @@
+import json
+import os
+import threading
+from types import MappingProxyType
+
+from bestManager import FantasyLeagueAnalyzer
+from buildArtifacts import ARTIFACT_DIR, artifact_name, data_digest, is_fresh
+
+
+def freeze(value):
+    """
+    Recursively converts parsed JSON into read-only containers.
+
+    Dicts become MappingProxyType views and lists become tuples, so data handed
+    out by the cache cannot be mutated by one request and leak into the next.
+
+    Args:
+        value: The parsed JSON value.
+
+    Returns:
+        The read-only equivalent of the value.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """
+    Converts a frozen value back into plain dicts and lists (e.g. for json.dump).
+
+    Args:
+        value: The frozen value.
+
+    Returns:
+        A mutable deep copy of the value.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def file_identity(path):
+    """
+    Returns the identity of a file as (absolute path, mtime in ns, size).
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        tuple: The file identity, or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class Snapshot:
+    """
+    A parsed, read-only view of one version of a JSON file.
+
+    Values derived from the data (e.g. analyzer results) are memoized on the
+    snapshot itself, so they are dropped together with it when the file changes.
+    """
+
+    def __init__(self, identity, data):
+        self.identity = identity
+        self.data = data
+        self._derived = {}
+        # Re-entrant so a derived value may itself be built from other derived values
+        self._lock = threading.RLock()
+
+    @property
+    def version(self):
+        """A short string that changes whenever the underlying file changes."""
+        _, mtime_ns, size = self.identity
+        return f"{mtime_ns:x}-{size:x}"
+
+    def derive(self, key, compute):
+        """
+        Returns a value computed from this snapshot, computing it at most once.
+
+        Args:
+            key: A hashable key naming the derived value.
+            compute (callable): Called with the snapshot data on a cache miss.
+
+        Returns:
+            The (frozen) derived value.
+        """
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = freeze(compute(self.data))
+            return self._derived[key]
+
+
+class SnapshotCache:
+    """
+    Process-wide cache of parsed JSON files keyed on file identity.
+
+    A file is re-read and re-parsed only when its (path, mtime, size) changes.
+    A warm lookup costs a single os.stat call.
+    """
+
+    def __init__(self):
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, load=None):
+        """
+        Returns the current snapshot of a JSON file.
+
+        Args:
+            path (str): The JSON file path.
+            load (callable): Builds the data instead of parsing the file, e.g. from the week
+                segments a manifest file lists; the snapshot still follows the file's identity.
+
+        Returns:
+            Snapshot: The snapshot, or None if the file does not exist.
+        """
+        identity = file_identity(path)
+        key = os.path.abspath(path)
+        if identity is None:
+            with self._lock:
+                self._snapshots.pop(key, None)
+            return None
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.identity == identity:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or snapshot.identity != identity:
+                if load is not None:
+                    data = freeze(load())
+                else:
+                    with open(path, 'r') as json_file:
+                        data = freeze(json.load(json_file))
+                snapshot = Snapshot(identity, data)
+                self._snapshots[key] = snapshot
+            return snapshot
+
+    def clear(self):
+        """Drops every cached snapshot."""
+        with self._lock:
+            self._snapshots.clear()
+
+
+def analyze_weeks(league_data, weeks):
+    """
+    Runs the analyzer over the given weeks without printing the rankings.
+
+    Args:
+        league_data (Mapping): The league data keyed by week.
+        weeks (tuple): The week keys to include.
+
+    Returns:
+        dict: The rankings and processed teams.
+    """
+    analyzer = FantasyLeagueAnalyzer({week: league_data[week] for week in weeks})
+    analyzer.analyze()
+    return {
+        'rankings': analyzer.rank_teams(),
+        'teams': analyzer.teams,
+    }
+
+
+# Shared by every route in the process
+snapshot_cache = SnapshotCache()
+
+
+def resolve_lineups(artifact, league_data):
+    """
+    Replaces an artifact's [week, row] lineup references with the player records they point to.
+
+    Args:
+        artifact (Mapping): The artifact, as written by buildArtifacts.
+        league_data (Mapping): The league data the artifact was built from.
+
+    Returns:
+        dict: The artifact with each team's lineups in the analyzer's shape.
+    """
+    teams = {}
+    for team_id, team in artifact['teams'].items():
+        lineups = {lineup_type: [league_data[week][team_id][row] for week, row in refs]
+                   for lineup_type, refs in team['lineups'].items()}
+        teams[team_id] = dict(team, lineups=lineups)
+    return dict(artifact, teams=teams)
+
+
+def get_artifact(data_file, weeks, artifact_dir=ARTIFACT_DIR, snapshot=None):
+    """
+    Returns the precomputed artifact for a set of weeks if it is still fresh.
+
+    Lineup references are resolved to player records, so the teams have the same
+    shape as a live analysis.
+
+    Args:
+        data_file (str): Path to the league data JSON file.
+        weeks (tuple): The week keys (as strings) to analyze.
+        artifact_dir (str): Directory containing the built artifacts.
+        snapshot (Snapshot): The data file snapshot the caller already holds; looked up if None.
+
+    Returns:
+        Mapping: The read-only artifact, or None if it is missing or stale.
+    """
+    if snapshot is None:
+        snapshot = snapshot_cache.get(data_file)
+    if snapshot is None:
+        return None
+    name = artifact_name(weeks, tuple(snapshot.data))
+    if name is None:
+        return None
+    artifact = snapshot_cache.get(os.path.join(artifact_dir, name))
+    if artifact is None:
+        return None
+
+    # The digest is memoized on the snapshot, so it is computed once per data version
+    digest = snapshot.derive(('digest', tuple(weeks)),
+                             lambda data: data_digest({week: data[week] for week in weeks}))
+    if not is_fresh(artifact.data, digest):
+        return None
+    return snapshot.derive(('artifact', name, artifact.version),
+                           lambda data: resolve_lineups(artifact.data, data))
+
+
+def get_analysis(data_file, weeks, artifact_dir=ARTIFACT_DIR, snapshot=None):
+    """
+    Returns analyzer results for a set of weeks.
+
+    Precomputed artifacts are served when fresh; otherwise the analysis is run
+    live and memoized on the data snapshot.
+
+    Args:
+        data_file (str): Path to the league data JSON file.
+        weeks (tuple): The week keys (as strings) to analyze.
+        artifact_dir (str): Directory containing the built artifacts.
+        snapshot (Snapshot): The data file snapshot the caller already holds, so one request
+            works on one version of the file even if it is replaced meanwhile; looked up if None.
+
+    Returns:
+        Mapping: Read-only rankings and teams, or None if the file or a week is missing.
+    """
+    if snapshot is None:
+        snapshot = snapshot_cache.get(data_file)
+    if snapshot is None or any(week not in snapshot.data for week in weeks):
+        return None
+    artifact = get_artifact(data_file, weeks, artifact_dir, snapshot)
+    if artifact is not None:
+        return artifact
+    return snapshot.derive(('analysis', tuple(weeks)), lambda data: analyze_weeks(data, weeks))
@@ -0,0 +1,298 @@
+import json
+import re
+from typing import NamedTuple, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+# Everything up to the next bracket, stepping over complete strings (which may hold brackets)
+_NON_BRACKET = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_SCALAR = re.compile(r'[^,:\]}\s]*')
+
+
+class PlayerWeek(NamedTuple):
+    """One player's row for one team and week, as stored in league_data_by_week.json."""
+    week: str
+    team_id: str
+    lineup_pos: Optional[str]
+    name: Optional[str]
+    team: Optional[str]
+    position: Optional[str]
+    status: Optional[str]
+    bye_week: Optional[str]
+    fantasy_points: float
+    projected_fantasy_points: float
+    points_diff: float
+    team_name: Optional[str]
+    player_id: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, week, team_id, player):
+        """Builds a record from a parsed player dict."""
+        return cls(
+            week=week,
+            team_id=team_id,
+            lineup_pos=player.get('lineup_pos'),
+            name=player.get('name'),
+            team=player.get('team'),
+            position=player.get('position'),
+            status=player.get('status'),
+            bye_week=player.get('bye_week'),
+            fantasy_points=float(player.get('fantasy_points', 0.0)),
+            projected_fantasy_points=float(player.get('projected_fantasy_points', 0.0)),
+            points_diff=float(player.get('points_diff', 0.0)),
+            team_name=player.get('team_name'),
+            player_id=player.get('player_id'),
+        )
+
+    def as_dict(self):
+        """Returns the player dict shape produced by parse_player_data()."""
+        player = {}
+        for key in ['lineup_pos', 'name', 'player_id', 'team', 'position', 'status', 'bye_week',
+                    'fantasy_points', 'projected_fantasy_points', 'points_diff', 'team_name']:
+            value = getattr(self, key)
+            if value is not None:
+                player[key] = value
+        return player
+
+
+class _JsonStream:
+    """
+    Incremental reader over a JSON text file.
+
+    Only the unread part of the current chunk plus at most one value being decoded
+    is held in memory.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """Reads the next chunk, dropping the consumed part of the buffer. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        """Consumes the next non-whitespace character, which must be `char`."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'end of file'}' in league data stream.")
+        self.pos += 1
+
+    def _refill(self, i, keep):
+        """
+        Reads more input during a scan at buffer index `i`; returns the same position in the new buffer,
+        or None at EOF. Without `keep` the text before `i` is dropped.
+        """
+        if not keep:
+            self.pos = i
+        start = self.pos
+        if not self._fill():
+            return None
+        return i - start
+
+    def _scan(self, keep):
+        """
+        Finds the end of the next JSON value by tracking brackets and strings, without decoding it.
+
+        The scan state (position and depth) carries across chunk refills, so each character is
+        scanned once however many chunks the value spans.
+
+        Args:
+            keep (bool): Keep the value's text in the buffer (from self.pos) to decode it; otherwise
+                it is dropped chunk by chunk as the scan passes it.
+
+        Returns:
+            int: The buffer index just past the value.
+        """
+        first = self.peek()
+        i = self.pos
+        if first == '"':
+            while True:
+                match = _STRING.match(self.buffer, i)
+                if match is not None:
+                    return match.end()
+                i = self._refill(i, keep)
+                if i is None:
+                    raise ValueError("Unterminated string at end of league data stream.")
+        if first not in '[{':
+            while True:
+                # A number at the very end of the buffer may continue in the next chunk
+                end = _SCALAR.match(self.buffer, i).end()
+                if end < len(self.buffer):
+                    return end
+                i = self._refill(i, keep)
+                if i is None:
+                    return len(self.buffer)
+        depth = 0
+        while True:
+            i = _NON_BRACKET.match(self.buffer, i).end()
+            if i < len(self.buffer) and self.buffer[i] != '"':
+                depth += 1 if self.buffer[i] in '[{' else -1
+                i += 1
+                if depth == 0:
+                    return i
+                continue
+            # The chunk ended, possibly inside a string: read on from the same position
+            i = self._refill(i, keep)
+            if i is None:
+                raise ValueError("Unexpected end of league data stream.")
+
+    def skip(self):
+        """Steps over the next JSON value (such as a week being skipped) without decoding it."""
+        self.pos = self._scan(keep=False)
+
+    def value(self):
+        """Decodes the next complete JSON value (a key or a team's roster)."""
+        self.peek()
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            # A number at the very end of the buffer may continue in the next chunk
+            if end < len(self.buffer) or isinstance(value, (str, dict, list)) or self.eof:
+                self.pos = end
+                return value
+        except json.JSONDecodeError:
+            if self.eof:
+                raise
+        # The value runs past the buffer: find its end first, then decode it once
+        end = self._scan(keep=True)
+        value, self.pos = self.decoder.raw_decode(self.buffer[:end], self.pos)
+        return value
+
+    def items(self, close):
+        """Yields once per element of the container just opened, handling commas, until `close`."""
+        if self.peek() == close:
+            self.pos += 1
+            return
+        while True:
+            yield
+            found = self.peek()
+            self.pos += 1
+            if found == close:
+                return
+            if found != ',':
+                raise ValueError(f"Expected ',' or '{close}' but found '{found or 'end of file'}' in league data stream.")
+
+
+def _week_counts(path, chunk_size=CHUNK_SIZE):
+    """
+    Counts how often each week key occurs at the top level of the file.
+
+    Files written by the old yahoo_data.save_league_data_by_week() can repeat a week
+    key (an int week number next to the same week loaded back as a string). json.load
+    keeps the last occurrence, so the streaming readers skip the earlier ones to match.
+    """
+    counts = {}
+    with open(path, 'r') as file:
+        stream = _JsonStream(file, chunk_size)
+        stream.expect('{')
+        for _ in stream.items('}'):
+            week = stream.value()
+            stream.expect(':')
+            stream.skip()
+            counts[week] = counts.get(week, 0) + 1
+    return counts
+
+
+def _walk(file, counts, chunk_size=CHUNK_SIZE):
+    """
+    Walks week -> team -> players, yielding (week, team_id, player) with player None at the start of each team.
+
+    Weeks that occur again later in the file are skipped, as json.load would overwrite them.
+    """
+    seen = {}
+    stream = _JsonStream(file, chunk_size)
+    stream.expect('{')
+    for _ in stream.items('}'):
+        week = stream.value()
+        stream.expect(':')
+        seen[week] = seen.get(week, 0) + 1
+        if seen[week] < counts.get(week, 1):
+            stream.skip()
+            continue
+        stream.expect('{')
+        for _ in stream.items('}'):
+            team_id = stream.value()
+            stream.expect(':')
+            players = stream.value()
+            yield week, team_id, None
+            for player in players:
+                yield week, team_id, player
+
+
+def iter_player_records(path, chunk_size=CHUNK_SIZE):
+    """
+    Streams typed player-week records from a league_data_by_week.json style file.
+
+    The file is read twice: a first pass scans the top-level week keys without
+    decoding the weeks, then a second decodes one team's roster at a time. Memory
+    use is bounded by the chunk size and the largest single roster.
+
+    Args:
+        path (str): The JSON file.
+        chunk_size (int): Characters read per chunk.
+
+    Yields:
+        PlayerWeek: One record per player row, in file order.
+    """
+    counts = _week_counts(path, chunk_size)
+    with open(path, 'r') as file:
+        for week, team_id, player in _walk(file, counts, chunk_size):
+            if player is not None:
+                yield PlayerWeek.from_dict(week, team_id, player)
+
+
+def iter_weeks(path, chunk_size=CHUNK_SIZE):
+    """
+    Streams a league_data_by_week.json style file one week at a time.
+
+    Only the week being yielded (and one chunk of the file) is held in memory,
+    so callers can process a multi-season history week by week. The weeks are
+    the same as json.load would return, in file order.
+
+    Args:
+        path (str): The JSON file.
+        chunk_size (int): Characters read per chunk.
+
+    Yields:
+        tuple: (week, {team_id: [player dicts]}).
+    """
+    current_week = None
+    teams = {}
+    counts = _week_counts(path, chunk_size)
+    with open(path, 'r') as file:
+        for week, team_id, player in _walk(file, counts, chunk_size):
+            if week != current_week:
+                if current_week is not None:
+                    yield current_week, teams
+                current_week, teams = week, {}
+            if player is None:
+                teams[team_id] = []
+            else:
+                teams[team_id].append(player)
+    if current_week is not None:
+        yield current_week, teams
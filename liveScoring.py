@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from bestManager import FantasyLeagueAnalyzer
+from leagueStream import iter_weeks
+
+LIVE_ROOT = 'live'
+POLL_INTERVAL = 60
+EVENT_HISTORY = 500
+HEARTBEAT_SECONDS = 15
+
+# Player fields compared between polls; anything else on the record is ignored
+TRACKED_FIELDS = ['lineup_pos', 'team', 'position', 'status', 'fantasy_points', 'projected_fantasy_points']
+
+
+def player_key(player):
+    """Identifies a player across polls: the Yahoo player ID, or name and position for older records."""
+    if player.get('player_id'):
+        return f"id:{player['player_id']}"
+    return f"name:{player.get('name')}|{player.get('position')}"
+
+
+def diff_team(old_players, new_players):
+    """
+    Compares one team's players between two polls.
+
+    Args:
+        old_players (list): The players at the previous poll.
+        new_players (list): The players now.
+
+    Returns:
+        dict: 'changed' (player, name and {field: [old, new]} for each changed player),
+            'added' and 'removed' players; None if nothing the analysis reads changed.
+    """
+    old = {player_key(player): player for player in old_players}
+    new = {player_key(player): player for player in new_players}
+    changed = []
+    for key, player in new.items():
+        if key not in old:
+            continue
+        fields = {field: [old[key].get(field), player.get(field)] for field in TRACKED_FIELDS
+                  if old[key].get(field) != player.get(field)}
+        if fields:
+            changed.append({'player': key, 'name': player.get('name'), 'fields': fields})
+    added = [player for key, player in new.items() if key not in old]
+    removed = [player for key, player in old.items() if key not in new]
+    if not (changed or added or removed):
+        return None
+    return {'changed': changed, 'added': added, 'removed': removed}
+
+
+class LiveFeed:
+    """
+    In-process feed of live scoring updates for Server-Sent Events clients.
+
+    Holds the latest full state for clients that connect, and the recent deltas,
+    numbered, so a reconnecting client (Last-Event-ID) receives only what it missed.
+    """
+
+    def __init__(self, history=EVENT_HISTORY):
+        self.condition = threading.Condition()
+        self.events = deque(maxlen=history)
+        self.seq = 0
+        self.state = None
+
+    def publish(self, delta, state):
+        """
+        Records a delta and the full state after it, and wakes every waiting client.
+
+        Returns:
+            dict: The delta as published, with its 'seq'.
+        """
+        with self.condition:
+            self.seq += 1
+            event = dict(delta, seq=self.seq)
+            self.events.append(event)
+            self.state = dict(state, seq=self.seq)
+            self.condition.notify_all()
+            return event
+
+    def snapshot(self):
+        """Returns (seq, state) for a client starting from scratch."""
+        with self.condition:
+            return self.seq, self.state
+
+    def events_since(self, seq):
+        """Returns the deltas after `seq`, or None if some of them are no longer kept."""
+        with self.condition:
+            if seq > self.seq:
+                return None
+            if seq < self.seq and (not self.events or self.events[0]['seq'] > seq + 1):
+                return None
+            return [event for event in self.events if event['seq'] > seq]
+
+    def wait(self, seq, timeout=HEARTBEAT_SECONDS):
+        """Blocks until there are deltas after `seq` or the timeout passes; returns them (or None if too old)."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.seq > seq, timeout)
+        return self.events_since(seq)
+
+
+def format_event(event_type, seq, payload):
+    """Formats one Server-Sent Event."""
+    return f"id: {seq}\nevent: {event_type}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+# Shared by the poller and the Flask routes in the process
+live_feed = LiveFeed()
+
+
+class LivePoller:
+    """
+    Polls one week's roster pages and pushes what changed.
+
+    Each poll scrapes every team, diffs each team's players against the previous
+    poll, and only for the teams that changed: appends the delta to
+    live/<league>/week_<week>.jsonl, updates the analysis incrementally
+    (FantasyLeagueAnalyzer.update_teams) and publishes the delta with the new
+    rankings to the live feed.
+    """
+
+    def __init__(self, league_id, week, api, team_count=12, analyzer=None, feed=live_feed, root=LIVE_ROOT,
+                 interval=POLL_INTERVAL):
+        """
+        Args:
+            league_id (str): The Yahoo league ID.
+            week (int): The week being played.
+            api: Fetches rosters with get_league_data_by_week(), e.g. a YahooFantasyAPI or a ScraperPool.
+            team_count (int): Teams in the league.
+            analyzer (FantasyLeagueAnalyzer): An analysis of the completed weeks to extend, or None to
+                analyze the live week alone.
+            feed (LiveFeed): Where updates are published.
+            root (str): Directory holding the delta logs.
+            interval (float): Seconds between polls.
+        """
+        self.league_id = str(league_id)
+        self.week = str(week)
+        self.api = api
+        self.team_count = team_count
+        self.analyzer = analyzer or FantasyLeagueAnalyzer({})
+        self.feed = feed
+        self.interval = interval
+        self.log_path = os.path.join(root, self.league_id, f"week_{self.week}.jsonl")
+        self.previous = None
+
+    def state(self):
+        """The full state a new client starts from."""
+        return {
+            'week': self.week,
+            'rankings': self.analyzer.rank_teams(),
+            'teams': {team_id: {'team_name': team['team_name'], 'metrics': team['metrics']}
+                      for team_id, team in self.analyzer.teams.items()},
+        }
+
+    def _record(self, delta):
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        with open(self.log_path, 'a') as file:
+            file.write(json.dumps(delta, separators=(',', ':')) + '\n')
+
+    def poll_once(self):
+        """
+        Scrapes the week once and applies any changes.
+
+        Returns:
+            dict: The published delta, or None if nothing changed.
+        """
+        polled_at = time.time()
+        teams = {str(team_id): players
+                 for team_id, players in self.api.get_league_data_by_week(self.league_id, int(self.week),
+                                                                          self.team_count).items()}
+        if self.previous is None:
+            previous = self.analyzer.data.get(self.week)
+            if previous is None:
+                self.analyzer.add_week(self.week, teams)
+                self.previous = teams
+                delta = {'week': self.week, 'polled_at': polled_at, 'initial': True,
+                         'teams': {team_id: {'team_name': players[0]['team_name']}
+                                   for team_id, players in teams.items()}}
+                return self._publish(delta)
+            self.previous = dict(previous)
+
+        changes = {}
+        for team_id, players in teams.items():
+            if team_id not in self.previous:
+                print(f"Team {team_id} is not in week {self.week}; skipping it.")
+                continue
+            team_diff = diff_team(self.previous[team_id], players)
+            if team_diff is not None:
+                changes[team_id] = team_diff
+        if not changes:
+            return None
+
+        self.analyzer.update_teams(self.week, {team_id: teams[team_id] for team_id in changes})
+        for team_id in changes:
+            self.previous[team_id] = teams[team_id]
+            changes[team_id]['team_name'] = self.analyzer.teams[team_id]['team_name']
+        return self._publish({'week': self.week, 'polled_at': polled_at, 'teams': changes})
+
+    def _publish(self, delta):
+        self._record(delta)
+        state = self.state()
+        for team_id, team_delta in delta['teams'].items():
+            team_delta['metrics'] = state['teams'][team_id]['metrics']
+        return self.feed.publish(dict(delta, rankings=state['rankings']), state)
+
+    def run(self, stop=None):
+        """
+        Polls until `stop` (a threading.Event) is set; a failed poll is reported and retried next time.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                delta = self.poll_once()
+                if delta is not None:
+                    print(f"Live week {self.week}: {len(delta['teams'])} teams changed (update {delta['seq']}).")
+            except Exception as e:
+                print(f"Live poll failed: {e}")
+            stop.wait(self.interval)
+
+    def start(self):
+        """Runs the poller in a daemon thread; returns the Event that stops it."""
+        stop = threading.Event()
+        threading.Thread(target=self.run, args=(stop,), daemon=True).start()
+        return stop
+
+
+def main():
+    # Run as a script this module is __main__, so use the feed the app imported
+    from app import app, live_feed as app_feed
+    from browserSession import COOKIE_FILE, YAHOO_BASE_URL
+    from httpFetch import BACKENDS
+    from yahoo_data import REQUEST_BURST, REQUEST_RATE, YahooFantasyAPI, TokenBucket
+
+    parser = argparse.ArgumentParser(description='Poll the current week during games and push updates '
+                                                 'to /analyze?live=1.')
+    parser.add_argument('league_id', help='The Yahoo league ID.')
+    parser.add_argument('week', type=int, help='The week being played.')
+    parser.add_argument('--teams', type=int, default=12, help='Number of teams in the league.')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='Seconds between polls.')
+    parser.add_argument('--data-file', help='League data file whose earlier weeks the live week is added to.')
+    parser.add_argument('--rate', type=float, default=REQUEST_RATE, help='Page loads per second.')
+    parser.add_argument('--burst', type=int, default=REQUEST_BURST, help='Page loads allowed back to back.')
+    parser.add_argument('--base-url', default=YAHOO_BASE_URL, help='Site to scrape, e.g. a local fixture server.')
+    parser.add_argument('--cookie-file', default=COOKIE_FILE, help='Pickled Yahoo cookies.')
+    parser.add_argument('--backend', choices=BACKENDS, default='selenium',
+                        help='Fetch pages with Chrome, or over HTTP with Chrome only as a fallback.')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    analyzer = None
+    if args.data_file:
+        analyzer = FantasyLeagueAnalyzer.from_stream(
+            (week, teams) for week, teams in iter_weeks(args.data_file) if week != str(args.week))
+    api = YahooFantasyAPI(args.base_url, args.cookie_file, TokenBucket(args.rate, args.burst), backend=args.backend)
+    poller = LivePoller(args.league_id, args.week, api, args.teams, analyzer, feed=app_feed, interval=args.interval)
+    stop = poller.start()
+    try:
+        # The feed lives in this process, so the app must be served from it, with a thread per client
+        app.run(port=args.port, threaded=True)
+    finally:
+        stop.set()
+        api.close()
+
+
+if __name__ == "__main__":
+    main()
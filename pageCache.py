@@ -0,0 +1,391 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+from atomicFiles import atomic_write, manifest_lock
+from rosterParser import parse_roster_page
+
+PAGE_CACHE_ROOT = 'page_cache'
+INDEX_FILE = 'index.json'
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+# A full cache is pruned to this share of its limit, so it is not pruned again on every page
+PRUNE_TARGET = 0.9
+
+# Page HTML no index references is only removed once it is this old: another scraper
+# sharing the cache may have stored it and not flushed its index yet
+OBJECT_GRACE_SECONDS = 24 * 60 * 60
+
+PAGE_TYPES = ['roster', 'matchups', 'draft']
+
+
+def page_key(league_id, page_type, team_id=None, week_num=None):
+    """Returns the index key of a page: league/page type/team/week, with '-' for parts that do not apply."""
+    parts = [league_id, page_type, team_id, week_num]
+    return '/'.join('-' if part is None else str(part) for part in parts)
+
+
+def content_hash(page_source):
+    """Returns the SHA-256 of a page's HTML."""
+    return hashlib.sha256(page_source.encode('utf-8')).hexdigest()
+
+
+class PageCache:
+    """
+    On-disk cache of raw Yahoo page HTML, stored by content hash.
+
+    Pages are indexed by (league, page type, team, week) and their HTML is kept
+    once per distinct content under objects/<hash[:2]>/<hash>.html, so unchanged
+    pages cost no extra space. Weeks marked final are served from the cache and
+    never refetched. Parsed results are cached per parser next to the page hash
+    they came from, so a refetched page that has not changed is not parsed again.
+    """
+
+    def __init__(self, root=PAGE_CACHE_ROOT, max_bytes=MAX_CACHE_BYTES):
+        """
+        Args:
+            root (str): The cache directory.
+            max_bytes (int): Page HTML kept before the least recently used pages are evicted,
+                or None for no limit.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self.index = self._read_index()
+        self._count_references()
+        self.dirty = set()
+        self.removed = set()
+        self.dirty_final = set()
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.root, INDEX_FILE), 'r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {'pages': {}, 'final_weeks': {}}
+
+    def _count_references(self):
+        """Recounts the index entries per page hash and the size of the distinct pages."""
+        self.references = {}
+        self.size_bytes = 0
+        for entry in self.index['pages'].values():
+            self._reference(entry)
+
+    def _reference(self, entry):
+        count = self.references.get(entry['sha256'], 0)
+        if not count:
+            self.size_bytes += entry['size']
+        self.references[entry['sha256']] = count + 1
+
+    def _dereference(self, entry):
+        count = self.references[entry['sha256']] - 1
+        if count:
+            self.references[entry['sha256']] = count
+        else:
+            del self.references[entry['sha256']]
+            self.size_bytes -= entry['size']
+
+    def _object_path(self, sha256):
+        return os.path.join(self.root, 'objects', sha256[:2], f"{sha256}.html")
+
+    def _parsed_path(self, parser, key):
+        return os.path.join(self.root, 'parsed', parser, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json")
+
+    def flush(self):
+        """
+        Writes this process's index changes.
+
+        The index is re-read under a file lock and only the entries changed here are
+        applied, so concurrent scrapers sharing the cache do not drop each other's pages.
+        """
+        with self.lock:
+            if not (self.dirty or self.removed or self.dirty_final):
+                return
+            with manifest_lock(self.root):
+                index = self._read_index()
+                for key in self.removed:
+                    index['pages'].pop(key, None)
+                for key in self.dirty:
+                    if key in self.index['pages']:
+                        index['pages'][key] = self.index['pages'][key]
+                for league_id in self.dirty_final:
+                    weeks = set(index['final_weeks'].get(league_id, [])) | set(self.index['final_weeks'][league_id])
+                    index['final_weeks'][league_id] = sorted(weeks, key=int)
+                atomic_write(os.path.join(self.root, INDEX_FILE), json.dumps(index, indent=4))
+                self.index = index
+                self._count_references()
+            self.dirty.clear()
+            self.removed.clear()
+            self.dirty_final.clear()
+
+    def entry(self, league_id, page_type, team_id=None, week_num=None):
+        """Returns the index entry of a page, or None if it is not cached."""
+        return self.index['pages'].get(page_key(league_id, page_type, team_id, week_num))
+
+    def get(self, league_id, page_type, team_id=None, week_num=None):
+        """
+        Returns a cached page's HTML, or None if it is not cached.
+        """
+        key = page_key(league_id, page_type, team_id, week_num)
+        with self.lock:
+            entry = self.index['pages'].get(key)
+            if entry is None:
+                return None
+            entry['used_at'] = time.time()
+            self.dirty.add(key)
+        try:
+            with open(self._object_path(entry['sha256']), 'r', encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, league_id, page_type, team_id, week_num, page_source):
+        """
+        Stores a fetched page.
+
+        Returns:
+            tuple: (sha256, changed), where changed is False if the page has the same
+                content as the cached copy.
+        """
+        key = page_key(league_id, page_type, team_id, week_num)
+        sha256 = content_hash(page_source)
+        path = self._object_path(sha256)
+        if os.path.exists(path):
+            # Restart the grace period, so a concurrent prune does not remove it before the index is flushed
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, page_source)
+        now = time.time()
+        with self.lock:
+            previous = self.index['pages'].get(key)
+            if previous is not None:
+                self._dereference(previous)
+            entry = {
+                'sha256': sha256,
+                'size': len(page_source.encode('utf-8')),
+                'fetched_at': now,
+                'used_at': now,
+            }
+            self.index['pages'][key] = entry
+            self._reference(entry)
+            self.dirty.add(key)
+            self.removed.discard(key)
+            over_limit = self.max_bytes is not None and self.size_bytes > self.max_bytes
+        if over_limit:
+            self.prune(int(self.max_bytes * PRUNE_TARGET))
+        return sha256, previous is None or previous['sha256'] != sha256
+
+    def is_final(self, league_id, week_num):
+        return week_num is not None and str(week_num) in self.index['final_weeks'].get(str(league_id), [])
+
+    def mark_final(self, league_id, weeks):
+        """Marks weeks of a league as final: their cached pages are never refetched."""
+        league_id = str(league_id)
+        with self.lock:
+            final = set(self.index['final_weeks'].get(league_id, [])) | {str(week) for week in weeks}
+            self.index['final_weeks'][league_id] = sorted(final, key=int)
+            self.dirty_final.add(league_id)
+        self.flush()
+
+    def fetch(self, league_id, page_type, team_id, week_num, download, parse=None, parser=None):
+        """
+        Returns a page, or its parsed result, going to the network only when needed.
+
+        A page of a final week that is already cached is not downloaded. Otherwise
+        it is downloaded and stored; if `parse` is given and the page's content hash
+        matches the one the cached parse of `parser` came from, the cached result is
+        returned without parsing.
+
+        Args:
+            league_id (str): The league ID.
+            page_type (str): One of PAGE_TYPES.
+            team_id: The team ID, or None for league-wide pages.
+            week_num: The week number, or None for pages without a week.
+            download (callable): Fetches the page HTML.
+            parse (callable): Parses the page HTML; its result must be JSON serializable.
+            parser (str): Names the parser and its version in the parsed-result cache.
+
+        Returns:
+            The parsed result if `parse` is given, else the page HTML.
+        """
+        page_source = None
+        if self.is_final(league_id, week_num):
+            page_source = self.get(league_id, page_type, team_id, week_num)
+        if page_source is None:
+            page_source = download()
+            self.put(league_id, page_type, team_id, week_num, page_source)
+        if parse is None:
+            return page_source
+
+        key = page_key(league_id, page_type, team_id, week_num)
+        sha256 = content_hash(page_source)
+        parsed_path = self._parsed_path(parser, key)
+        try:
+            with open(parsed_path, 'r') as file:
+                parsed = json.load(file)
+            if parsed['sha256'] == sha256:
+                return parsed['result']
+        except FileNotFoundError:
+            pass
+        result = parse(page_source)
+        os.makedirs(os.path.dirname(parsed_path), exist_ok=True)
+        atomic_write(parsed_path, json.dumps({'key': key, 'sha256': sha256, 'result': result}))
+        return result
+
+    def total_bytes(self):
+        """Returns the size of the distinct cached pages, kept up to date as pages are added and evicted."""
+        return self.size_bytes
+
+    def prune(self, max_bytes):
+        """
+        Evicts the least recently used pages until the cache holds at most max_bytes.
+
+        Page HTML still referenced by a remaining entry is kept, and files no entry
+        references (e.g. left behind by an interrupted scrape) are removed once they
+        are older than OBJECT_GRACE_SECONDS.
+
+        Returns:
+            int: The number of evicted entries.
+        """
+        with self.lock:
+            pages = self.index['pages']
+            evicted = []
+            for key in sorted(pages, key=lambda key: pages[key]['used_at']):
+                if self.size_bytes <= max_bytes:
+                    break
+                self._dereference(pages.pop(key))
+                evicted.append(key)
+            self.removed.update(evicted)
+            self.dirty.difference_update(evicted)
+        for key in evicted:
+            for parser in self._parsers():
+                path = self._parsed_path(parser, key)
+                if os.path.exists(path):
+                    os.remove(path)
+        self.flush()
+        self._remove_unreferenced_objects()
+        return len(evicted)
+
+    def _parsers(self):
+        parsed_dir = os.path.join(self.root, 'parsed')
+        return os.listdir(parsed_dir) if os.path.isdir(parsed_dir) else []
+
+    def _remove_unreferenced_objects(self):
+        """
+        Removes page HTML that neither the index on disk nor this process references.
+
+        The index is re-read under its lock, and files newer than OBJECT_GRACE_SECONDS
+        are kept: they may belong to another scraper that has not flushed its index yet.
+        """
+        objects_dir = os.path.join(self.root, 'objects')
+        if not os.path.isdir(objects_dir):
+            return
+        cutoff = time.time() - OBJECT_GRACE_SECONDS
+        with self.lock:
+            referenced = set(self.references)
+        with manifest_lock(self.root):
+            referenced.update(entry['sha256'] for entry in self._read_index()['pages'].values())
+            for prefix in os.listdir(objects_dir):
+                for name in os.listdir(os.path.join(objects_dir, prefix)):
+                    path = os.path.join(objects_dir, prefix, name)
+                    if (name.endswith('.html') and name[:-len('.html')] not in referenced
+                            and os.path.getmtime(path) < cutoff):
+                        os.remove(path)
+
+    def pages(self, league_id=None, page_type=None):
+        """
+        Lists cached pages.
+
+        Yields:
+            tuple: (league_id, page_type, team_id, week_num, entry), with None for parts that do not apply.
+        """
+        for key, entry in sorted(self.index['pages'].items()):
+            parts = [None if part == '-' else part for part in key.split('/')]
+            if (league_id is None or parts[0] == str(league_id)) and (page_type is None or parts[1] == page_type):
+                yield (*parts, entry)
+
+    def rederive(self, parse, league_id=None, page_type=None):
+        """
+        Re-parses cached pages offline, e.g. after a parser change.
+
+        Args:
+            parse (callable): Called with (page_source, league_id, page_type, team_id, week_num).
+            league_id (str): Only re-parse this league's pages.
+            page_type (str): Only re-parse pages of this type.
+
+        Yields:
+            tuple: (league_id, page_type, team_id, week_num, result).
+        """
+        for page_league, page_kind, team_id, week_num, entry in self.pages(league_id, page_type):
+            with open(self._object_path(entry['sha256']), 'r', encoding='utf-8') as file:
+                page_source = file.read()
+            yield page_league, page_kind, team_id, week_num, parse(page_source, page_league, page_kind, team_id, week_num)
+
+
+def rederive_league_data(cache, league_id):
+    """
+    Rebuilds league_data_by_week.json style data from cached roster pages with the current parser.
+
+    Returns:
+        dict: week -> team ID -> players, in week and team order.
+    """
+    league_data = {}
+    pages = cache.rederive(lambda page_source, league, kind, team_id, week_num: parse_roster_page(page_source, team_id),
+                           league_id, 'roster')
+    for _, _, team_id, week_num, players in pages:
+        league_data.setdefault(week_num, {})[team_id] = players
+    return {week: dict(sorted(teams.items(), key=lambda item: int(item[0])))
+            for week, teams in sorted(league_data.items(), key=lambda item: int(item[0]))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and prune the raw Yahoo page cache.')
+    parser.add_argument('--root', default=PAGE_CACHE_ROOT, help='Cache directory.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help='Show page counts and size.')
+    list_parser = commands.add_parser('list', help='List cached pages.')
+    list_parser.add_argument('--league')
+    list_parser.add_argument('--type', choices=PAGE_TYPES)
+    prune_parser = commands.add_parser('prune', help='Evict least recently used pages down to a size.')
+    prune_parser.add_argument('max_mb', type=float, help='Size to prune down to, in MiB.')
+    final_parser = commands.add_parser('final', help='Mark weeks final so they are never refetched.')
+    final_parser.add_argument('league')
+    final_parser.add_argument('weeks', nargs='+')
+    rederive_parser = commands.add_parser('rederive', help='Re-parse cached roster pages into a league data file.')
+    rederive_parser.add_argument('league')
+    rederive_parser.add_argument('output', help='The league_data_by_week.json style file to write.')
+    args = parser.parse_args()
+
+    cache = PageCache(args.root, max_bytes=None)
+    if args.command == 'stats':
+        counts = {}
+        for _, page_type, _, _, _ in cache.pages():
+            counts[page_type] = counts.get(page_type, 0) + 1
+        print(f"{sum(counts.values())} pages, {cache.total_bytes() / 1024 / 1024:.2f} MiB of distinct HTML")
+        for page_type, count in sorted(counts.items()):
+            print(f"  {page_type:<10} {count}")
+        for league_id, weeks in sorted(cache.index['final_weeks'].items()):
+            print(f"  league {league_id} final weeks: {', '.join(weeks)}")
+    elif args.command == 'list':
+        for league_id, page_type, team_id, week_num, entry in cache.pages(args.league, args.type):
+            fetched = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['fetched_at']))
+            print(f"{league_id:<10} {page_type:<10} team {team_id or '-':<4} week {week_num or '-':<4} "
+                  f"{entry['size']:>9} B  {entry['sha256'][:12]}  {fetched}")
+    elif args.command == 'prune':
+        evicted = cache.prune(int(args.max_mb * 1024 * 1024))
+        print(f"Evicted {evicted} pages; {cache.total_bytes() / 1024 / 1024:.2f} MiB left")
+    elif args.command == 'final':
+        cache.mark_final(args.league, args.weeks)
+        print(f"Marked weeks {', '.join(args.weeks)} of league {args.league} final")
+    else:
+        league_data = rederive_league_data(cache, args.league)
+        atomic_write(os.path.abspath(args.output), json.dumps(league_data, indent=4))
+        print(f"Re-derived {len(league_data)} weeks of league {args.league} to {args.output}")
+
+if __name__ == "__main__":
+    main()
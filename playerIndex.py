@@ -0,0 +1,316 @@
+import argparse
+import json
+import os
+import sys
+import threading
+
+from atomicFiles import atomic_write
+from rosterParser import clean_team_name
+from segmentStore import SEGMENT_ROOT, load_weeks
+
+INDEX_FILE = 'identity_index.json'
+INDEX_VERSION = 1
+DRAFT_POINTS_FILE = 'draft_points.json'
+
+# Roster and draft string fields worth interning; the same few hundred values repeat every week
+INTERNED_FIELDS = ['lineup_pos', 'name', 'player_id', 'team', 'position', 'status', 'bye_week', 'team_name',
+                   'player_name', 'player_team', 'player_position']
+
+
+def normalize_name(name):
+    """
+    Returns the key a name is matched on: letters and digits only, lower-cased.
+
+    Scraped team names are stored with non-ASCII characters stripped (see
+    clean_team_name()) while the draft page keeps them, so both spellings must
+    reduce to the same key: non-ASCII characters are dropped the same way here
+    ("Café" and "Caf" are both "caf").
+    """
+    return ''.join(char for char in clean_team_name(name or '') if char.isalnum()).lower()
+
+
+class IdentityIndex:
+    """
+    Persistent mapping of players and fantasy teams to stable integer IDs.
+
+    Players are identified by their Yahoo player ID where the data carries one
+    (roster links and draft picks), and otherwise by normalized name and
+    position; a player first seen without a Yahoo ID is linked to it when it
+    turns up. Fantasy teams are identified by league and team ID, with their
+    normalized names indexed so draft picks, which only name the team, resolve
+    to the same ID. A normalized name claimed by more than one team (names that
+    differ only in emoji or accents) is ambiguous and never resolves a team on
+    its own. IDs are never reused or renumbered, so they can be stored alongside
+    the data and joined on across runs.
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        """
+        Args:
+            path (str): The index file; created on the first save().
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.players = []
+        self.teams = []
+        self.player_by_yahoo_id = {}
+        self.player_by_name = {}
+        self.team_by_id = {}
+        self.team_by_name = {}
+        self.ambiguous_team_names = set()
+        self.dirty = False
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported identity index version {data.get('version')} in {path}.")
+        for player in data['players']:
+            self._index_player(self._intern_record(player))
+        for team in data['teams']:
+            team = self._intern_record(team)
+            team['names'] = [self.intern(name) for name in team['names']]
+            self._index_team(team)
+
+    def intern(self, value):
+        """Returns the interned copy of a string, so equal strings across datasets share one object."""
+        return sys.intern(value) if isinstance(value, str) else value
+
+    def _intern_record(self, record):
+        return {key: self.intern(value) for key, value in record.items()}
+
+    def _index_player(self, player):
+        self.players.append(player)
+        if player['yahoo_id'] is not None:
+            self.player_by_yahoo_id[player['yahoo_id']] = player['uid']
+        self.player_by_name.setdefault((normalize_name(player['name']), player['position']), player['uid'])
+
+    def _index_team(self, team):
+        self.teams.append(team)
+        if team['team_id'] is not None:
+            self.team_by_id[(team['league_id'], team['team_id'])] = team['uid']
+        for name in team['names']:
+            self._index_team_name((team['league_id'], normalize_name(name)), team['uid'])
+
+    def _index_team_name(self, name_key, uid):
+        if self.team_by_name.setdefault(name_key, uid) != uid:
+            self.ambiguous_team_names.add(name_key)
+
+    def player_uid(self, name, position=None, yahoo_id=None):
+        """
+        Returns a player's integer ID, assigning one on first sight.
+
+        Args:
+            name (str): The player name.
+            position (str): The player position, to tell apart players sharing a name.
+            yahoo_id (str): The Yahoo player ID, when the data has one.
+
+        Returns:
+            int: The player's ID.
+        """
+        yahoo_id = None if yahoo_id is None else str(yahoo_id)
+        with self.lock:
+            if yahoo_id is not None and yahoo_id in self.player_by_yahoo_id:
+                return self.player_by_yahoo_id[yahoo_id]
+            uid = self.player_by_name.get((normalize_name(name), position))
+            if uid is not None:
+                player = self.players[uid]
+                if yahoo_id is None:
+                    return uid
+                if player['yahoo_id'] is None:
+                    player['yahoo_id'] = self.intern(yahoo_id)
+                    self.player_by_yahoo_id[player['yahoo_id']] = uid
+                    self.dirty = True
+                    return uid
+            uid = len(self.players)
+            self._index_player({'uid': uid, 'yahoo_id': self.intern(yahoo_id), 'name': self.intern(name),
+                                'position': self.intern(position)})
+            self.dirty = True
+            return uid
+
+    def team_uid(self, league_id, team_id=None, name=None):
+        """
+        Returns a fantasy team's integer ID, assigning one on first sight.
+
+        Args:
+            league_id (str): The league ID.
+            team_id: The team's ID in the league, when known.
+            name (str): The team name; alone it resolves the team by name.
+
+        Returns:
+            int: The team's ID, or None if only a name is given and it matches more than one team.
+        """
+        league_id = str(league_id)
+        team_id = None if team_id is None else str(team_id)
+        name_key = (league_id, normalize_name(name)) if name else None
+        with self.lock:
+            uid = self.team_by_id.get((league_id, team_id)) if team_id is not None else None
+            if uid is None and name_key in self.ambiguous_team_names:
+                if team_id is None:
+                    return None
+            elif uid is None and name_key is not None:
+                uid = self.team_by_name.get(name_key)
+                if uid is not None and team_id is not None:
+                    team = self.teams[uid]
+                    if team['team_id'] is None:
+                        team['team_id'] = self.intern(team_id)
+                        self.team_by_id[(league_id, team['team_id'])] = uid
+                        self.dirty = True
+                    elif team['team_id'] != team_id:
+                        uid = None
+            if uid is None:
+                uid = len(self.teams)
+                self._index_team({'uid': uid, 'league_id': self.intern(league_id), 'team_id': self.intern(team_id),
+                                  'names': []})
+                self.dirty = True
+            team = self.teams[uid]
+            if name and name not in team['names']:
+                team['names'].append(self.intern(name))
+                self._index_team_name(name_key, uid)
+                self.dirty = True
+            return uid
+
+    def annotate_league_data(self, league_data, league_id):
+        """
+        Adds 'player_uid' and 'team_uid' to every player and interns its strings, in place.
+
+        Args:
+            league_data (dict): Week -> team ID -> players, or a single week's team ID -> players.
+            league_id (str): The league ID.
+
+        Returns:
+            dict: The same league data.
+        """
+        weeks = league_data.values()
+        if any(isinstance(teams, list) for teams in weeks):
+            weeks = [league_data]
+        for teams in weeks:
+            for team_id, players in teams.items():
+                for player in players:
+                    for field in INTERNED_FIELDS:
+                        if field in player:
+                            player[field] = self.intern(player[field])
+                    player['player_uid'] = self.player_uid(player.get('name'), player.get('position'),
+                                                           player.get('player_id'))
+                    player['team_uid'] = self.team_uid(league_id, team_id, player.get('team_name'))
+        return league_data
+
+    def annotate_draft(self, draft_results, league_id):
+        """
+        Adds 'player_uid' and 'team_uid' to every draft pick and interns its strings, in place.
+
+        A pick whose team name matches more than one team gets a 'team_uid' of None.
+
+        Returns:
+            list: The same draft results.
+        """
+        for pick in draft_results:
+            for field in INTERNED_FIELDS:
+                if field in pick:
+                    pick[field] = self.intern(pick[field])
+            pick['player_uid'] = self.player_uid(pick.get('player_name'), pick.get('player_position'),
+                                                 pick.get('player_id'))
+            pick['team_uid'] = self.team_uid(league_id, name=pick.get('team_name'))
+        return draft_results
+
+    def save(self):
+        """Writes the index if anything was added since it was loaded or last saved."""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = {'version': INDEX_VERSION, 'players': self.players, 'teams': self.teams}
+            text = json.dumps(data, indent=1)
+            self.dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        atomic_write(self.path, text)
+
+
+def index_by(records, field):
+    """
+    Builds a hash index of records on an integer key.
+
+    Returns:
+        dict: Key -> list of the records with that key.
+    """
+    index = {}
+    for record in records:
+        index.setdefault(record[field], []).append(record)
+    return index
+
+
+def season_points(league_data, field='player_uid'):
+    """
+    Sums each player's (or, with field='team_uid', each team's) fantasy points over annotated league data.
+
+    Returns:
+        dict: ID -> total fantasy points.
+    """
+    totals = {}
+    for teams in league_data.values():
+        for players in teams.values():
+            for player in players:
+                totals[player[field]] = totals.get(player[field], 0.0) + float(player.get('fantasy_points', 0.0))
+    return totals
+
+
+def draft_points(draft_results, league_data):
+    """
+    Joins annotated draft picks to the season points of the players picked.
+
+    Returns:
+        list: The picks, each with 'season_points' and 'kept' (points scored for the drafting team, or
+            None when the pick's team name matched more than one team).
+    """
+    totals = season_points(league_data)
+    kept = {}
+    for teams in league_data.values():
+        for players in teams.values():
+            for player in players:
+                key = (player['player_uid'], player['team_uid'])
+                kept[key] = kept.get(key, 0.0) + float(player.get('fantasy_points', 0.0))
+    return [dict(pick, season_points=totals.get(pick['player_uid'], 0.0),
+                 kept=kept.get((pick['player_uid'], pick['team_uid']), 0.0) if pick['team_uid'] is not None else None)
+            for pick in draft_results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain the player and fantasy team identity index.')
+    parser.add_argument('--index', default=INDEX_FILE, help='The index file.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    update_parser = subparsers.add_parser('update', help="Register a league's scraped weeks and draft.")
+    update_parser.add_argument('league_id')
+    update_parser.add_argument('--root', default=SEGMENT_ROOT, help='Segment store root directory.')
+    update_parser.add_argument('--draft', help='Draft results file (draft_results.json).')
+    draft_parser = subparsers.add_parser('draft', help="Join a league's draft picks to the season points "
+                                                       "of the players picked.")
+    draft_parser.add_argument('league_id')
+    draft_parser.add_argument('draft', help='Draft results file (draft_results.json).')
+    draft_parser.add_argument('--root', default=SEGMENT_ROOT, help='Segment store root directory.')
+    draft_parser.add_argument('--output', default=DRAFT_POINTS_FILE, help='Where the joined picks are written.')
+    subparsers.add_parser('stats', help='Print the number of players and teams indexed.')
+    args = parser.parse_args()
+
+    index = IdentityIndex(args.index)
+    if args.command == 'update':
+        index.annotate_league_data(load_weeks(args.league_id, root=args.root), args.league_id)
+        if args.draft:
+            with open(args.draft, 'r') as file:
+                index.annotate_draft(json.load(file), args.league_id)
+        index.save()
+    elif args.command == 'draft':
+        # Annotating is idempotent; it covers data saved before the index existed
+        league_data = index.annotate_league_data(load_weeks(args.league_id, root=args.root), args.league_id)
+        with open(args.draft, 'r') as file:
+            picks = draft_points(index.annotate_draft(json.load(file), args.league_id), league_data)
+        index.save()
+        atomic_write(args.output, json.dumps(picks, indent=4))
+        print(f"{len(picks)} draft picks joined to season points in {args.output}")
+    linked = sum(player['yahoo_id'] is not None for player in index.players)
+    print(f"{len(index.players)} players ({linked} with Yahoo IDs), {len(index.teams)} fantasy teams in {args.index}")
+
+
+if __name__ == "__main__":
+    main()
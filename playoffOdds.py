@@ -0,0 +1,208 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from calcStandings import calculate_weekly_team_totals, compute_season_standings, load_data
+
+PLAYOFF_TEAMS = 6
+BYE_TEAMS = 2
+SIMULATIONS = 100000
+
+# Seasons simulated per batch; fixed so results do not depend on the number of workers
+CHUNK_SIZE = 10000
+
+# Weight of the projection relative to history, expressed as a number of weeks of history
+PROJECTION_WEIGHT_WEEKS = 3
+
+# Weekly score spread used until a team has enough history of its own
+DEFAULT_SCORE_SD = 25.0
+
+
+def projected_weekly_points(fantasy_data):
+    """
+    Returns each team's projected points from its starters in the latest week of data.
+
+    Args:
+        fantasy_data (dict): The league data keyed by week.
+
+    Returns:
+        dict: Team ID -> projected points.
+    """
+    if not fantasy_data:
+        return {}
+    latest_week = max(fantasy_data, key=int)
+    return {
+        team_id: sum(player['projected_fantasy_points'] for player in players
+                     if player['lineup_pos'] not in ['BN', 'IR'])
+        for team_id, players in fantasy_data[latest_week].items()
+    }
+
+
+def score_model(weekly_totals, projections, team_ids):
+    """
+    Models each team's weekly score as a normal distribution.
+
+    The mean blends the team's average weekly score with its projection, with the
+    history weighted by the number of weeks played. The spread is the team's own
+    weekly standard deviation, shrunk toward the league-wide spread.
+
+    Args:
+        weekly_totals (dict): Week -> team ID -> points.
+        projections (dict): Team ID -> projected points.
+        team_ids (list): The team IDs, defining the array order.
+
+    Returns:
+        tuple: (means, standard deviations) arrays, one value per team.
+    """
+    history = {team_id: [totals[team_id] for totals in weekly_totals.values() if team_id in totals]
+               for team_id in team_ids}
+    all_scores = [score for scores in history.values() for score in scores]
+    league_sd = float(np.std(all_scores, ddof=1)) if len(all_scores) > 2 else DEFAULT_SCORE_SD
+    league_mean = float(np.mean(all_scores)) if all_scores else 0.0
+
+    means = []
+    sds = []
+    for team_id in team_ids:
+        scores = history[team_id]
+        played = len(scores)
+        projection = projections.get(team_id)
+        history_mean = float(np.mean(scores)) if scores else league_mean
+        if projection is None:
+            means.append(history_mean)
+        else:
+            means.append((history_mean * played + projection * PROJECTION_WEIGHT_WEEKS) / (played + PROJECTION_WEIGHT_WEEKS))
+
+        team_sd = float(np.std(scores, ddof=1)) if played > 1 else league_sd
+        sds.append((team_sd * played + league_sd * PROJECTION_WEIGHT_WEEKS) / (played + PROJECTION_WEIGHT_WEEKS))
+    return np.array(means), np.maximum(np.array(sds), 1e-9)
+
+
+def _simulate_chunk(args):
+    """
+    Simulates one batch of seasons and counts the final seeds.
+
+    Args:
+        args (tuple): (seed sequence, simulations, means, sds, wins, points_for,
+            team1 indexes, team2 indexes), where the indexes are one array of
+            matchup sides per remaining week.
+
+    Returns:
+        tuple: (seed counts as a teams x teams array, summed final wins per team).
+    """
+    seed, simulations, means, sds, wins, points_for, team1, team2 = args
+    rng = np.random.default_rng(seed)
+    teams = len(means)
+    final_wins = np.tile(wins, (simulations, 1))
+    final_points = np.tile(points_for, (simulations, 1))
+
+    for first, second in zip(team1, team2):
+        scores = rng.normal(means, sds, size=(simulations, teams))
+        first_scores = scores[:, first]
+        second_scores = scores[:, second]
+        result = (first_scores > second_scores) + 0.5 * (first_scores == second_scores)
+        final_wins[:, first] += result
+        final_wins[:, second] += 1 - result
+        final_points[:, first] += first_scores
+        final_points[:, second] += second_scores
+
+    # Seed by wins, then points for, best first
+    order = np.lexsort((-final_points, -final_wins), axis=-1)
+    seeds = np.empty_like(order)
+    np.put_along_axis(seeds, order, np.broadcast_to(np.arange(teams), order.shape), axis=-1)
+    counts = np.bincount((np.arange(teams) * teams + seeds).ravel(), minlength=teams * teams).reshape(teams, teams)
+    return counts, final_wins.sum(axis=0)
+
+
+def simulate_playoff_odds(fantasy_data, schedule_data, simulations=SIMULATIONS, seed=0,
+                          playoff_teams=PLAYOFF_TEAMS, bye_teams=BYE_TEAMS, workers=None):
+    """
+    Estimates playoff, bye and seed probabilities by simulating the rest of the schedule.
+
+    Completed weeks come from the standings engine; every remaining scheduled week is
+    simulated for all seasons at once as arrays. Seasons are split into fixed-size
+    chunks with independent random streams, so a given seed gives the same result
+    whether or not a process pool is used.
+
+    Args:
+        fantasy_data (dict): The league data keyed by week.
+        schedule_data (dict): The full regular-season schedule keyed by week.
+        simulations (int): The number of seasons to simulate.
+        seed (int): The random seed.
+        playoff_teams (int): The number of teams that make the playoffs.
+        bye_teams (int): The number of top seeds that get a first-round bye.
+        workers (int): Process pool size; None or 1 simulates in this process.
+
+    Returns:
+        dict: Odds per team name plus the simulation settings.
+    """
+    season = compute_season_standings(fantasy_data, schedule_data)
+    weekly_totals, _ = calculate_weekly_team_totals(fantasy_data)
+    team_ids = list(season.team_names)
+    index = {team_id: position for position, team_id in enumerate(team_ids)}
+    names = [season.team_names[team_id] for team_id in team_ids]
+
+    records = season.team_records
+    wins = np.array([records[name]['wins'] + 0.5 * records[name]['ties'] for name in names], dtype=float)
+    points_for = np.array([records[name]['PF'] for name in names], dtype=float)
+    means, sds = score_model(weekly_totals, projected_weekly_points(fantasy_data), team_ids)
+
+    remaining = [week for week in sorted(schedule_data, key=int) if week not in season.weekly_standings]
+    team1 = [np.array([index[m['team1_id']] for m in schedule_data[week]], dtype=int) for week in remaining]
+    team2 = [np.array([index[m['team2_id']] for m in schedule_data[week]], dtype=int) for week in remaining]
+
+    chunk_sizes = [CHUNK_SIZE] * (simulations // CHUNK_SIZE)
+    if simulations % CHUNK_SIZE:
+        chunk_sizes.append(simulations % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    jobs = [(chunk_seed, size, means, sds, wins, points_for, team1, team2)
+            for chunk_seed, size in zip(seeds, chunk_sizes)]
+
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_chunk, jobs))
+    else:
+        results = [_simulate_chunk(job) for job in jobs]
+
+    seed_counts = sum(counts for counts, _ in results)
+    total_wins = sum(team_wins for _, team_wins in results)
+
+    odds = {}
+    for position, name in enumerate(names):
+        seed_probabilities = (seed_counts[position] / simulations).tolist()
+        odds[name] = {
+            'playoff_probability': sum(seed_probabilities[:playoff_teams]),
+            'bye_probability': sum(seed_probabilities[:bye_teams]),
+            'seed_probabilities': seed_probabilities,
+            'projected_wins': float(total_wins[position] / simulations),
+            'mean_score': float(means[position]),
+            'score_sd': float(sds[position]),
+        }
+
+    return {
+        'simulations': simulations,
+        'seed': seed,
+        'playoff_teams': playoff_teams,
+        'bye_teams': bye_teams,
+        'completed_weeks': season.weeks,
+        'remaining_weeks': remaining,
+        'teams': odds,
+    }
+
+
+def save_playoff_odds_to_json(playoff_odds, output_file):
+    """Save the playoff odds to a JSON file."""
+    with open(output_file, 'w') as file:
+        json.dump(playoff_odds, file, indent=4)
+
+
+def main():
+    fantasy_data = load_data('league_data_by_week.json')
+    schedule_data = load_data('league_schedule_weeks_1_to_14.json')
+
+    playoff_odds = simulate_playoff_odds(fantasy_data, schedule_data, workers=os.cpu_count())
+    save_playoff_odds_to_json(playoff_odds, 'playoff_odds.json')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+import html
+import re
+from html.parser import HTMLParser
+
+from bs4.dammit import EntitySubstitution
+
+# Names this parser's output in cached parse results; bump it when the output changes
+PARSER_VERSION = 'roster-v2'
+
+STAT_TABLE_IDS = ['statTable0', 'statTable1', 'statTable2']
+TEAM_NAME_CLASS = 'Navtarget F-reset No-case Fz-35 Fw-b team-name'
+
+# Elements html.parser never sees closed; BeautifulSoup closes them as soon as they open
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem', 'meta',
+    'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame', 'image', 'isindex',
+    'nextid', 'spacer',
+])
+
+# Text inside these elements is not part of the enclosing element's get_text()
+STRING_CONTAINERS = frozenset(['script', 'style', 'template'])
+
+# Whitespace-only strings inside these elements are kept as they are
+PRESERVE_WHITESPACE = frozenset(['pre', 'textarea'])
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+# Only these elements can be a table, a row or a row field
+MATCHED_ELEMENTS = frozenset(['table', 'tbody', 'tr', 'td', 'a', 'span', 'div'])
+
+
+def safe_float_conversion(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+def clean_team_name(name):
+    cleaned_name = re.sub(r'[^\x00-\x7F]+', '', name)
+    return cleaned_name
+
+def player_id_from_href(href):
+    """Returns the Yahoo player ID at the end of a player link."""
+    return href.rstrip('/').split('/')[-1]
+
+def has_class(classes, target):
+    """Matches a class attribute the way BeautifulSoup's class_= does."""
+    if classes is None:
+        return False
+    if ' ' in target:
+        return ' '.join(classes.split()) == target
+    return target in classes.split()
+
+
+class _Text:
+    """The stripped strings of one element, as get_text(strip=True) joins them."""
+    __slots__ = ['parts']
+
+    def __init__(self):
+        self.parts = []
+
+    def value(self):
+        return ''.join(self.parts)
+
+
+class _Row:
+    """The first match of each field lookup parse_player_data() makes in one <tr>."""
+    __slots__ = ['lineup_pos', 'player_td', 'in_player', 'name', 'href', 'team_position', 'status_td', 'in_status',
+                 'status', 'bye_week', 'points', 'projected_bold', 'projected_shade', 'projected_td']
+
+    def __init__(self):
+        self.lineup_pos = self.name = self.href = self.team_position = self.status = None
+        self.bye_week = self.points = self.projected_bold = self.projected_shade = self.projected_td = None
+        self.player_td = self.in_player = self.status_td = self.in_status = False
+
+    def player(self, team_name):
+        """Builds the player dict exactly as parse_player_data() does, or None if the row is skipped."""
+        player_data = {}
+        if self.lineup_pos is not None:
+            player_data['lineup_pos'] = self.lineup_pos.value()
+        if self.name is not None:
+            player_data['name'] = self.name.value()
+            if self.href:
+                player_data['player_id'] = player_id_from_href(self.href)
+        if self.team_position is not None:
+            team_pos_info_text = self.team_position.value()
+            player_data['team'] = team_pos_info_text.split(' - ')[0]
+            player_data['position'] = team_pos_info_text.split(' - ')[1]
+        if self.status is not None:
+            player_data['status'] = self.status.value()
+        if self.bye_week is not None:
+            player_data['bye_week'] = self.bye_week.value()
+        player_data['fantasy_points'] = safe_float_conversion(self.points.value()) if self.points is not None else 0.0
+        projected = self.projected_bold or self.projected_shade or self.projected_td
+        player_data['projected_fantasy_points'] = safe_float_conversion(projected.value()) if projected is not None else 0.0
+        player_data['points_diff'] = player_data['fantasy_points'] - player_data['projected_fantasy_points']
+        player_data['team_name'] = team_name
+        if all(player_data.get(key) for key in ['name', 'team', 'position', 'bye_week']):
+            return player_data
+        return None
+
+
+class _Table:
+    __slots__ = ['rows', 'has_tbody']
+
+    def __init__(self):
+        self.rows = []
+        self.has_tbody = False
+
+
+class RosterPageParser(HTMLParser):
+    """
+    Single-pass parser for a Yahoo roster page.
+
+    Walks the page once with html.parser's tokenizer, without building a tree,
+    and records only what YahooFantasyAPI.parse_roster_page_soup() looks up: the
+    team name span, the statTable tables and, in each row of their first
+    <tbody>, the first element matching each player field. Elements are nested
+    the way BeautifulSoup's html.parser builder nests them, so the results are
+    identical.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.stack = []              # (tag, closers) for each open element
+        self.open_counts = {}        # tag -> number of open elements with that name
+        self.already_closed = []     # void elements whose redundant end tag is still to come
+        self.pending = []            # data of the current string, while any element text is wanted
+        self.merged = []             # strings since the last element boundary
+        self.texts = []              # _Text of every open row field
+        self.page_texts = []         # _Text of the open team name span
+        self.containers = 0          # open script/style/template elements
+        self.preserving = 0          # open pre/textarea elements
+        self.tables = {}             # statTable ID -> _Table, for the first table with each ID
+        self.open_tables = []        # open statTables still looking for their first <tbody>
+        self.tbodies = []            # rows lists of the open first <tbody> of each statTable
+        self.rows = []               # open rows inside those tbodies
+        self.team_name = None
+
+    def _end_string(self):
+        """
+        Ends the current string, as BeautifulSoup does on every tag event.
+
+        The team name is read from the page as parsed, one stripped string at a time.
+        Row fields are read from each table re-parsed from str(table), where strings
+        that only an unmatched end tag separated are one string again, so they are
+        merged until the next element boundary.
+        """
+        if self.pending:
+            text = ''.join(self.pending)
+            self.pending = []
+            if not self.preserving and not text.strip(ASCII_SPACES):
+                text = '\n' if '\n' in text else ' '
+            if not self.containers:
+                if self.page_texts:
+                    stripped = text.strip()
+                    if stripped:
+                        for element_text in self.page_texts:
+                            element_text.parts.append(stripped)
+                if self.texts:
+                    self.merged.append(text)
+
+    def _element_boundary(self):
+        """Ends the current string at an element, comment or other node that survives str(table)."""
+        self._end_string()
+        if self.merged:
+            text = ''.join(self.merged).strip()
+            self.merged = []
+            if text:
+                for element_text in self.texts:
+                    element_text.parts.append(text)
+
+    def _collect_text(self, closers, texts=None):
+        texts = self.texts if texts is None else texts
+        element_text = _Text()
+        texts.append(element_text)
+        closers.append(lambda: texts.remove(element_text))
+        return element_text
+
+    def _open(self, tag, attrs):
+        closers = None
+        if tag in MATCHED_ELEMENTS:
+            closers = []
+            attributes = dict(attrs)
+            if tag == 'table':
+                self._open_table(attributes.get('id'), closers)
+            elif tag == 'tbody':
+                self._open_tbody(closers)
+            elif tag == 'tr':
+                self._open_row(closers)
+            elif self.rows or (tag == 'span' and self.team_name is None):
+                self._open_field(tag, attributes, closers)
+        if tag in STRING_CONTAINERS:
+            self.containers += 1
+            closers = closers or []
+            closers.append(self._close_container)
+        elif tag in PRESERVE_WHITESPACE:
+            self.preserving += 1
+            closers = closers or []
+            closers.append(self._close_preserving)
+        self.stack.append((tag, closers))
+        self.open_counts[tag] = self.open_counts.get(tag, 0) + 1
+
+    def _close_container(self):
+        self.containers -= 1
+
+    def _close_preserving(self):
+        self.preserving -= 1
+
+    def _open_table(self, table_id, closers):
+        if table_id in STAT_TABLE_IDS and table_id not in self.tables:
+            table = _Table()
+            self.tables[table_id] = table
+            self.open_tables.append(table)
+            closers.append(lambda: self.open_tables.remove(table))
+
+    def _open_tbody(self, closers):
+        for table in self.open_tables:
+            if not table.has_tbody:
+                table.has_tbody = True
+                self.tbodies.append(table.rows)
+                closers.append(lambda rows=table.rows: self.tbodies.remove(rows))
+
+    def _open_row(self, closers):
+        if self.tbodies:
+            row = _Row()
+            for rows in self.tbodies:
+                rows.append(row)
+            self.rows.append(row)
+            closers.append(lambda: self.rows.remove(row))
+
+    def _open_field(self, tag, attributes, closers):
+        classes = attributes.get('class')
+        if classes is None:
+            return
+        element_text = None
+        if tag == 'span' and self.team_name is None and has_class(classes, TEAM_NAME_CLASS):
+            self.team_name = self._collect_text(closers, self.page_texts)
+        for row in self.rows:
+            if tag == 'td':
+                if row.lineup_pos is None and has_class(classes, 'pos'):
+                    row.lineup_pos = element_text = element_text or self._collect_text(closers)
+                if not row.player_td and has_class(classes, 'player'):
+                    row.player_td = row.in_player = True
+                    closers.append(lambda row=row: setattr(row, 'in_player', False))
+                if not row.status_td and has_class(classes, 'player-status'):
+                    row.status_td = row.in_status = True
+                    closers.append(lambda row=row: setattr(row, 'in_status', False))
+                if row.bye_week is None and has_class(classes, 'Alt Ta-end Bdrstart'):
+                    row.bye_week = element_text = element_text or self._collect_text(closers)
+                if row.points is None and has_class(classes, 'Ta-end Nowrap pts Bdrstart'):
+                    row.points = element_text = element_text or self._collect_text(closers)
+                if row.projected_td is None and has_class(classes, 'Alt Ta-end Nowrap'):
+                    row.projected_td = element_text = element_text or self._collect_text(closers)
+            elif tag == 'a':
+                if row.in_player and row.name is None and has_class(classes, 'name'):
+                    row.name = element_text = element_text or self._collect_text(closers)
+                    row.href = attributes.get('href')
+            elif tag == 'span':
+                if row.in_player and row.team_position is None and has_class(classes, 'Fz-xxs'):
+                    row.team_position = element_text = element_text or self._collect_text(closers)
+                if row.in_status and row.status is None and has_class(classes, 'ysf-game-status'):
+                    row.status = element_text = element_text or self._collect_text(closers)
+            elif tag == 'div':
+                if row.projected_bold is None and has_class(classes, 'F-shade Fw-b'):
+                    row.projected_bold = element_text = element_text or self._collect_text(closers)
+                if row.projected_shade is None and has_class(classes, 'F-shade'):
+                    row.projected_shade = element_text = element_text or self._collect_text(closers)
+
+    def _close(self, tag):
+        """Closes the most recent open element named `tag` and everything opened inside it."""
+        if not self.open_counts.get(tag):
+            return
+        while True:
+            name, closers = self.stack.pop()
+            self.open_counts[name] -= 1
+            if closers:
+                for closer in closers:
+                    closer()
+            if name == tag:
+                return
+
+    def handle_starttag(self, tag, attrs):
+        self._element_boundary()
+        if tag in VOID_ELEMENTS:
+            self.already_closed.append(tag)
+        else:
+            self._open(tag, attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        self._element_boundary()
+        self._open(tag, attrs)
+        self._close(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.already_closed:
+            self.already_closed.remove(tag)
+        elif self.open_counts.get(tag):
+            self._element_boundary()
+            self._close(tag)
+        else:
+            self._end_string()
+
+    def handle_data(self, data):
+        if self.texts or self.page_texts:
+            self.pending.append(data)
+
+    def handle_charref(self, name):
+        number = int(name[1:], 16) if name[:1] in ('x', 'X') else int(name)
+        self.handle_data(html.unescape(f'&#{number};') or chr(number))
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f'&{name}')
+
+    def handle_comment(self, data):
+        self._element_boundary()
+
+    def handle_decl(self, decl):
+        self._element_boundary()
+
+    def handle_pi(self, data):
+        self._element_boundary()
+
+    def unknown_decl(self, data):
+        self._element_boundary()
+        if data.upper().startswith('CDATA['):
+            # CDATA sections are strings of their own that get_text() includes
+            text = data[len('CDATA['):]
+            if not self.preserving and not text.strip(ASCII_SPACES):
+                text = '\n' if '\n' in text else ' '
+            text = text.strip()
+            if text:
+                for element_text in self.texts + self.page_texts:
+                    element_text.parts.append(text)
+
+
+def parse_roster_page(page_source, team_id, metrics=None):
+    """
+    Extracts every player from a roster page in one pass.
+
+    Returns the same players, in the same order, as YahooFantasyAPI.parse_roster_page_soup().
+
+    Args:
+        page_source (str): The roster page HTML.
+        team_id: The team ID, used for the team name when the page has none.
+        metrics (ScrapeMetrics): Records the players found in each table, or None.
+
+    Returns:
+        list: Player dicts from statTable0, statTable1 and statTable2, in that order.
+    """
+    parser = RosterPageParser()
+    parser.feed(page_source)
+    parser.close()
+    parser._element_boundary()
+
+    team_name = clean_team_name(parser.team_name.value()) if parser.team_name is not None else f'Team {team_id}'
+    all_players = []
+    for table_id in STAT_TABLE_IDS:
+        table = parser.tables.get(table_id)
+        if table is None:
+            print(f"Table with id '{table_id}' not found.")
+            if metrics is not None:
+                metrics.add_table(table_id, None)
+            continue
+        found = len(all_players)
+        for row in table.rows:
+            player = row.player(team_name)
+            if player is not None:
+                all_players.append(player)
+        if metrics is not None:
+            metrics.add_table(table_id, len(all_players) - found)
+    return all_players
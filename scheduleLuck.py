@@ -0,0 +1,118 @@
+import json
+
+import numpy as np
+
+from calcStandings import calculate_weekly_team_totals, load_data
+
+
+def build_score_and_opponent_matrices(weekly_totals, schedule_data, team_ids):
+    """
+    Builds (weeks x teams) score and opponent-index matrices for the scored weeks.
+
+    Args:
+        weekly_totals (dict): Week -> team ID -> points.
+        schedule_data (dict): Week -> list of {'team1_id', 'team2_id'} matchups.
+        team_ids (list): The team IDs, defining the column order.
+
+    Returns:
+        tuple: (weeks, scores, opponents) where opponents holds the column of each
+        team's opponent, or -1 for a week without a matchup.
+    """
+    index = {team_id: column for column, team_id in enumerate(team_ids)}
+    weeks = [week for week in sorted(weekly_totals, key=int) if week in schedule_data]
+    scores = np.zeros((len(weeks), len(team_ids)))
+    opponents = np.full((len(weeks), len(team_ids)), -1)
+    for row, week in enumerate(weeks):
+        for team_id, total in weekly_totals[week].items():
+            if team_id in index:
+                scores[row, index[team_id]] = total
+        for matchup in schedule_data[week]:
+            team1, team2 = index[matchup['team1_id']], index[matchup['team2_id']]
+            opponents[row, team1] = team2
+            opponents[row, team2] = team1
+    return weeks, scores, opponents
+
+
+def calculate_schedule_luck(scores, opponents):
+    """
+    Calculates every team's weekly results as if it had played every other team's schedule.
+
+    Team i playing team j's schedule meets j's opponent each week, and meets j
+    itself in the weeks where j's opponent was i. The diagonal is each team's
+    actual record. All T x T schedules are evaluated at once with broadcasting
+    instead of replaying the standings T^2 times.
+
+    Args:
+        scores (np.ndarray): (weeks x teams) points scored.
+        opponents (np.ndarray): (weeks x teams) opponent columns, -1 for no matchup.
+
+    Returns:
+        tuple: (wins, losses, ties) arrays of shape (weeks x teams x teams); entry
+        [w, i, j] is team i's result in week w on team j's schedule.
+    """
+    weeks, teams = scores.shape
+    has_game = opponents >= 0
+    safe_opponents = np.where(has_game, opponents, 0)
+    opponent_scores = np.take_along_axis(scores, safe_opponents, axis=1)  # [w, j]
+
+    team = np.arange(teams)
+    meets_owner = opponents[:, None, :] == team[None, :, None]  # [w, i, j]: j's opponent is i
+    against = np.where(meets_owner, scores[:, None, :], opponent_scores[:, None, :])
+    mine = scores[:, :, None]
+    played = np.broadcast_to(has_game[:, None, :], against.shape)
+
+    wins = (played & (mine > against)).astype(int)
+    losses = (played & (mine < against)).astype(int)
+    ties = (played & (mine == against)).astype(int)
+    return wins, losses, ties
+
+
+def compute_schedule_luck(fantasy_data, schedule_data):
+    """
+    Computes the schedule-luck matrices after every scored week.
+
+    Args:
+        fantasy_data (dict): The league data keyed by week.
+        schedule_data (dict): The schedule keyed by week.
+
+    Returns:
+        dict: Team names, the weeks, and per week the cumulative W/L/T matrices
+        (as lists) where [i][j] is team i's record on team j's schedule.
+    """
+    weekly_totals, team_names = calculate_weekly_team_totals(fantasy_data)
+    team_ids = list(team_names)
+    weeks, scores, opponents = build_score_and_opponent_matrices(weekly_totals, schedule_data, team_ids)
+    wins, losses, ties = calculate_schedule_luck(scores, opponents)
+
+    # Running totals give the matrix as of every week
+    cumulative = [np.cumsum(matrix, axis=0) for matrix in (wins, losses, ties)]
+    by_week = {
+        week: {
+            'wins': cumulative[0][row].tolist(),
+            'losses': cumulative[1][row].tolist(),
+            'ties': cumulative[2][row].tolist(),
+        }
+        for row, week in enumerate(weeks)
+    }
+    return {
+        'team_ids': team_ids,
+        'team_names': [team_names[team_id] for team_id in team_ids],
+        'weeks': weeks,
+        'by_week': by_week,
+    }
+
+
+def save_schedule_luck_to_json(schedule_luck, output_file):
+    """Save the schedule-luck matrices to a JSON file."""
+    with open(output_file, 'w') as file:
+        json.dump(schedule_luck, file)
+
+
+def main():
+    fantasy_data = load_data('league_data_by_week.json')
+    schedule_data = load_data('league_schedule_weeks_1_to_14.json')
+
+    save_schedule_luck_to_json(compute_schedule_luck(fantasy_data, schedule_data), 'schedule_luck.json')
+
+if __name__ == "__main__":
+    main()
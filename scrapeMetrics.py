@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from atomicFiles import atomic_write
+
+REPORT_ROOT = 'scrape_reports'
+
+# Phases of a page scrape; 'sleep' covers fixed delays, rate-limit waits and session settling
+PHASES = ['navigate', 'wait', 'fetch_source', 'render', 'parse', 'sleep']
+
+# Upper bucket bounds of the timing histograms, in milliseconds
+TIME_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000]
+
+# Upper bucket bounds of the page size histograms, in bytes
+SIZE_BUCKETS = [1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+
+SLOWEST_PAGES = 20
+
+
+class Histogram:
+    """Fixed-bucket histogram that also keeps its samples for exact percentiles."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.samples = []
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.samples.append(value)
+
+    def percentile(self, fraction):
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self):
+        if not self.samples:
+            return {'count': 0}
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            'count': len(self.samples),
+            'total': round(sum(self.samples), 3),
+            'mean': round(sum(self.samples) / len(self.samples), 3),
+            'p50': round(self.percentile(0.5), 3),
+            'p95': round(self.percentile(0.95), 3),
+            'max': round(max(self.samples), 3),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class ScrapeMetrics:
+    """
+    Collects per-phase timings, page sizes and parse counts from the scrapers.
+
+    A scraper wraps each page in page(), and the phases inside it (navigate,
+    wait, fetch_source, render, parse, sleep) in phase(). Timings are kept per
+    page, for spotting slow pages, and aggregated into histograms per page type
+    and phase. Parsers report the rows found in each table, or that the table
+    was missing. Safe to share between threads; each thread tracks its own
+    current page.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started = time.time()
+        self.phases = {}   # (page type, phase) -> Histogram of milliseconds
+        self.sizes = {}    # page type -> Histogram of bytes
+        self.tables = {}   # table ID -> {'pages', 'rows', 'missing'}
+        self.pages = []    # one record per page
+
+    def _current(self):
+        return getattr(self.local, 'page', None)
+
+    @contextmanager
+    def page(self, page_type, label):
+        """
+        Attributes the phases, bytes and rows recorded inside the block to one page.
+
+        Args:
+            page_type (str): 'roster', 'matchups' or 'draft'.
+            label (str): Identifies the page in the report, e.g. its URL.
+        """
+        record = {'type': page_type, 'page': label, 'ms': {}, 'bytes': None, 'rows': 0, 'error': None}
+        outer = self._current()
+        self.local.page = record
+        start = self.clock()
+        try:
+            yield record
+        except Exception as e:
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record['total_ms'] = round((self.clock() - start) * 1000, 3)
+            self.local.page = outer
+            with self.lock:
+                self.pages.append(record)
+
+    @contextmanager
+    def phase(self, name):
+        """Times one phase of the current page (or of no page, e.g. session setup)."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.add_time(name, (self.clock() - start) * 1000)
+
+    def add_time(self, name, ms):
+        record = self._current()
+        page_type = record['type'] if record is not None else 'session'
+        if record is not None:
+            record['ms'][name] = round(record['ms'].get(name, 0.0) + ms, 3)
+        with self.lock:
+            self.phases.setdefault((page_type, name), Histogram(TIME_BUCKETS_MS)).add(ms)
+
+    def add_bytes(self, size):
+        """Records the size of the current page's source."""
+        record = self._current()
+        page_type = record['type'] if record is not None else 'session'
+        if record is not None:
+            record['bytes'] = size
+        with self.lock:
+            self.sizes.setdefault(page_type, Histogram(SIZE_BUCKETS)).add(size)
+
+    def add_table(self, table_id, rows):
+        """Records the rows parsed from a table, or None if the page did not have it."""
+        record = self._current()
+        if record is not None and rows:
+            record['rows'] += rows
+        with self.lock:
+            table = self.tables.setdefault(table_id, {'pages': 0, 'rows': 0, 'missing': 0})
+            if rows is None:
+                table['missing'] += 1
+            else:
+                table['pages'] += 1
+                table['rows'] += rows
+
+    def report(self):
+        """Returns the run's report as a JSON-serializable dict."""
+        with self.lock:
+            pages = list(self.pages)
+            phases = {}
+            for (page_type, name), histogram in sorted(self.phases.items()):
+                phases.setdefault(page_type, {})[name] = histogram.to_dict()
+            sizes = {page_type: histogram.to_dict() for page_type, histogram in sorted(self.sizes.items())}
+            tables = {table_id: dict(table) for table_id, table in sorted(self.tables.items())}
+        failures = {}
+        for record in pages:
+            if record['error']:
+                failures[record['type']] = failures.get(record['type'], 0) + 1
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'elapsed_s': round(time.time() - self.started, 3),
+            'pages': len(pages),
+            'phases_ms': phases,
+            'bytes': sizes,
+            'tables': tables,
+            'page_failures': failures,
+            'sleep_s': round(sum(type_phases['sleep']['total'] for type_phases in phases.values()
+                                 if 'sleep' in type_phases) / 1000, 3),
+            'slowest_pages': sorted(pages, key=lambda record: record['total_ms'], reverse=True)[:SLOWEST_PAGES],
+            'page_records': pages,
+        }
+
+    def write_report(self, path=None):
+        """
+        Writes the report as JSON.
+
+        Args:
+            path (str): The report file, or None for scrape_reports/scrape_<timestamp>.json.
+
+        Returns:
+            str: The path of the written report.
+        """
+        if path is None:
+            os.makedirs(REPORT_ROOT, exist_ok=True)
+            path = os.path.join(REPORT_ROOT, f"scrape_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        atomic_write(path, json.dumps(self.report(), indent=4))
+        return path
+
+
+_default_metrics = None
+_default_lock = threading.Lock()
+
+
+def default_metrics():
+    """Returns the process-wide collector the scrapers record into."""
+    global _default_metrics
+    with _default_lock:
+        if _default_metrics is None:
+            _default_metrics = ScrapeMetrics()
+        return _default_metrics
+
+
+def compare(baseline_file, current_file):
+    """Prints the mean and p95 of each page type and phase, and the time slept, for two reports."""
+    with open(baseline_file, 'r') as file:
+        baseline = json.load(file)
+    with open(current_file, 'r') as file:
+        current = json.load(file)
+
+    print(f"{'page type / phase':<24} {'count':>6} {'base mean':>10} {'cur mean':>10} {'base p95':>10} {'cur p95':>10}")
+    for page_type, phases in current['phases_ms'].items():
+        for name, stats in phases.items():
+            before = baseline['phases_ms'].get(page_type, {}).get(name, {'count': 0})
+            if not stats['count'] or not before['count']:
+                continue
+            print(f"{page_type + ' / ' + name:<24} {stats['count']:6d} {before['mean']:10.1f} {stats['mean']:10.1f} "
+                  f"{before['p95']:10.1f} {stats['p95']:10.1f}")
+    print(f"Slept {baseline['sleep_s']:.1f}s of {baseline['elapsed_s']:.1f}s before, "
+          f"{current['sleep_s']:.1f}s of {current['elapsed_s']:.1f}s now.")
+
+
+def show(report_file, limit=10):
+    """Prints a report's slowest pages and its table failures."""
+    with open(report_file, 'r') as file:
+        report = json.load(file)
+    print(f"{report['pages']} pages in {report['elapsed_s']:.1f}s, {report['sleep_s']:.1f}s asleep")
+    for record in report['slowest_pages'][:limit]:
+        phases = ', '.join(f"{name} {ms:.0f}" for name, ms in record['ms'].items())
+        print(f"{record['total_ms']:10.0f} ms  {record['page']}  ({phases})")
+    for table_id, table in report['tables'].items():
+        print(f"{table_id}: {table['rows']} rows on {table['pages']} pages, missing on {table['missing']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and compare scrape timing reports.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    show_parser = subparsers.add_parser('show', help="Print a report's slowest pages and table failures.")
+    show_parser.add_argument('report')
+    show_parser.add_argument('--limit', type=int, default=10)
+    compare_parser = subparsers.add_parser('compare', help='Compare phase timings between two reports.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        show(args.report, args.limit)
+    else:
+        compare(args.baseline, args.current)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from httpFetch import BACKENDS
+from pageCache import PAGE_CACHE_ROOT, PageCache
+from scrapeMetrics import default_metrics
+from segmentStore import SEGMENT_ROOT
+from yahoo_data import (COOKIE_FILE, REQUEST_BURST, REQUEST_RATE, YAHOO_BASE_URL, TokenBucket,
+                        YahooFantasyAPI, save_league_data_segment)
+
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 2.0
+POOL_SIZE = 4
+
+
+class ScraperPool:
+    """
+    Runs several authenticated browser sessions in parallel to scrape a week's rosters.
+
+    All sessions draw from one TokenBucket, so the pool as a whole keeps to the
+    configured request rate however many sessions it runs. By default that rate is
+    the serial scraper's pace (REQUEST_RATE) per session, so a pool of n sessions
+    loads pages n times as fast; pass a lower rate to spread them out further. Each team is fetched
+    by whichever session is free; a failed fetch is retried with exponential
+    backoff on that session. The result has the same shape and team order as
+    YahooFantasyAPI.get_league_data_by_week().
+    """
+
+    def __init__(self, size=POOL_SIZE, rate=None, burst=REQUEST_BURST, base_url=YAHOO_BASE_URL,
+                 cookie_file=COOKIE_FILE, max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS,
+                 session_factory=None, sleep=time.sleep, backend='selenium', page_cache=None):
+        """
+        Opens the sessions.
+
+        Args:
+            size (int): The number of browser sessions.
+            rate (float): Roster page loads per second across the whole pool; defaults to
+                REQUEST_RATE per session.
+            burst (int): Page loads allowed back to back before the rate applies.
+            base_url (str): The site to scrape, e.g. a local server replaying saved roster pages.
+            cookie_file (str): Pickled Yahoo cookies, or None to skip authentication.
+            max_retries (int): Retries per team after the first failed fetch.
+            backoff (float): Seconds to wait before the first retry; doubled for each further retry.
+            session_factory (callable): Called with the shared rate limiter to open one session;
+                defaults to a YahooFantasyAPI on a warm session from the shared session manager.
+            sleep (callable): Used for backoff waits.
+            backend (str): The fetch backend of the default sessions, 'selenium' or 'http' (see httpFetch).
+            page_cache (PageCache): Raw page cache shared by the default sessions, or None to always fetch.
+        """
+        if size < 1:
+            raise ValueError("The pool needs at least one session.")
+        self.rate_limiter = TokenBucket(rate or REQUEST_RATE * size, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        if session_factory is None:
+            def session_factory(rate_limiter):
+                return YahooFantasyAPI(base_url, cookie_file, rate_limiter, backend=backend, page_cache=page_cache)
+        self.sessions = [session_factory(self.rate_limiter) for _ in range(size)]
+        self.idle = queue.Queue()
+        for session in self.sessions:
+            self.idle.put(session)
+
+    def fetch_roster(self, league_id, team_id, week_num):
+        """Fetches one team's roster on a free session, retrying with backoff on errors."""
+        session = self.idle.get()
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return session.get_team_roster_by_week(league_id, team_id, week_num)
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = self.backoff * 2 ** attempt
+                    print(f"Fetching team {team_id} week {week_num} failed ({e}); retrying in {delay:.1f}s.")
+                    self.sleep(delay)
+        finally:
+            self.idle.put(session)
+
+    def get_league_data_by_week(self, league_id, week_num, team_count=12):
+        """
+        Scrapes every team's roster for one week in parallel.
+
+        Returns:
+            dict: team ID -> players, in team ID order, as the serial scraper returns it.
+        """
+        team_ids = list(range(1, team_count + 1))
+        with ThreadPoolExecutor(max_workers=len(self.sessions)) as executor:
+            rosters = list(executor.map(lambda team_id: self.fetch_roster(league_id, team_id, week_num), team_ids))
+        return dict(zip(team_ids, rosters))
+
+    def close(self):
+        for session in self.sessions:
+            session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape weekly league rosters with a pool of browser sessions.')
+    parser.add_argument('league_id', help='The Yahoo league ID.')
+    parser.add_argument('--start-week', type=int, default=1)
+    parser.add_argument('--end-week', type=int, default=1)
+    parser.add_argument('--teams', type=int, default=12, help='Number of teams in the league.')
+    parser.add_argument('--sessions', type=int, default=POOL_SIZE, help='Number of parallel browser sessions.')
+    parser.add_argument('--rate', type=float,
+                        help=f'Page loads per second across all sessions (default {REQUEST_RATE} per session, '
+                             f'the serial scraper\'s pace in each).')
+    parser.add_argument('--burst', type=int, default=REQUEST_BURST, help='Page loads allowed back to back.')
+    parser.add_argument('--retries', type=int, default=MAX_RETRIES, help='Retries per team after a failed fetch.')
+    parser.add_argument('--base-url', default=YAHOO_BASE_URL, help='Site to scrape, e.g. a local fixture server.')
+    parser.add_argument('--cookie-file', default=COOKIE_FILE, help='Pickled Yahoo cookies.')
+    parser.add_argument('--backend', choices=BACKENDS, default='selenium',
+                        help='Fetch pages with Chrome, or over HTTP with Chrome only as a fallback.')
+    parser.add_argument('--page-cache', nargs='?', const=PAGE_CACHE_ROOT,
+                        help=f'Cache raw pages in this directory (default {PAGE_CACHE_ROOT} when given without one).')
+    parser.add_argument('--root', default=SEGMENT_ROOT, help='Segment store root directory.')
+    args = parser.parse_args()
+
+    page_cache = PageCache(args.page_cache) if args.page_cache else None
+    pool = ScraperPool(args.sessions, args.rate, args.burst, args.base_url, args.cookie_file, args.retries,
+                       backend=args.backend, page_cache=page_cache)
+    try:
+        for week_num in range(args.start_week, args.end_week + 1):
+            league_data = pool.get_league_data_by_week(args.league_id, week_num, args.teams)
+            path = save_league_data_segment(league_data, week_num, args.league_id, args.root)
+            print(f"League data for week {week_num} saved to {path}")
+    finally:
+        pool.close()
+        print(f"Scrape timings saved to {default_metrics().write_report()}")
+
+
+if __name__ == "__main__":
+    main()
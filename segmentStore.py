@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import sys
+import time
+
+from atomicFiles import atomic_write, manifest_lock
+from leagueStream import iter_weeks
+
+SEGMENT_ROOT = 'league_data'
+MANIFEST_FILE = 'manifest.json'
+
+# The league the scrape scripts save; the app and analysis scripts read it from its segments
+DEFAULT_LEAGUE_ID = '22030'
+
+# The single-file format the segments replaced; still read for a league with no segments
+LEAGUE_DATA_FILE = 'league_data_by_week.json'
+
+
+def league_dir(root, league_id):
+    """Returns the directory holding a league's week segments."""
+    return os.path.join(root, str(league_id))
+
+
+def segment_name(week_num):
+    """Returns the file name of a week segment."""
+    return f"week_{week_num}.json"
+
+
+def manifest_path(root, league_id):
+    """Returns the path of a league's manifest."""
+    return os.path.join(league_dir(root, league_id), MANIFEST_FILE)
+
+
+def read_manifest(root, league_id):
+    """
+    Reads a league's manifest.
+
+    Args:
+        root (str): The segment store root directory.
+        league_id (str): The league ID.
+
+    Returns:
+        dict: The manifest; empty ('weeks': {}) if the league has no segments yet.
+    """
+    try:
+        with open(manifest_path(root, league_id), 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {'league_id': str(league_id), 'weeks': {}}
+
+
+def append_week(league_data, week_num, league_id, root=SEGMENT_ROOT):
+    """
+    Saves one week of league data as its own segment and records it in the manifest.
+
+    Only this week's segment and the small manifest are written. The manifest is
+    updated under a file lock so concurrent scraper runs saving different weeks
+    do not drop each other's entries.
+
+    Args:
+        league_data (dict): The team -> players data for the week.
+        week_num (int): The week number.
+        league_id (str): The league ID.
+        root (str): The segment store root directory.
+
+    Returns:
+        str: The path of the written segment.
+    """
+    directory = league_dir(root, league_id)
+    os.makedirs(directory, exist_ok=True)
+
+    text = json.dumps(league_data, separators=(',', ':'))
+    path = os.path.join(directory, segment_name(week_num))
+    atomic_write(path, text)
+
+    entry = {
+        'file': segment_name(week_num),
+        'sha1': hashlib.sha1(text.encode('utf-8')).hexdigest(),
+        'teams': len(league_data),
+        'saved_at': time.time(),
+    }
+    with manifest_lock(directory):
+        manifest = read_manifest(root, league_id)
+        manifest['weeks'][str(week_num)] = entry
+        manifest['weeks'] = dict(sorted(manifest['weeks'].items(), key=lambda item: int(item[0])))
+        atomic_write(manifest_path(root, league_id), json.dumps(manifest, indent=4))
+
+    return path
+
+
+def load_week(week_num, league_id, root=SEGMENT_ROOT):
+    """
+    Loads a single week segment.
+
+    Args:
+        week_num (int): The week number.
+        league_id (str): The league ID.
+        root (str): The segment store root directory.
+
+    Returns:
+        dict: The team -> players data for the week.
+    """
+    manifest = read_manifest(root, league_id)
+    entry = manifest['weeks'].get(str(week_num))
+    if entry is None:
+        raise KeyError(f"No segment for week {week_num} in league {league_id}.")
+    with open(os.path.join(league_dir(root, league_id), entry['file']), 'r') as file:
+        return json.load(file)
+
+
+def load_weeks(league_id, weeks=None, root=SEGMENT_ROOT):
+    """
+    Loads week segments in the league_data_by_week.json shape.
+
+    Args:
+        league_id (str): The league ID.
+        weeks (list): The week numbers to load, or None for every saved week.
+        root (str): The segment store root directory.
+
+    Returns:
+        dict: The league data keyed by week (as strings), in week order.
+    """
+    if weeks is None:
+        return dict(iter_week_segments(league_id, root))
+    return {week: load_week(week, league_id, root) for week in sorted((str(week) for week in weeks), key=int)}
+
+
+def iter_week_segments(league_id, root=SEGMENT_ROOT):
+    """
+    Yields a league's saved weeks one segment at a time, in week order.
+
+    Args:
+        league_id (str): The league ID.
+        root (str): The segment store root directory.
+
+    Yields:
+        tuple: (week, {team_id: players}) pairs, as leagueStream.iter_weeks() yields them.
+    """
+    directory = league_dir(root, league_id)
+    weeks = read_manifest(root, league_id)['weeks']
+    for week in sorted(weeks, key=int):
+        with open(os.path.join(directory, weeks[week]['file']), 'r') as file:
+            yield week, json.load(file)
+
+
+def has_segments(league_id, root=SEGMENT_ROOT):
+    """Returns True if any week of the league has been saved as a segment."""
+    return bool(read_manifest(root, league_id)['weeks'])
+
+
+def load_league(league_id=DEFAULT_LEAGUE_ID, root=SEGMENT_ROOT, data_file=LEAGUE_DATA_FILE):
+    """
+    Loads a league's data from its segments, or from data_file if it has none.
+
+    Args:
+        league_id (str): The league ID.
+        root (str): The segment store root directory.
+        data_file (str): The combined league_data_by_week.json file read for a league with no segments.
+
+    Returns:
+        dict: The league data keyed by week.
+    """
+    if has_segments(league_id, root):
+        return load_weeks(league_id, root=root)
+    with open(data_file, 'r') as file:
+        return json.load(file)
+
+
+def iter_league_weeks(league_id=DEFAULT_LEAGUE_ID, root=SEGMENT_ROOT, data_file=LEAGUE_DATA_FILE):
+    """
+    Yields a league's weeks one at a time from its segments, or streamed from data_file if it has none.
+
+    Returns:
+        iterator: (week, {team_id: players}) pairs in file order.
+    """
+    if has_segments(league_id, root):
+        return iter_week_segments(league_id, root)
+    return iter_weeks(data_file)
+
+
+def export_json(league_id, filename, root=SEGMENT_ROOT):
+    """
+    Materializes every segment of a league into a single league_data_by_week.json file.
+
+    Nothing reads the file back once the league has segments; it is written on
+    demand, for tools outside this repository.
+
+    Args:
+        league_id (str): The league ID.
+        filename (str): The output JSON file.
+        root (str): The segment store root directory.
+    """
+    atomic_write(os.path.abspath(filename), json.dumps(load_weeks(league_id, root=root), indent=4))
+
+
+def import_json(filename, league_id, root=SEGMENT_ROOT):
+    """
+    Splits an existing league_data_by_week.json file into week segments.
+
+    Args:
+        filename (str): The JSON file to import.
+        league_id (str): The league ID.
+        root (str): The segment store root directory.
+    """
+    with open(filename, 'r') as file:
+        data = json.load(file)
+    for week_num, league_data in data.items():
+        append_week(league_data, week_num, league_id, root)
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in ('import', 'export'):
+        print("Usage: python segmentStore.py import|export <league_id> <json_file> [root]")
+        return
+    command, league_id, filename = sys.argv[1:4]
+    root = sys.argv[4] if len(sys.argv) > 4 else SEGMENT_ROOT
+    if command == 'import':
+        import_json(filename, league_id, root)
+        print(f"Imported {filename} into {league_dir(root, league_id)}")
+    else:
+        export_json(league_id, filename, root)
+        print(f"Exported {league_dir(root, league_id)} to {filename}")
+
+if __name__ == "__main__":
+    main()
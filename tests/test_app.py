@@ -0,0 +1,18 @@
+import pytest
+
+import app as flask_app
+from app import parse_weeks
+
+
+def test_parse_weeks_expands_ranges():
+    assert parse_weeks({'weeks': '3-5,1'}, ['1', '2', '3', '4', '5']) == ('1', '3', '4', '5')
+
+
+def test_parse_weeks_rejects_a_range_longer_than_the_season():
+    with pytest.raises(ValueError):
+        parse_weeks({'weeks': '1-100000000'}, ['1', '2'])
+
+
+@pytest.mark.parametrize('path', ['/api/analysis?weeks=1-100000000', '/api/standings?weeks=1-100000000'])
+def test_huge_week_range_is_a_bad_request(path):
+    assert flask_app.app.test_client().get(path).status_code == 400
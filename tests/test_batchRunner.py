@@ -0,0 +1,36 @@
+import json
+import os
+
+import batchRunner
+
+
+def fake_run_league(league, output_dir):
+    """Stands in for run_league(); the 'crash' league kills its worker process."""
+    if league['league_id'] == 'crash':
+        os._exit(1)
+    return {'league_id': league['league_id'], 'status': 'ok', 'timings': {}, 'seconds': 0.0, 'error': None}
+
+
+def test_bad_manifest_entries_fail_alone(tmp_path):
+    manifest = tmp_path / 'leagues.json'
+    manifest.write_text(json.dumps({'leagues': [
+        {'league_id': 1, 'data_file': 'a.json', 'schedule_file': 'b.json'},
+        {'league_id': 2, 'data_file': 'a.json'},
+        {'data_file': 'a.json', 'schedule_file': 'b.json'},
+    ]}))
+    leagues = batchRunner.discover_leagues(str(manifest))
+    assert [league['league_id'] for league in leagues] == ['1', '2', 'entry-2']
+    assert 'error' not in leagues[0]
+    assert 'schedule_file' in leagues[1]['error'] and 'league_id' in leagues[2]['error']
+
+
+def test_crashing_league_is_isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(batchRunner, 'run_league', fake_run_league)
+    leagues = [{'league_id': league_id} for league_id in ['a', 'b', 'crash', 'c', 'd']]
+    leagues.append({'league_id': 'bad', 'error': 'Manifest entry is missing data_file.'})
+
+    summary = batchRunner.run_batch(leagues, str(tmp_path), workers=2)
+    statuses = {result['league_id']: (result['status'], result['error'] and result['error']['stage'])
+                for result in summary['results']}
+    assert statuses == {'a': ('ok', None), 'b': ('ok', None), 'c': ('ok', None), 'd': ('ok', None),
+                        'crash': ('failed', 'worker'), 'bad': ('failed', 'manifest')}
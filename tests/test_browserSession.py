@@ -0,0 +1,83 @@
+import pytest
+import requests
+
+import browserSession
+from browserSession import SessionManager
+from httpFetch import HttpDriver
+
+
+class FakeDriver:
+    def __init__(self):
+        self.crashed = False
+        self.quit_calls = 0
+
+    @property
+    def current_url(self):
+        if self.crashed:
+            raise ConnectionError('chrome not reachable')
+        return 'http://127.0.0.1/'
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_crashed_warm_session_is_not_reused(monkeypatch):
+    monkeypatch.setattr(browserSession, 'start_driver', lambda backend, start_browser: FakeDriver())
+    manager = SessionManager()
+    first = manager.acquire('http', 'http://127.0.0.1', None)
+    manager.release(first)
+    assert manager.acquire('http', 'http://127.0.0.1', None) is first
+    manager.release(first)
+
+    first.crashed = True
+    second = manager.acquire('http', 'http://127.0.0.1', None)
+    assert second is not first and first.quit_calls == 1
+
+
+def test_releasing_a_foreign_driver_closes_it():
+    manager = SessionManager()
+    driver = FakeDriver()
+    manager.release(driver)
+    assert driver.quit_calls == 1 and manager.idle == {}
+
+
+class FakeSession:
+    def __init__(self):
+        self.down = False
+
+    def get(self, url, timeout=None):
+        if self.down:
+            raise requests.ConnectionError('connection refused')
+        return FakeResponse(url)
+
+    def close(self):
+        pass
+
+
+class FakeResponse:
+    def __init__(self, url):
+        self.url = url
+        self.text = '<html></html>'
+
+    def raise_for_status(self):
+        pass
+
+
+def test_failed_http_session_is_not_reused(monkeypatch):
+    monkeypatch.setattr(browserSession, 'start_driver',
+                        lambda backend, start_browser: HttpDriver(session=FakeSession()))
+    manager = SessionManager()
+    first = manager.acquire('http', 'http://127.0.0.1', None)
+    first.get('http://127.0.0.1/page')
+    manager.release(first)
+    assert manager.acquire('http', 'http://127.0.0.1', None) is first
+
+    first.session.down = True
+    with pytest.raises(requests.ConnectionError):
+        first.get('http://127.0.0.1/page')
+    assert not first.alive()
+    manager.release(first)
+    assert manager.acquire('http', 'http://127.0.0.1', None) is not first
@@ -0,0 +1,31 @@
+import asyncio
+
+from crawlOrchestrator import CrawlJob, CrawlOrchestrator
+
+
+class FakeOrchestrator(CrawlOrchestrator):
+    """Serves canned results per job key instead of scraping."""
+
+    def __init__(self, pages, root):
+        super().__init__('1', 'http://127.0.0.1', None, 'http', rate=1000, burst=100, max_retries=2, backoff=0,
+                         root=root, session_manager=object())
+        self.pages = pages
+
+    def _new_scraper(self, kind):
+        return None
+
+    def _fetch(self, scraper, job):
+        return self.pages[job.key].pop(0)
+
+
+def test_empty_pages_are_retried_not_checkpointed(tmp_path):
+    roster = CrawlJob('roster', 1, 1)
+    draft = CrawlJob('draft')
+    pages = {roster.key: [[], [{'name': 'Player 1'}]], draft.key: [[], [], []]}
+
+    results, failed = asyncio.run(FakeOrchestrator(pages, str(tmp_path)).run([roster, draft]))
+    assert results[roster.key] == [{'name': 'Player 1'}]
+    assert failed == [draft]
+
+    checkpointed = FakeOrchestrator({}, str(tmp_path)).checkpoint.load()
+    assert checkpointed == {roster.key: [{'name': 'Player 1'}]}
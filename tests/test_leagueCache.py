@@ -0,0 +1,40 @@
+import json
+import os
+
+from leagueCache import get_analysis, snapshot_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_analysis_uses_the_snapshot_held_by_the_request(tmp_path):
+    with open(os.path.join(ROOT, 'league_data_by_week.json')) as file:
+        league_data = json.load(file)
+    data_file = tmp_path / 'league.json'
+    data_file.write_text(json.dumps(league_data))
+    week = next(iter(league_data))
+
+    snapshot = snapshot_cache.get(str(data_file))
+    # The file is replaced (here: removed) between the route's lookup and the analysis
+    os.remove(data_file)
+    assert get_analysis(str(data_file), (week,), str(tmp_path), snapshot=snapshot) is not None
+    assert get_analysis(str(data_file), (week,), str(tmp_path)) is None
+
+
+def test_artifact_is_served_only_while_fresh(tmp_path):
+    from buildArtifacts import build_all
+    from leagueCache import get_artifact
+
+    with open(os.path.join(ROOT, 'league_data_by_week.json')) as file:
+        league_data = json.load(file)
+    data_file = tmp_path / 'league.json'
+    data_file.write_text(json.dumps(league_data))
+    week = next(iter(league_data))
+    artifact_dir = tmp_path / 'artifacts'
+    build_all(league_data, str(artifact_dir))
+    assert get_artifact(str(data_file), (week,), str(artifact_dir)) is not None
+
+    artifact_file = artifact_dir / f'week_{week}.json'
+    artifact = json.loads(artifact_file.read_text())
+    artifact['source_digest'] = 'stale'
+    artifact_file.write_text(json.dumps(artifact))
+    assert get_artifact(str(data_file), (week,), str(artifact_dir)) is None
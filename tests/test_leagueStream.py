@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from leagueStream import iter_player_records, iter_weeks
+
+# Strings holding brackets and escapes, numbers split across chunks, and a repeated week key
+TRICKY_FILE = '''{"1": {"1": [{"name": "a]b{", "fantasy_points": 12345678901, "status": null},
+                      {"name": "q\\"[", "fantasy_points": -3e-2}],
+              "2": [{"name": "\\u00e9}}", "fantasy_points": 2.5, "extra": [[], {}, [1, [2]]]}]},
+ "2": {"1": []},
+ "1" : {"1": [{"name": "last", "fantasy_points": 1}]}}'''
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 65536])
+def test_streams_match_json_load(tmp_path, chunk_size):
+    path = tmp_path / 'league.json'
+    path.write_text(TRICKY_FILE)
+    expected = json.loads(TRICKY_FILE)
+
+    assert dict(iter_weeks(str(path), chunk_size)) == expected
+    records = list(iter_player_records(str(path), chunk_size))
+    assert [record.name for record in records] == ['last']
@@ -0,0 +1,41 @@
+import os
+import time
+
+from pageCache import PageCache
+
+
+def page(number, size=1000):
+    return f"<html>{number}</html>".ljust(size)
+
+
+def test_total_bytes_follows_puts_and_evictions(tmp_path):
+    cache = PageCache(str(tmp_path), max_bytes=None)
+    cache.put('1', 'roster', 1, 1, page(1))
+    cache.put('1', 'roster', 2, 1, page(1))
+    cache.put('1', 'roster', 1, 2, page(2))
+    cache.put('1', 'roster', 1, 2, page(3))
+    assert cache.total_bytes() == 2000
+    cache.prune(1000)
+    assert cache.total_bytes() == 1000
+    assert cache.total_bytes() == PageCache(str(tmp_path), max_bytes=None).total_bytes()
+
+
+def test_prune_keeps_pages_another_cache_has_not_flushed(tmp_path):
+    pruning = PageCache(str(tmp_path), max_bytes=2500)
+    other = PageCache(str(tmp_path), max_bytes=None)
+    other.put('2', 'roster', 1, 1, page('other'))
+
+    orphan = os.path.join(str(tmp_path), 'objects', 'ab', 'ab' + '0' * 62 + '.html')
+    os.makedirs(os.path.dirname(orphan))
+    with open(orphan, 'w') as file:
+        file.write(page('orphan'))
+    old = time.time() - 2 * 24 * 60 * 60
+    os.utime(orphan, (old, old))
+
+    for number in range(4):
+        pruning.put('1', 'roster', number, 1, page(number))
+    assert pruning.total_bytes() <= 2500
+    assert not os.path.exists(orphan)
+    assert other.get('2', 'roster', 1, 1) == page('other')
+    other.flush()
+    assert list(other.rederive(lambda source, *key: source, '2')) == [('2', 'roster', '1', '1', page('other'))]
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from playerIndex import IdentityIndex, normalize_name
+from rosterParser import clean_team_name
+
+
+@pytest.mark.parametrize('name', ['Café Crushers', 'Señor Sacks', 'Über Team', 'Obi-Jan Kenobi'])
+def test_draft_team_name_matches_scraped_name(tmp_path, name):
+    index = IdentityIndex(str(tmp_path / 'index.json'))
+    scraped = index.team_uid('1', '3', clean_team_name(name))
+    assert index.team_uid('1', name=name) == scraped
+    assert len(index.teams) == 1
+
+
+def test_normalize_name_matches_clean_team_name():
+    assert normalize_name('Café Crushers') == normalize_name(clean_team_name('Café Crushers')) == 'cafcrushers'
+
+
+def test_ids_survive_reload(tmp_path):
+    path = str(tmp_path / 'index.json')
+    index = IdentityIndex(path)
+    player = index.player_uid('Player 1', 'QB', '10001')
+    team = index.team_uid('1', '3', 'Señor Sacks')
+    index.save()
+
+    reloaded = IdentityIndex(path)
+    assert reloaded.player_uid('Player 1', 'QB') == player
+    assert reloaded.team_uid('1', name='Señor Sacks') == team
+
+
+def test_write_outputs_stores_uids(tmp_path):
+    from crawlOrchestrator import CrawlJob, write_outputs
+    from playerIndex import draft_points
+    from segmentStore import load_weeks
+
+    players = [{'lineup_pos': 'QB', 'name': 'Player 1', 'player_id': '10001', 'position': 'QB',
+                'fantasy_points': 20.0, 'projected_fantasy_points': 18.0, 'team_name': 'Caf Crushers'}]
+    draft = [{'pick': 1, 'player_name': 'Player 1', 'player_id': '10001', 'player_position': 'QB',
+              'team_name': 'Café Crushers'}]
+    jobs = [CrawlJob('roster', 1, 3), CrawlJob('draft')]
+    results = {jobs[0].key: players, jobs[1].key: draft}
+    index = IdentityIndex(str(tmp_path / 'index.json'))
+    write_outputs(jobs, results, '1', str(tmp_path / 'segments'), str(tmp_path), index)
+
+    league_data = load_weeks('1', root=str(tmp_path / 'segments'))
+    stored = league_data['1']['3'][0]
+    assert (stored['player_uid'], stored['team_uid']) == (0, 0)
+    with open(tmp_path / 'draft_results.json') as file:
+        picks = draft_points(json.load(file), league_data)
+    assert picks[0]['kept'] == 20.0
+
+
+def test_colliding_team_names_do_not_resolve(tmp_path):
+    from playerIndex import draft_points
+
+    index = IdentityIndex(str(tmp_path / 'index.json'))
+    fire = index.team_uid('1', '3', clean_team_name('Team 🔥'))
+    skull = index.team_uid('1', '4', clean_team_name('Team 💀'))
+    assert fire != skull
+    assert index.team_uid('1', name='Team 💀') is None
+    assert index.team_uid('1', '4', 'Team 💀') == skull
+
+    league_data = {'1': {'3': [{'name': 'Player 1', 'position': 'QB', 'player_id': '10001',
+                                'fantasy_points': 20.0, 'team_name': 'Team '}]}}
+    index.annotate_league_data(league_data, '1')
+    picks = draft_points(index.annotate_draft([{'player_name': 'Player 1', 'player_id': '10001',
+                                                'player_position': 'QB', 'team_name': 'Team 💀'}], '1'),
+                         league_data)
+    assert picks[0]['team_uid'] is None and picks[0]['kept'] is None
+    assert picks[0]['season_points'] == 20.0
+
+    index.save()
+    reloaded = IdentityIndex(str(tmp_path / 'index.json'))
+    assert reloaded.team_uid('1', name='Team 🔥') is None
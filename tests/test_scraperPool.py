@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from fixtureServer import build_site, start_server  # noqa: E402
+from scraperPool import ScraperPool  # noqa: E402
+from yahoo_data import REQUEST_RATE, TokenBucket, YahooFantasyAPI  # noqa: E402
+
+
+@pytest.fixture
+def fixture_site():
+    pages, _, _ = build_site(num_teams=6, num_weeks=2, seed=3)
+    server = start_server(pages)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_pool_output_equals_serial_output(fixture_site):
+    serial = YahooFantasyAPI(fixture_site, None, TokenBucket(1000, 100), backend='http')
+    pool = ScraperPool(3, rate=1000, burst=100, base_url=fixture_site, cookie_file=None, backend='http')
+    try:
+        for week in (1, 2):
+            expected = serial.get_league_data_by_week('22030', week, 6)
+            assert pool.get_league_data_by_week('22030', week, 6) == expected
+            assert list(expected) == list(range(1, 7)) and all(expected.values())
+    finally:
+        serial.close()
+        pool.close()
+
+
+def test_default_rate_scales_with_pool_size():
+    pool = ScraperPool(4, session_factory=lambda rate_limiter: None)
+    assert pool.rate_limiter.rate == REQUEST_RATE * 4
@@ -0,0 +1,40 @@
+import json
+import os
+
+import app as flask_app
+from leagueCache import snapshot_cache
+from segmentStore import append_week, iter_league_weeks, load_league
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def league_week():
+    with open(os.path.join(ROOT, 'league_data_by_week.json')) as file:
+        return next(iter(json.load(file).values()))
+
+
+def test_app_reads_each_scraped_segment(tmp_path, monkeypatch):
+    monkeypatch.setattr(flask_app, 'SEGMENT_ROOT', str(tmp_path))
+    monkeypatch.setattr(flask_app, 'DATA_FILE', str(tmp_path / 'missing.json'))
+    snapshot_cache.clear()
+    client = flask_app.app.test_client()
+    assert client.get('/api/analysis').status_code == 404
+
+    append_week(league_week(), 1, flask_app.DEFAULT_LEAGUE_ID, str(tmp_path))
+    assert client.get('/api/analysis').get_json()['weeks'] == ['1']
+
+    append_week(league_week(), 2, flask_app.DEFAULT_LEAGUE_ID, str(tmp_path))
+    assert client.get('/api/analysis').get_json()['weeks'] == ['1', '2']
+    assert not (tmp_path / 'missing.json').exists()
+    snapshot_cache.clear()
+
+
+def test_league_without_segments_reads_the_combined_file(tmp_path):
+    root, data_file = str(tmp_path), str(tmp_path / 'league.json')
+    with open(data_file, 'w') as file:
+        json.dump({'1': league_week()}, file)
+    assert load_league('1', root, data_file) == dict(iter_league_weeks('1', root, data_file)) == {'1': league_week()}
+
+    append_week(league_week(), 3, '1', root)
+    assert list(load_league('1', root, data_file)) == ['3']
+    assert [week for week, _ in iter_league_weeks('1', root, data_file)] == ['3']
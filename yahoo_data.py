@@ -1,61 +1,120 @@
-import pickle
-import json
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import threading
 import time
 from bs4 import BeautifulSoup
-import re
+from browserSession import COOKIE_FILE, YAHOO_BASE_URL, default_session_manager
+from httpFetch import fetch_page
+from pageCache import PageCache
+from scrapeMetrics import default_metrics
+from rosterParser import (PARSER_VERSION, STAT_TABLE_IDS, TEAM_NAME_CLASS, clean_team_name, parse_roster_page,
+                          player_id_from_href, safe_float_conversion)
+from segmentStore import DEFAULT_LEAGUE_ID, SEGMENT_ROOT, append_week
 
-def safe_float_conversion(value):
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0
+# Default pacing: one roster page every 5 seconds, as the scraper has always done
+REQUEST_RATE = 0.2
+REQUEST_BURST = 1
 
-def clean_team_name(name):
-    cleaned_name = re.sub(r'[^\x00-\x7F]+', '', name)
-    return cleaned_name
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter shared by every scraping session.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; acquire()
+    blocks until a token is available.
+    """
+
+    def __init__(self, rate=REQUEST_RATE, capacity=REQUEST_BURST, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Rate must be positive and capacity at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Takes one token, waiting for the bucket to refill if it is empty."""
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
 
 class YahooFantasyAPI:
-    def __init__(self):
-        chrome_options = Options()
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-        self.driver.get("https://football.fantasysports.yahoo.com/")
-        self.load_cookies()
-
-    def load_cookies(self):
-        with open("archive/yahoo_cookies.pkl", "rb") as file:
-            cookies = pickle.load(file)
-            for cookie in cookies:
-                cookie['domain'] = ".yahoo.com"
-                try:
-                    self.driver.add_cookie(cookie)
-                except Exception as e:
-                    print(f"Failed to add cookie {cookie}: {e}")
-        self.driver.refresh()
+    def __init__(self, base_url=YAHOO_BASE_URL, cookie_file=COOKIE_FILE, rate_limiter=None, driver=None, backend='selenium',
+                 page_cache=None, session_manager=None, metrics=None):
+        """
+        Borrows an authenticated browser session from the session manager.
+
+        Args:
+            base_url (str): The site to scrape; point it at a local server to replay saved roster pages.
+            cookie_file (str): Pickled Yahoo cookies, or None to skip authentication.
+            rate_limiter (TokenBucket): Paces page loads; shared when several sessions run at once.
+            driver (WebDriver): An existing, already logged-in driver to use instead of borrowing one;
+                close() quits it.
+            backend (str): 'selenium' drives Chrome for every page; 'http' fetches pages directly
+                and only starts Chrome for pages that need JavaScript (see httpFetch).
+            page_cache (PageCache): Caches raw roster pages and their parsed players, or None to always fetch.
+            session_manager (SessionManager): Supplies warm sessions; defaults to the shared one.
+            metrics (ScrapeMetrics): Records per-page timings; defaults to the shared collector.
+        """
+        self.page_cache = page_cache
+        self.metrics = metrics or default_metrics()
+        self.base_url = base_url.rstrip('/')
+        self.rate_limiter = rate_limiter or TokenBucket()
+        self.session_manager = None
+        if driver is None:
+            self.session_manager = session_manager or default_session_manager()
+            driver = self.session_manager.acquire(backend, self.base_url, cookie_file)
+        self.driver = driver
+
+    def roster_url(self, league_id, team_id, week_num):
+        return f"{self.base_url}/f1/{league_id}/{team_id}/team?&week={week_num}&stat1=S&stat2=W"
 
     def get_team_roster_by_week(self, league_id, team_id, week_num):
-        url = f"https://football.fantasysports.yahoo.com/f1/{league_id}/{team_id}/team?&week={week_num}&stat1=S&stat2=W"
-        self.driver.get(url)
-        self.driver.implicitly_wait(5)
-        page_source = self.driver.page_source
+        url = self.roster_url(league_id, team_id, week_num)
+
+        def download():
+            with self.metrics.phase('sleep'):
+                self.rate_limiter.acquire()
+            return fetch_page(self.driver, url, 'statTable', self.metrics)
+
+        def parse(page_source):
+            with self.metrics.phase('parse'):
+                return self.parse_roster_page(page_source, team_id)
+
+        with self.metrics.page('roster', url):
+            if self.page_cache is None:
+                return parse(download())
+            return self.page_cache.fetch(league_id, 'roster', team_id, week_num, download, parse, PARSER_VERSION)
+
+    def parse_roster_page(self, page_source, team_id):
+        return parse_roster_page(page_source, team_id, self.metrics)
+
+    @classmethod
+    def parse_roster_page_soup(cls, page_source, team_id):
+        """Reference BeautifulSoup parse of a roster page; parse_roster_page() returns the same players faster."""
         soup = BeautifulSoup(page_source, 'html.parser')
-        team_name_tag = soup.find('span', class_='Navtarget F-reset No-case Fz-35 Fw-b team-name')
+        team_name_tag = soup.find('span', class_=TEAM_NAME_CLASS)
         team_name = clean_team_name(team_name_tag.get_text(strip=True)) if team_name_tag else f'Team {team_id}'
         all_players = []
-        for table_id in ['statTable0', 'statTable1', 'statTable2']:
+        for table_id in STAT_TABLE_IDS:
             stat_table = soup.find('table', id=table_id)
             if stat_table:
-                players = self.parse_player_data(str(stat_table), team_name)
+                players = cls.parse_player_data(str(stat_table), team_name)
                 all_players.extend(players)
             else:
                 print(f"Table with id '{table_id}' not found.")
         return all_players
 
-    def parse_player_data(self, table_html, team_name):
+    @staticmethod
+    def parse_player_data(table_html, team_name):
         soup = BeautifulSoup(table_html, 'html.parser')
         tbody = soup.find('tbody')
         players = []
@@ -70,6 +129,8 @@ class YahooFantasyAPI:
                     name_tag = player_td.find('a', class_='name')
                     if name_tag:
                         player_data['name'] = name_tag.get_text(strip=True)
+                        if name_tag.get('href'):
+                            player_data['player_id'] = player_id_from_href(name_tag['href'])
                     team_pos_info = player_td.find('span', class_='Fz-xxs')
                     if team_pos_info:
                         team_pos_info_text = team_pos_info.get_text(strip=True)
@@ -102,39 +163,33 @@ class YahooFantasyAPI:
         for team_id in range(1, team_count + 1):
             team_roster = self.get_team_roster_by_week(league_id, team_id, week_num)
             league_data[team_id] = team_roster
-            time.sleep(5)
         return league_data
 
     def close(self):
-        self.driver.quit()
-
-def save_league_data_by_week(league_data, week_num, filename):
-    """Save the league data with week number as the outermost key."""
-    data = {}
-    try:
-        with open(filename, 'r') as json_file:
-            data = json.load(json_file)
-    except FileNotFoundError:
-        pass  # If the file doesn't exist, we'll create it
-
-    data[week_num] = league_data
+        if self.page_cache is not None:
+            self.page_cache.flush()
+        if self.session_manager is None:
+            self.driver.quit()
+        else:
+            self.session_manager.release(self.driver)
 
-    with open(filename, 'w') as json_file:
-        json.dump(data, json_file, indent=4)
+def save_league_data_segment(league_data, week_num, league_id, root=SEGMENT_ROOT):
+    """Save one week of league data as its own segment (see segmentStore.append_week)."""
+    return append_week(league_data, week_num, league_id, root)
 
-def main():
-    yahoo_api = YahooFantasyAPI()
-    league_id = "22030"
+def main(backend='selenium'):
+    yahoo_api = YahooFantasyAPI(backend=backend, page_cache=PageCache())
+    league_id = DEFAULT_LEAGUE_ID
     start_week = 1
     end_week = 1
-    filename = 'league_data_by_week.json'
 
     for week_num in range(start_week, end_week + 1):
         league_data = yahoo_api.get_league_data_by_week(league_id, week_num)
-        save_league_data_by_week(league_data, week_num, filename)
-        print(f"League data for week {week_num} saved to {filename}")
+        path = save_league_data_segment(league_data, week_num, league_id)
+        print(f"League data for week {week_num} saved to {path}")
 
     yahoo_api.close()
+    print(f"Scrape timings saved to {yahoo_api.metrics.write_report()}")
 
 if __name__ == "__main__":
     main()
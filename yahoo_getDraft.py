@@ -1,49 +1,37 @@
-import pickle
-import time
 import json
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 
+from browserSession import default_session_manager
+from httpFetch import fetch_page
+from scrapeMetrics import default_metrics
+from pageCache import PageCache
 
-class YahooFantasyDraftResults:
-    def __init__(self):
-        """
-        Initializes the YahooFantasyDraftResults class, setting up the Chrome WebDriver with the required options.
-        """
-        chrome_options = Options()
-        chrome_options.add_argument("--log-level=3")  # Suppress logging
-        chrome_options.add_argument("--disable-logging")
-        # Uncomment the following line to run Chrome in headless mode
-        # chrome_options.add_argument("--headless")
-
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+# Names the draft parser's output in cached parse results; bump it when the output changes
+DRAFT_PARSER_VERSION = 'draft-v1'
 
-        # Navigate to Yahoo Fantasy Football login page
-        self.driver.get("https://football.fantasysports.yahoo.com/")
 
-        # Load previously saved cookies to maintain session
-        self.load_cookies()
-
-    def load_cookies(self):
+class YahooFantasyDraftResults:
+    def __init__(self, backend='selenium', base_url="https://football.fantasysports.yahoo.com",
+                 cookie_file="archive/yahoo_cookies.pkl", page_cache=None, session_manager=None,
+                 metrics=None):
         """
-        Loads cookies from a pickle file to maintain the session across requests.
+        Initializes the YahooFantasyDraftResults class, borrowing a logged-in session for the chosen fetch backend.
+
+        Args:
+            backend (str): 'selenium' drives Chrome for every page; 'http' fetches pages directly
+                and only starts Chrome for pages that need JavaScript (see httpFetch).
+            base_url (str): The site to scrape, e.g. a local stand-in server.
+            cookie_file (str): Pickled Yahoo cookies, or None to skip authentication.
+            page_cache (PageCache): Caches raw pages and their parsed results, or None to always fetch.
+            session_manager (SessionManager): Supplies warm sessions; defaults to the shared one.
+            metrics (ScrapeMetrics): Records per-page timings; defaults to the shared collector.
         """
-        with open("archive/yahoo_cookies.pkl", "rb") as file:
-            cookies = pickle.load(file)
-            for cookie in cookies:
-                cookie['domain'] = ".yahoo.com"
-                try:
-                    self.driver.add_cookie(cookie)
-                except Exception as e:
-                    print(f"Failed to add cookie {cookie}: {e}")
-
-        # Refresh the page to ensure the session is established
-        self.driver.refresh()
-        time.sleep(2)  # Wait for the session to be established
+        self.page_cache = page_cache
+        self.metrics = metrics or default_metrics()
+        self.base_url = base_url.rstrip('/')
+        self.session_manager = session_manager or default_session_manager()
+        self.driver = self.session_manager.acquire(backend, self.base_url, cookie_file)
 
     def get_draft_results(self, league_id):
         """
@@ -52,20 +40,38 @@ class YahooFantasyDraftResults:
         Args:
             league_id (str): The ID of the Yahoo Fantasy Football league.
         """
-        url = f"https://football.fantasysports.yahoo.com/f1/{league_id}/draftresults?drafttab=round"
-        self.driver.get(url)
+        url = f"{self.base_url}/f1/{league_id}/draftresults?drafttab=round"
 
-        # Wait for the page to load
-        self.driver.implicitly_wait(5)
+        def download():
+            return fetch_page(self.driver, url, 'drafttables', self.metrics)
 
+        def parse(page_source):
+            with self.metrics.phase('parse'):
+                return self.parse_draft_page(page_source)
+
+        with self.metrics.page('draft', url):
+            if self.page_cache is None:
+                return parse(download())
+            return self.page_cache.fetch(league_id, 'draft', None, None, download, parse, DRAFT_PARSER_VERSION)
+
+    def parse_draft_page(self, page_source):
+        """
+        Extracts the picks from the draft results page.
+
+        Args:
+            page_source (str): The draft results page HTML.
+
+        Returns:
+            list: One dictionary per pick.
+        """
         # Parse the page source with BeautifulSoup
-        page_source = self.driver.page_source
         soup = BeautifulSoup(page_source, 'html.parser')
 
         # Find the div with id 'drafttables'
         draft_table_div = soup.find('div', id='drafttables')
         if not draft_table_div:
             print("No div with id 'drafttables' found.")
+            self.metrics.add_table('drafttables', None)
             return []
 
         draft_results = []
@@ -113,6 +119,7 @@ class YahooFantasyDraftResults:
             # Append the pick dictionary to the draft results list
             draft_results.append(pick_info)
 
+        self.metrics.add_table('drafttables', len(draft_results))
         return draft_results
 
     def save_draft_results(self, draft_results, filename="draft_results.json"):
@@ -130,14 +137,16 @@ class YahooFantasyDraftResults:
 
     def close(self):
         """
-        Closes the WebDriver instance, shutting down the browser.
+        Hands the session back to the session manager, which keeps it warm for the next scraper.
         """
-        self.driver.quit()
+        if self.page_cache is not None:
+            self.page_cache.flush()
+        self.session_manager.release(self.driver)
 
 
 # Example usage
 if __name__ == "__main__":
-    yahoo_draft = YahooFantasyDraftResults()
+    yahoo_draft = YahooFantasyDraftResults(page_cache=PageCache())
     league_id = "22030"  # Your league ID
 
     # Fetch draft results
@@ -148,5 +157,6 @@ if __name__ == "__main__":
     # Save the draft results to a JSON file
     yahoo_draft.save_draft_results(draft_results, "draft_results.json")
 
-    # Close the browser instance
+    # Give the browser session back
     yahoo_draft.close()
+    print(f"Scrape timings saved to {yahoo_draft.metrics.write_report()}")
@@ -1,13 +1,12 @@
-import pickle
 import json
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 from bs4 import BeautifulSoup
 import re
+from browserSession import default_session_manager
+from httpFetch import fetch_page
+from scrapeMetrics import default_metrics
+from pageCache import PageCache
 
 def safe_float_conversion(value):
     """
@@ -29,45 +28,30 @@ def clean_team_name(name):
     cleaned_name = re.sub(r'[^\x00-\x7F]+', '', name)
     return cleaned_name
 
+# Names the matchup parser's output in cached parse results; bump it when the output changes
+MATCHUPS_PARSER_VERSION = 'matchups-v1'
+
 class YahooFantasyAPI:
-    def __init__(self):
-        """
-        Initializes the YahooFantasyAPI class, setting up the Chrome WebDriver with the required options.
+    def __init__(self, backend='selenium', base_url="https://football.fantasysports.yahoo.com",
+                 cookie_file="archive/yahoo_cookies.pkl", page_cache=None, session_manager=None,
+                 metrics=None):
         """
-        # Set up Chrome options (e.g., to run in headless mode, you can add chrome_options.add_argument("--headless"))
-        chrome_options = Options()
-        # Uncomment the following line to run Chrome in headless mode
-        # chrome_options.add_argument("--headless")
-        # Suppress logging
-        chrome_options.add_argument("--log-level=3")
-        chrome_options.add_argument("--disable-logging")
-
-        # Initialize the WebDriver using ChromeDriverManager to automatically manage ChromeDriver binary
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-
-        # Navigate to Yahoo Fantasy Football login page
-        self.driver.get("https://football.fantasysports.yahoo.com/")
-
-        # Load previously saved cookies to maintain session
-        self.load_cookies()
+        Initializes the YahooFantasyAPI class, borrowing a logged-in session for the chosen fetch backend.
 
-    def load_cookies(self):
-        """
-        Loads cookies from a pickle file to maintain the session across requests.
+        Args:
+            backend (str): 'selenium' drives Chrome for every page; 'http' fetches pages directly
+                and only starts Chrome for pages that need JavaScript (see httpFetch).
+            base_url (str): The site to scrape, e.g. a local stand-in server.
+            cookie_file (str): Pickled Yahoo cookies, or None to skip authentication.
+            page_cache (PageCache): Caches raw pages and their parsed results, or None to always fetch.
+            session_manager (SessionManager): Supplies warm sessions; defaults to the shared one.
+            metrics (ScrapeMetrics): Records per-page timings; defaults to the shared collector.
         """
-        # Load cookies from the file 'yahoo_cookies.pkl'
-        with open("archive/yahoo_cookies.pkl", "rb") as file:
-            cookies = pickle.load(file)
-            for cookie in cookies:
-                cookie['domain'] = ".yahoo.com"  # Ensure cookies are set for the correct domain
-                try:
-                    self.driver.add_cookie(cookie)  # Add the cookie to the browser
-                except Exception as e:
-                    print(f"Failed to add cookie {cookie}: {e}")
-
-        # Refresh the page after adding cookies to ensure they take effect
-        self.driver.refresh()
-        time.sleep(2)  # Wait a bit for the session to be established
+        self.page_cache = page_cache
+        self.metrics = metrics or default_metrics()
+        self.base_url = base_url.rstrip('/')
+        self.session_manager = session_manager or default_session_manager()
+        self.driver = self.session_manager.acquire(backend, self.base_url, cookie_file)
 
     def extract_team_id(self, url):
         """
@@ -94,24 +78,46 @@ class YahooFantasyAPI:
             list: A list of dictionaries containing matchup data.
         """
         # Construct the URL for the matchup page for the specific week
-        url = f"https://football.fantasysports.yahoo.com/f1/{league_id}?matchup_week={week_num}&module=matchups&lhst=matchups"
-        self.driver.get(url)
+        url = f"{self.base_url}/f1/{league_id}?matchup_week={week_num}&module=matchups&lhst=matchups"
+
+        def download():
+            return fetch_page(self.driver, url, 'matchups-body', self.metrics)
+
+        def parse(page_source):
+            with self.metrics.phase('parse'):
+                return self.parse_schedule_page(page_source, week_num)
 
-        # Wait for the page to fully load
-        self.driver.implicitly_wait(5)
-        page_source = self.driver.page_source
+        with self.metrics.page('matchups', url):
+            if self.page_cache is None:
+                return parse(download())
+            return self.page_cache.fetch(league_id, 'matchups', None, week_num, download, parse,
+                                         MATCHUPS_PARSER_VERSION)
+
+    def parse_schedule_page(self, page_source, week_num):
+        """
+        Extracts the matchups from a week's matchup page.
+
+        Args:
+            page_source (str): The matchup page HTML.
+            week_num (int): The week number, for messages.
+
+        Returns:
+            list: A list of dictionaries containing matchup data.
+        """
         soup = BeautifulSoup(page_source, 'html.parser')
 
         # Find the div with class 'matchups-body'
         target_div = soup.find('div', class_='matchups-body')
         if not target_div:
             print(f"No matching div with class 'matchups-body' found for week {week_num}")
+            self.metrics.add_table('matchups-body', None)
             return []
 
         # Within this div, find the ul with class 'List'
         ul = target_div.find('ul', class_='List')
         if not ul:
             print(f"No matching ul with class 'List' found for week {week_num}")
+            self.metrics.add_table('matchups-body', None)
             return []
 
         # Initialize list to hold matchups
@@ -134,6 +140,7 @@ class YahooFantasyAPI:
                 print(f"Not enough team links in li element for week {week_num}")
                 continue
 
+        self.metrics.add_table('matchups-body', len(matchups))
         return matchups
 
     def get_league_schedule(self, league_id, start_week=1, end_week=14):
@@ -154,20 +161,23 @@ class YahooFantasyAPI:
             print(f"Fetching schedule for week {week_num}...")
             weekly_matchups = self.get_schedule_by_week(league_id, week_num)
             schedule[week_num] = weekly_matchups
-            time.sleep(2)  # Shorter delay since we're fetching less data
+            with self.metrics.phase('sleep'):
+                time.sleep(2)  # Shorter delay since we're fetching less data
 
         return schedule
 
     def close(self):
         """
-        Closes the WebDriver instance, shutting down the browser.
+        Hands the session back to the session manager, which keeps it warm for the next scraper.
         """
-        self.driver.quit()
+        if self.page_cache is not None:
+            self.page_cache.flush()
+        self.session_manager.release(self.driver)
 
 
 # Example usage for testing the YahooFantasyAPI class
 if __name__ == "__main__":
-    yahoo_api = YahooFantasyAPI()
+    yahoo_api = YahooFantasyAPI(page_cache=PageCache())
     league_id = "22030"  # Your league ID
     start_week = 1  # Starting week number
     end_week = 14  # Ending week number
@@ -189,5 +199,6 @@ if __name__ == "__main__":
             print(f"Team {matchup['team1_id']} vs Team {matchup['team2_id']}")
         print("\n")
 
-    # Close the browser instance
+    # Give the browser session back
     yahoo_api.close()
+    print(f"Scrape timings saved to {yahoo_api.metrics.write_report()}")